@@ -1,10 +1,12 @@
 import frappe
 from frappe import _
 from frappe.email import sendmail_to_system_managers
+from frappe.query_builder.functions import Max, Sum
 from frappe.utils import (
 	add_days,
 	add_months,
 	cint,
+	create_batch,
 	date_diff,
 	flt,
 	get_first_day,
@@ -20,6 +22,9 @@ from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 )
 from erpnext.accounts.utils import get_account_currency
 
+# number of invoices booked per background job
+DEFERRED_ACCOUNTING_JOB_SIZE = 500
+
 
 def validate_service_stop_date(doc):
 	"""Validates service_stop_date for Purchase Invoice and Sales Invoice"""
@@ -74,26 +79,7 @@ def convert_deferred_expense_to_expense(deferred_process, start_date=None, end_d
 	if not end_date:
 		end_date = add_days(today(), -1)
 
-	# check for the purchase invoice for which GL entries has to be done
-	invoices = frappe.db.sql_list(
-		f"""
-		select distinct item.parent
-		from `tabPurchase Invoice Item` item, `tabPurchase Invoice` p
-		where item.service_start_date<=%s and item.service_end_date>=%s
-		and item.enable_deferred_expense = 1 and item.parent=p.name
-		and item.docstatus = 1 and ifnull(item.amount, 0) > 0
-		{conditions}
-	""",
-		(end_date, start_date),
-	)  # nosec
-
-	# For each invoice, book deferred expense
-	for invoice in invoices:
-		doc = frappe.get_doc("Purchase Invoice", invoice)
-		book_deferred_income_or_expense(doc, deferred_process, end_date)
-
-	if frappe.flags.deferred_accounting_error:
-		send_mail(deferred_process)
+	book_deferred_entries("Purchase Invoice", deferred_process, start_date, end_date, conditions)
 
 
 def convert_deferred_revenue_to_income(deferred_process, start_date=None, end_date=None, conditions=""):
@@ -104,28 +90,154 @@ def convert_deferred_revenue_to_income(deferred_process, start_date=None, end_da
 	if not end_date:
 		end_date = add_days(today(), -1)
 
-	# check for the sales invoice for which GL entries has to be done
-	invoices = frappe.db.sql_list(
+	book_deferred_entries("Sales Invoice", deferred_process, start_date, end_date, conditions)
+
+
+def book_deferred_entries(doctype, deferred_process, start_date, end_date, conditions=""):
+	"""Book the deferred income/expense of the invoices in background jobs, each booking the items of
+	upto `DEFERRED_ACCOUNTING_JOB_SIZE` invoices of a company and deferred account"""
+	invoices_by_account = {}
+	for invoice, company, deferred_account in get_deferred_invoices(
+		doctype, start_date, end_date, conditions
+	):
+		invoices_by_account.setdefault((company, deferred_account), []).append(invoice)
+
+	for (company, deferred_account), invoices in invoices_by_account.items():
+		for batch in create_batch(invoices, DEFERRED_ACCOUNTING_JOB_SIZE):
+			frappe.enqueue(
+				book_deferred_entries_of_invoices,
+				queue="long",
+				job_id=f"book_deferred_entries::{deferred_process}::{deferred_account}::{batch[0]}",
+				deduplicate=True,
+				enqueue_after_commit=True,
+				now=frappe.in_test,
+				doctype=doctype,
+				invoices=batch,
+				company=company,
+				deferred_account=deferred_account,
+				deferred_process=deferred_process,
+				posting_date=end_date,
+			)
+
+
+def get_deferred_invoices(doctype, start_date, end_date, conditions=""):
+	enable_check = "enable_deferred_revenue" if doctype == "Sales Invoice" else "enable_deferred_expense"
+	deferred_account = get_deferred_account_field(doctype)
+
+	# check for the invoices for which GL entries has to be done
+	return frappe.db.sql(
 		f"""
-		select distinct item.parent
-		from `tabSales Invoice Item` item, `tabSales Invoice` p
+		select distinct item.parent, p.company, item.{deferred_account}
+		from `tab{doctype} Item` item, `tab{doctype}` p
 		where item.service_start_date<=%s and item.service_end_date>=%s
-		and item.enable_deferred_revenue = 1 and item.parent=p.name
+		and item.{enable_check} = 1 and item.parent=p.name
 		and item.docstatus = 1 and ifnull(item.amount, 0) > 0
 		{conditions}
 	""",
 		(end_date, start_date),
 	)  # nosec
 
+
+def book_deferred_entries_of_invoices(
+	doctype, invoices, company, deferred_account, deferred_process, posting_date
+):
+	"""Book the deferred income/expense of the invoice items of a deferred account, with the amounts
+	already booked for the items fetched at once instead of per item and period"""
+	enable_check = "enable_deferred_revenue" if doctype == "Sales Invoice" else "enable_deferred_expense"
+	item_names = frappe.get_all(
+		f"{doctype} Item",
+		filters={
+			"parent": ("in", invoices),
+			enable_check: 1,
+			get_deferred_account_field(doctype): deferred_account,
+		},
+		pluck="name",
+	)
+	booked_amounts = get_booked_deferred_amounts(doctype, company, deferred_account, item_names)
+
 	for invoice in invoices:
-		doc = frappe.get_doc("Sales Invoice", invoice)
-		book_deferred_income_or_expense(doc, deferred_process, end_date)
+		doc = frappe.get_doc(doctype, invoice)
+		book_deferred_income_or_expense(
+			doc,
+			deferred_process,
+			posting_date,
+			deferred_account=deferred_account,
+			booked_amounts=booked_amounts,
+		)
 
 	if frappe.flags.deferred_accounting_error:
 		send_mail(deferred_process)
 
 
-def get_booking_dates(doc, item, posting_date=None, prev_posting_date=None):
+def get_deferred_account_field(doctype):
+	return "deferred_revenue_account" if doctype == "Sales Invoice" else "deferred_expense_account"
+
+
+def get_booked_deferred_amounts(doctype, company, deferred_account, item_names):
+	"""Amount booked against the deferred account and the last booking date of each invoice item,
+	as looked up per item by `get_already_booked_amount` and `get_booking_dates`"""
+	dr_or_cr = "debit" if doctype == "Sales Invoice" else "credit"
+	booked_amounts = {
+		item_name: frappe._dict({"base_amount": 0.0, "amount": 0.0, "posting_date": None})
+		for item_name in item_names
+	}
+	if not item_names:
+		return booked_amounts
+
+	gle = frappe.qb.DocType("GL Entry")
+	journal_entry = frappe.qb.DocType("Journal Entry")
+	journal_entry_account = frappe.qb.DocType("Journal Entry Account")
+
+	gl_query = (
+		frappe.qb.from_(gle)
+		.select(
+			gle.voucher_detail_no,
+			Sum(gle[dr_or_cr]),
+			Sum(gle[f"{dr_or_cr}_in_account_currency"]),
+			Max(gle.posting_date),
+		)
+		.where(
+			(gle.company == company)
+			& (gle.account == deferred_account)
+			& (gle.voucher_type == doctype)
+			& (gle.voucher_detail_no.isin(item_names))
+			& (gle.is_cancelled == 0)
+		)
+		.groupby(gle.voucher_detail_no)
+	)
+
+	journal_entry_query = (
+		frappe.qb.from_(journal_entry)
+		.inner_join(journal_entry_account)
+		.on(journal_entry.name == journal_entry_account.parent)
+		.select(
+			journal_entry_account.reference_detail_no,
+			Sum(journal_entry_account[dr_or_cr]),
+			Sum(journal_entry_account[f"{dr_or_cr}_in_account_currency"]),
+			Max(journal_entry.posting_date),
+		)
+		.where(
+			(journal_entry.company == company)
+			& (journal_entry_account.account == deferred_account)
+			& (journal_entry_account.reference_type == doctype)
+			& (journal_entry_account.reference_detail_no.isin(item_names))
+			& (journal_entry.docstatus < 2)
+		)
+		.groupby(journal_entry_account.reference_detail_no)
+	)
+
+	for query in (gl_query, journal_entry_query):
+		for item_name, base_amount, amount, posting_date in query.run():
+			booked = booked_amounts[item_name]
+			booked.base_amount += flt(base_amount)
+			booked.amount += flt(amount)
+			if not booked.posting_date or getdate(posting_date) > getdate(booked.posting_date):
+				booked.posting_date = posting_date
+
+	return booked_amounts
+
+
+def get_booking_dates(doc, item, posting_date=None, prev_posting_date=None, booked=None):
 	if not posting_date:
 		posting_date = add_days(today(), -1)
 
@@ -135,7 +247,13 @@ def get_booking_dates(doc, item, posting_date=None, prev_posting_date=None):
 		"deferred_revenue_account" if doc.doctype == "Sales Invoice" else "deferred_expense_account"
 	)
 
-	if not prev_posting_date:
+	if booked and not prev_posting_date:
+		if booked.posting_date:
+			start_date = getdate(add_days(booked.posting_date, 1))
+		else:
+			start_date = item.service_start_date
+
+	elif not prev_posting_date:
 		prev_gl_entry = frappe.db.sql(
 			"""
 			select name, posting_date from `tabGL Entry` where company=%s and account=%s and
@@ -189,7 +307,15 @@ def get_booking_dates(doc, item, posting_date=None, prev_posting_date=None):
 
 
 def calculate_monthly_amount(
-	doc, item, last_gl_entry, start_date, end_date, total_days, total_booking_days, account_currency
+	doc,
+	item,
+	last_gl_entry,
+	start_date,
+	end_date,
+	total_days,
+	total_booking_days,
+	account_currency,
+	booked=None,
 ):
 	amount, base_amount = 0, 0
 
@@ -207,7 +333,7 @@ def calculate_monthly_amount(
 		actual_months = rounded(total_months * prorate_factor, 1)
 
 		already_booked_amount, already_booked_amount_in_account_currency = get_already_booked_amount(
-			doc, item
+			doc, item, booked
 		)
 		base_amount = flt(item.base_net_amount / actual_months, item.precision("base_net_amount"))
 
@@ -230,7 +356,7 @@ def calculate_monthly_amount(
 			amount = rounded(partial_month, 1) * amount
 	else:
 		already_booked_amount, already_booked_amount_in_account_currency = get_already_booked_amount(
-			doc, item
+			doc, item, booked
 		)
 		base_amount = flt(item.base_net_amount - already_booked_amount, item.precision("base_net_amount"))
 		if account_currency == doc.company_currency:
@@ -243,7 +369,7 @@ def calculate_monthly_amount(
 	return amount, base_amount
 
 
-def calculate_amount(doc, item, last_gl_entry, total_days, total_booking_days, account_currency):
+def calculate_amount(doc, item, last_gl_entry, total_days, total_booking_days, account_currency, booked=None):
 	amount, base_amount = 0, 0
 	if not last_gl_entry:
 		base_amount = flt(
@@ -255,7 +381,7 @@ def calculate_amount(doc, item, last_gl_entry, total_days, total_booking_days, a
 			amount = flt(item.net_amount * total_booking_days / flt(total_days), item.precision("net_amount"))
 	else:
 		already_booked_amount, already_booked_amount_in_account_currency = get_already_booked_amount(
-			doc, item
+			doc, item, booked
 		)
 
 		base_amount = flt(item.base_net_amount - already_booked_amount, item.precision("base_net_amount"))
@@ -269,7 +395,12 @@ def calculate_amount(doc, item, last_gl_entry, total_days, total_booking_days, a
 	return amount, base_amount
 
 
-def get_already_booked_amount(doc, item):
+def get_already_booked_amount(doc, item, booked=None):
+	if booked:
+		if doc.currency == doc.company_currency:
+			return booked.base_amount, booked.base_amount
+		return booked.base_amount, booked.amount
+
 	if doc.doctype == "Sales Invoice":
 		total_credit_debit, total_credit_debit_currency = "debit", "debit_in_account_currency"
 		deferred_account = "deferred_revenue_account"
@@ -315,8 +446,14 @@ def get_already_booked_amount(doc, item):
 	return already_booked_amount, already_booked_amount_in_account_currency
 
 
-def book_deferred_income_or_expense(doc, deferred_process, posting_date=None):
+def book_deferred_income_or_expense(
+	doc, deferred_process, posting_date=None, deferred_account=None, booked_amounts=None
+):
+	"""Book the deferred income/expense of the invoice items upto the posting date. Items can be limited
+	to a deferred account, and `booked_amounts` from `get_booked_deferred_amounts` are used and updated
+	instead of looking up the booked amounts per item and period"""
 	enable_check = "enable_deferred_revenue" if doc.doctype == "Sales Invoice" else "enable_deferred_expense"
+	deferred_account_field = get_deferred_account_field(doc.doctype)
 
 	accounts_frozen_upto = frappe.db.get_value("Company", doc.company, "accounts_frozen_till_date")
 
@@ -327,8 +464,9 @@ def book_deferred_income_or_expense(doc, deferred_process, posting_date=None):
 		book_deferred_entries_based_on,
 		prev_posting_date=None,
 	):
+		booked = booked_amounts.get(item.name) if booked_amounts else None
 		start_date, end_date, last_gl_entry = get_booking_dates(
-			doc, item, posting_date=posting_date, prev_posting_date=prev_posting_date
+			doc, item, posting_date=posting_date, prev_posting_date=prev_posting_date, booked=booked
 		)
 		if not (start_date and end_date):
 			return
@@ -354,10 +492,11 @@ def book_deferred_income_or_expense(doc, deferred_process, posting_date=None):
 				total_days,
 				total_booking_days,
 				account_currency,
+				booked,
 			)
 		else:
 			amount, base_amount = calculate_amount(
-				doc, item, last_gl_entry, total_days, total_booking_days, account_currency
+				doc, item, last_gl_entry, total_days, total_booking_days, account_currency, booked
 			)
 
 		if not amount:
@@ -401,6 +540,12 @@ def book_deferred_income_or_expense(doc, deferred_process, posting_date=None):
 					deferred_process,
 				)
 
+			if booked:
+				booked.base_amount += flt(base_amount, item.precision("base_net_amount"))
+				booked.amount += flt(amount, item.precision("net_amount"))
+				if not booked.posting_date or getdate(gl_posting_date) > getdate(booked.posting_date):
+					booked.posting_date = gl_posting_date
+
 		# Returned in case of any errors because it tries to submit the same record again and again in case of errors
 		if frappe.flags.deferred_accounting_error:
 			return
@@ -423,6 +568,9 @@ def book_deferred_income_or_expense(doc, deferred_process, posting_date=None):
 	)
 
 	for item in doc.get("items"):
+		if deferred_account and item.get(deferred_account_field) != deferred_account:
+			continue
+
 		if item.get(enable_check):
 			_book_deferred_revenue_or_expense(
 				item, via_journal_entry, submit_journal_entry, book_deferred_entries_based_on
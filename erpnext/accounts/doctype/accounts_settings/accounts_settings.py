@@ -10,6 +10,10 @@ from frappe.custom.doctype.property_setter.property_setter import make_property_
 from frappe.model.document import Document
 from frappe.utils import cint
 
+from erpnext.accounts.doctype.payment_ledger_outstanding.payment_ledger_outstanding import (
+	reset_payment_ledger_outstanding,
+	update_payment_ledger_outstanding,
+)
 from erpnext.accounts.utils import sync_auto_reconcile_config
 
 SELLING_DOCTYPES = [
@@ -54,6 +58,7 @@ class AccountsSettings(Document):
 		automatically_fetch_payment_terms: DF.Check
 		automatically_process_deferred_accounting_entry: DF.Check
 		book_asset_depreciation_entry_automatically: DF.Check
+		book_consolidated_depreciation_entries: DF.Check
 		book_deferred_entries_based_on: DF.Literal["Days", "Months"]
 		book_deferred_entries_via_journal_entry: DF.Check
 		book_tax_discount_loss: DF.Check
@@ -97,8 +102,10 @@ class AccountsSettings(Document):
 		submit_journal_entries: DF.Check
 		unlink_advance_payment_on_cancelation_of_order: DF.Check
 		unlink_payment_on_cancellation_of_invoice: DF.Check
+		use_gl_balance_snapshot: DF.Check
 		use_legacy_budget_controller: DF.Check
 		use_legacy_controller_for_pcv: DF.Check
+		use_payment_ledger_outstanding: DF.Check
 	# end: auto-generated types
 
 	def validate(self):
@@ -135,11 +142,27 @@ class AccountsSettings(Document):
 			toggle_loyalty_point_program_section(not self.enable_loyalty_point_program)
 			clear_cache = True
 
+		if old_doc.use_payment_ledger_outstanding != self.use_payment_ledger_outstanding:
+			self.reset_payment_ledger_outstanding()
+
 		if clear_cache:
 			frappe.clear_cache()
 
 		self.validate_and_sync_auto_reconcile_config()
 
+	def reset_payment_ledger_outstanding(self):
+		# outstanding is not updated while disabled, it is built again after enabling
+		reset_payment_ledger_outstanding()
+
+		if self.use_payment_ledger_outstanding:
+			frappe.enqueue(
+				update_payment_ledger_outstanding,
+				queue="long",
+				job_id="update_payment_ledger_outstanding",
+				deduplicate=True,
+				now=frappe.in_test,
+			)
+
 	def validate_stale_days(self):
 		if not self.allow_stale and cint(self.stale_days) <= 0:
 			frappe.msgprint(
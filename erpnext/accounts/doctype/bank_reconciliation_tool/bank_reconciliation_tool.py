@@ -21,6 +21,10 @@ from erpnext.accounts.report.bank_reconciliation_statement.bank_reconciliation_s
 from erpnext.accounts.utils import get_account_currency, get_balance_on
 from erpnext.setup.utils import get_exchange_rate
 
+DEFAULT_MATCHING_QUERIES = (
+	"erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool.get_matching_queries"
+)
+
 
 class BankReconciliationTool(Document):
 	# begin: auto-generated types
@@ -409,11 +413,11 @@ def start_auto_reconcile(
 ):
 	frappe.flags.auto_reconcile_vouchers = True
 
-	reconciled, partially_reconciled = set(), set()
-	for transaction in bank_transactions:
-		linked_payments = get_linked_payments(
-			transaction.name,
-			["payment_entry", "journal_entry", "sales_invoice"],
+	# vouchers of the batch are matched in memory unless other apps add their own matching queries
+	matcher = None
+	if frappe.get_hooks("get_matching_queries") == [DEFAULT_MATCHING_QUERIES]:
+		matcher = AutoReconcileMatcher(
+			bank_transactions,
 			from_date,
 			to_date,
 			filter_by_reference_date,
@@ -421,6 +425,21 @@ def start_auto_reconcile(
 			to_reference_date,
 		)
 
+	reconciled, partially_reconciled = set(), set()
+	for transaction in bank_transactions:
+		if matcher:
+			linked_payments = matcher.get_linked_payments(transaction)
+		else:
+			linked_payments = get_linked_payments(
+				transaction.name,
+				["payment_entry", "journal_entry", "sales_invoice"],
+				from_date,
+				to_date,
+				filter_by_reference_date,
+				from_reference_date,
+				to_reference_date,
+			)
+
 		if not linked_payments:
 			continue
 
@@ -436,6 +455,8 @@ def start_auto_reconcile(
 		)
 
 		updated_transaction = reconcile_vouchers(transaction.name, json.dumps(vouchers))
+		if matcher:
+			matcher.remove_cleared_vouchers(transaction, linked_payments)
 
 		if updated_transaction.status == "Reconciled":
 			reconciled.add(updated_transaction.name)
@@ -449,6 +470,258 @@ def start_auto_reconcile(
 	frappe.flags.auto_reconcile_vouchers = False
 
 
+class AutoReconcileMatcher:
+	"""Matches the bank transactions of an auto reconciliation against candidate vouchers loaded
+	once per bank account, instead of querying the vouchers of every bank transaction.
+
+	Candidates and their rank are the same as that of `get_matching_queries` in auto reconciliation,
+	a voucher is no longer matched once a bank transaction clears it."""
+
+	def __init__(
+		self,
+		bank_transactions,
+		from_date,
+		to_date,
+		filter_by_reference_date,
+		from_reference_date,
+		to_reference_date,
+	):
+		self.bank_transactions = bank_transactions
+		self.from_date = from_date
+		self.to_date = to_date
+		self.filter_by_reference_date = cint(filter_by_reference_date)
+		self.from_reference_date = from_reference_date
+		self.to_reference_date = to_reference_date
+
+		self.bank_accounts = {}
+		self.cleared_vouchers = set()
+
+	def get_linked_payments(self, transaction):
+		if transaction.reference_number is None:
+			return []
+
+		bank_account = self.get_bank_account(transaction.bank_account)
+		direction = "deposit" if transaction.deposit > 0.0 else "withdrawal"
+		candidates = bank_account.candidates[direction].get(get_reference_key(transaction.reference_number))
+
+		matching_vouchers = []
+		for candidate in candidates or []:
+			if (candidate.doctype, candidate.name) in self.cleared_vouchers:
+				continue
+
+			matching_vouchers.append(
+				frappe._dict(
+					{
+						"rank": self.get_rank(candidate, transaction),
+						"doctype": candidate.doctype,
+						"name": candidate.name,
+						"paid_amount": candidate.paid_amount,
+						"reference_no": candidate.reference_no,
+						"reference_date": candidate.reference_date,
+						"party": candidate.party,
+						"party_type": candidate.party_type,
+						"posting_date": candidate.posting_date,
+						"currency": candidate.currency,
+					}
+				)
+			)
+
+		matching_vouchers = sorted(matching_vouchers, key=lambda x: x["rank"], reverse=True)
+		return subtract_allocations(bank_account.account, matching_vouchers)
+
+	def get_rank(self, candidate, transaction):
+		# reference number always matches in auto reconciliation
+		rank = 2
+		if flt(candidate.matching_amount) == flt(transaction.unallocated_amount):
+			rank += 1
+
+		if candidate.doctype == "Payment Entry":
+			if (
+				candidate.party
+				and candidate.party_type == transaction.party_type
+				and candidate.party == transaction.party
+			):
+				rank += 1
+		elif candidate.doctype == "Sales Invoice":
+			if candidate.party == transaction.party:
+				rank += 1
+
+		return rank
+
+	def remove_cleared_vouchers(self, transaction, vouchers):
+		bank_account = self.get_bank_account(transaction.bank_account)
+		names = {}
+		for voucher in vouchers:
+			names.setdefault(voucher.doctype, []).append(voucher.name)
+
+		for doctype, voucher_names in names.items():
+			if doctype == "Sales Invoice":
+				cleared = frappe.get_all(
+					"Sales Invoice Payment",
+					filters={
+						"parenttype": doctype,
+						"parent": ("in", voucher_names),
+						"account": bank_account.account,
+						"clearance_date": ("is", "set"),
+					},
+					pluck="parent",
+				)
+			else:
+				cleared = frappe.get_all(
+					doctype,
+					filters={"name": ("in", voucher_names), "clearance_date": ("is", "set")},
+					pluck="name",
+				)
+
+			self.cleared_vouchers.update((doctype, name) for name in cleared)
+
+	def get_bank_account(self, bank_account):
+		if bank_account not in self.bank_accounts:
+			self.bank_accounts[bank_account] = self.load_bank_account(bank_account)
+
+		return self.bank_accounts[bank_account]
+
+	def load_bank_account(self, bank_account):
+		details = frappe.db.get_value("Bank Account", bank_account, ["account", "company"], as_dict=True)
+		details.currency = get_account_currency(details.account)
+		details.candidates = {"deposit": {}, "withdrawal": {}}
+
+		transactions = [d for d in self.bank_transactions if d.bank_account == bank_account]
+		for direction in ("deposit", "withdrawal"):
+			reference_nos = list(
+				{
+					d.reference_number
+					for d in transactions
+					if d.reference_number is not None
+					and (d.deposit > 0.0 if direction == "deposit" else not d.deposit > 0.0)
+				}
+			)
+
+			for batch in create_batch(reference_nos, 1000):
+				candidates = self.get_payment_entries(details, direction, batch)
+				candidates += self.get_journal_entries(details, direction, batch)
+				if direction == "deposit":
+					candidates += self.get_sales_invoices(details, batch)
+
+				for candidate in candidates:
+					key = get_reference_key(candidate.reference_no)
+					details.candidates[direction].setdefault(key, []).append(candidate)
+
+		return details
+
+	def get_payment_entries(self, bank_account, direction, reference_nos):
+		pe = frappe.qb.DocType("Payment Entry")
+		to_from = "to" if direction == "deposit" else "from"
+		payment_type = "Receive" if direction == "deposit" else "Pay"
+
+		filter_by_date = pe.posting_date.between(self.from_date, self.to_date)
+		if self.filter_by_reference_date:
+			filter_by_date = pe.reference_date.between(self.from_reference_date, self.to_reference_date)
+
+		return (
+			frappe.qb.from_(pe)
+			.select(
+				ConstantColumn("Payment Entry").as_("doctype"),
+				pe.name,
+				pe.paid_amount.as_("matching_amount"),
+				pe.base_paid_amount_after_tax.as_("paid_amount"),
+				pe.reference_no,
+				pe.reference_date,
+				pe.party,
+				pe.party_type,
+				pe.posting_date,
+				getattr(pe, f"paid_{to_from}_account_currency").as_("currency"),
+			)
+			.where(pe.docstatus == 1)
+			.where(pe.payment_type.isin([payment_type, "Internal Transfer"]))
+			.where(pe.clearance_date.isnull())
+			.where(getattr(pe, f"paid_{to_from}") == bank_account.account)
+			.where(pe.paid_amount > 0.0)
+			.where(filter_by_date)
+			.where(pe.reference_no.isin(reference_nos))
+			.orderby(pe.reference_date if self.filter_by_reference_date else pe.posting_date)
+		).run(as_dict=True)
+
+	def get_journal_entries(self, bank_account, direction, reference_nos):
+		je = frappe.qb.DocType("Journal Entry")
+		jea = frappe.qb.DocType("Journal Entry Account")
+		amount_field = "debit_in_account_currency" if direction == "deposit" else "credit_in_account_currency"
+
+		filter_by_date = je.posting_date.between(self.from_date, self.to_date)
+		if self.filter_by_reference_date:
+			filter_by_date = je.cheque_date.between(self.from_reference_date, self.to_reference_date)
+
+		journal_entries = (
+			frappe.qb.from_(jea)
+			.join(je)
+			.on(jea.parent == je.name)
+			.select(
+				Sum(getattr(jea, amount_field)).as_("paid_amount"),
+				ConstantColumn("Journal Entry").as_("doctype"),
+				je.name,
+				je.cheque_no.as_("reference_no"),
+				je.cheque_date.as_("reference_date"),
+				je.pay_to_recd_from.as_("party"),
+				jea.party_type,
+				je.posting_date,
+				jea.account_currency.as_("currency"),
+			)
+			.where(je.docstatus == 1)
+			.where(je.voucher_type != "Opening Entry")
+			.where(je.clearance_date.isnull())
+			.where(jea.account == bank_account.account)
+			.where(filter_by_date)
+			.where(je.cheque_no.isin(reference_nos))
+			.groupby(je.name)
+			.orderby(je.cheque_date if self.filter_by_reference_date else je.posting_date)
+		).run(as_dict=True)
+
+		candidates = []
+		for d in journal_entries:
+			if flt(d.paid_amount) > 0.0:
+				d.matching_amount = d.paid_amount
+				candidates.append(d)
+
+		return candidates
+
+	def get_sales_invoices(self, bank_account, reference_nos):
+		si = frappe.qb.DocType("Sales Invoice")
+		sip = frappe.qb.DocType("Sales Invoice Payment")
+
+		return (
+			frappe.qb.from_(sip)
+			.join(si)
+			.on(sip.parent == si.name)
+			.select(
+				ConstantColumn("Sales Invoice").as_("doctype"),
+				si.name,
+				sip.amount.as_("matching_amount"),
+				sip.amount.as_("paid_amount"),
+				sip.reference_no,
+				ConstantColumn("").as_("reference_date"),
+				si.customer.as_("party"),
+				ConstantColumn("Customer").as_("party_type"),
+				si.posting_date,
+				si.currency,
+			)
+			.where(si.docstatus == 1)
+			.where(sip.clearance_date.isnull())
+			.where(sip.account == bank_account.account)
+			.where(sip.amount > 0.0)
+			.where(si.currency == bank_account.currency)
+			.where(sip.reference_no.isin(reference_nos))
+		).run(as_dict=True)
+
+
+def get_reference_key(reference_no):
+	# reference numbers are matched as the database compares them,
+	# case and trailing space insensitive on MariaDB
+	if frappe.db.db_type == "postgres":
+		return reference_no
+
+	return reference_no.rstrip().casefold()
+
+
 def get_auto_reconcile_message(partially_reconciled, reconciled):
 	"""Returns alert message and indicator for auto reconciliation depending on result state."""
 	alert_message, indicator = "", "blue"
@@ -98,3 +98,56 @@ class TestBankReconciliationTool(AccountsTestMixin, IntegrationTestCase):
 		# assert API output post reconciliation
 		transactions = get_bank_transactions(self.bank_account, from_date, to_date)
 		self.assertEqual(len(transactions), 0)
+
+	def test_auto_reconcile_allocates_vouchers_once(self):
+		from_date = add_days(today(), -2)
+		to_date = today()
+
+		payments = {}
+		for amount in (100, 60):
+			payment = create_payment_entry(
+				company=self.company,
+				posting_date=from_date,
+				payment_type="Receive",
+				party_type="Customer",
+				party=self.customer,
+				paid_from=self.debit_to,
+				paid_to=self.bank,
+				paid_amount=amount,
+			).save()
+			payment.reference_no = "REF-001"
+			payments[amount] = payment.save().submit()
+
+		bank_transactions = {}
+		for date, amount in ((add_days(today(), -1), 60), (to_date, 100)):
+			bank_transactions[amount] = (
+				frappe.get_doc(
+					{
+						"doctype": "Bank Transaction",
+						"date": date,
+						"deposit": amount,
+						"bank_account": self.bank_account,
+						"reference_number": "REF-001",
+						"currency": "INR",
+					}
+				)
+				.save()
+				.submit()
+			)
+
+		auto_reconcile_vouchers(
+			bank_account=self.bank_account,
+			from_date=from_date,
+			to_date=to_date,
+			filter_by_reference_date=False,
+		)
+
+		# both transactions match both payments, each payment is allocated to the transaction of its amount
+		for amount, bank_transaction in bank_transactions.items():
+			bank_transaction.reload()
+			self.assertEqual(bank_transaction.status, "Reconciled")
+			self.assertEqual(
+				[(d.payment_entry, d.allocated_amount) for d in bank_transaction.payment_entries],
+				[(payments[amount].name, amount)],
+			)
+			self.assertTrue(frappe.db.get_value("Payment Entry", payments[amount].name, "clearance_date"))
@@ -6,12 +6,13 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 from frappe.query_builder.functions import Sum
-from frappe.utils import add_months, flt, fmt_money, get_last_day, getdate
+from frappe.utils import add_days, add_months, flt, fmt_money, get_last_day, getdate
 from frappe.utils.data import get_first_day
 
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 )
+from erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot import get_gl_balance_snapshot_date
 from erpnext.accounts.utils import get_fiscal_year
 
 
@@ -525,11 +526,12 @@ def validate_budget_records(params, budget_records, expense_amount):
 
 def compare_expense_with_budget(params, budget_amount, action_for, action, budget_against, amount=0):
 	params.actual_expense, params.requested_amount, params.ordered_amount = get_actual_expense(params), 0, 0
-	if not amount:
-		params.requested_amount, params.ordered_amount = (
-			get_requested_amount(params),
-			get_ordered_amount(params),
-		)
+
+	# requested and ordered amounts scan the open Material Requests and Purchase Orders, for entries
+	# posted to the ledger they are only needed for the breakup of an exceeded budget
+	show_open_amounts = not amount
+	if show_open_amounts and params.get("doctype") in ("Material Request", "Purchase Order"):
+		set_requested_and_ordered_amount(params)
 
 		if params.get("doctype") == "Material Request" and params.for_material_request:
 			amount = params.requested_amount + params.ordered_amount
@@ -540,6 +542,9 @@ def compare_expense_with_budget(params, budget_amount, action_for, action, budge
 	total_expense = params.actual_expense + amount
 
 	if total_expense > budget_amount:
+		if show_open_amounts and params.get("doctype") not in ("Material Request", "Purchase Order"):
+			set_requested_and_ordered_amount(params)
+
 		if params.actual_expense > budget_amount:
 			diff = params.actual_expense - budget_amount
 			_msg = _("{0} Budget for Account {1} against {2} {3} is {4}. It is already exceeded by {5}.")
@@ -570,6 +575,13 @@ def compare_expense_with_budget(params, budget_amount, action_for, action, budge
 			frappe.msgprint(msg, indicator="orange", title=_("Budget Exceeded"))
 
 
+def set_requested_and_ordered_amount(params):
+	params.requested_amount, params.ordered_amount = (
+		get_requested_amount(params),
+		get_ordered_amount(params),
+	)
+
+
 def get_expense_breakup(params, currency, budget_against):
 	msg = "<hr> {} - <ul>".format(_("Total Expenses booked through"))
 
@@ -726,11 +738,9 @@ def get_actual_expense(params):
 		params.budget_against_doctype = frappe.unscrub(params.budget_against_field)
 
 	budget_against_field = params.get("budget_against_field")
-	condition1 = " and gle.posting_date <= %(month_end_date)s" if params.get("month_end_date") else ""
-
-	date_condition = (
-		f"and gle.posting_date between '{params.budget_start_date}' and '{params.budget_end_date}'"
-	)
+	to_date = getdate(params.budget_end_date)
+	if params.get("month_end_date"):
+		to_date = min(to_date, getdate(params.month_end_date))
 
 	if params.is_tree:
 		lft_rgt = frappe.db.get_value(
@@ -738,35 +748,59 @@ def get_actual_expense(params):
 		)
 		params.update(lft_rgt)
 
-		condition2 = f"""
-			and exists(
-				select name from `tab{params.budget_against_doctype}`
-				where lft >= %(lft)s and rgt <= %(rgt)s
-				and name = gle.{budget_against_field}
-			)
-		"""
+		budget_against = frappe.qb.DocType(params.budget_against_doctype)
+		budget_against_values = (
+			frappe.qb.from_(budget_against)
+			.select(budget_against.name)
+			.where((budget_against.lft >= params.lft) & (budget_against.rgt <= params.rgt))
+		)
+
+		def condition(table):
+			return table[budget_against_field].isin(budget_against_values)
+
 	else:
-		condition2 = f"""
-			and gle.{budget_against_field} = %({budget_against_field})s
-		"""
 
-	amount = flt(
-		frappe.db.sql(
-			f"""
-				select sum(gle.debit) - sum(gle.credit)
-				from `tabGL Entry` gle
-				where
-					is_cancelled = 0
-					and gle.account = %(account)s
-					{condition1}
-					{date_condition}
-					and gle.company = %(company)s
-					and gle.docstatus = 1
-					{condition2}
-			""",
-			params,
-		)[0][0]
-	)  # nosec
+		def condition(table):
+			return table[budget_against_field] == params.get(budget_against_field)
+
+	return get_booked_expense(params.company, params.account, params.budget_start_date, to_date, condition)
+
+
+def get_booked_expense(company, account, from_date, to_date, dimension_condition, fiscal_year=None):
+	"""Debit - credit of the account between the dates, read from GL Balance Snapshot till the snapshot
+	date and from GL Entry after it. `dimension_condition` returns the condition on the budget dimension
+	for either table."""
+	from_date, to_date = getdate(from_date), getdate(to_date)
+
+	def get_balance(doctype, from_date, to_date):
+		table = frappe.qb.DocType(doctype)
+		query = (
+			frappe.qb.from_(table)
+			.select(Sum(table.debit) - Sum(table.credit))
+			.where(
+				(table.company == company)
+				& (table.account == account)
+				& (table.posting_date >= from_date)
+				& (table.posting_date <= to_date)
+				& dimension_condition(table)
+			)
+		)
+		if fiscal_year:
+			query = query.where(table.fiscal_year == fiscal_year)
+
+		if doctype == "GL Entry":
+			query = query.where(table.is_cancelled == 0)
+
+		return flt(query.run()[0][0])
+
+	amount = 0.0
+	snapshot_date = get_gl_balance_snapshot_date(company, to_date, ignore_permissions=True)
+	if snapshot_date and snapshot_date >= from_date:
+		amount += get_balance("GL Balance Snapshot", from_date, snapshot_date)
+		from_date = add_days(snapshot_date, 1)
+
+	if from_date <= to_date:
+		amount += get_balance("GL Entry", from_date, to_date)
 
 	return amount
 
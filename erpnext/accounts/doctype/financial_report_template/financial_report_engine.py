@@ -31,6 +31,7 @@ from erpnext.accounts.doctype.financial_report_template.financial_report_validat
 	CalculationFormulaValidator,
 	DependencyValidator,
 )
+from erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot import get_gl_balance_snapshot_date
 from erpnext.accounts.report.financial_statements import (
 	get_columns,
 	get_cost_centers_with_children,
@@ -585,55 +586,91 @@ class FinancialQueryBuilder:
 		return self._rebase_closing_balances(zero_closing_balances, earliest_date)
 
 	def _get_gap_movements(self, account_names: list[str], from_date: str, to_date: str) -> dict[str, float]:
-		gl_table = frappe.qb.DocType("GL Entry")
-
-		query = (
-			frappe.qb.from_(gl_table)
-			.select(gl_table.account, Sum(gl_table.debit - gl_table.credit).as_("movement"))
-			.where(gl_table.company == self.company)
-			.where(gl_table.is_cancelled == 0)
-			.where(gl_table.account.isin(account_names))
-			.where(gl_table.posting_date > from_date)
-			.where(gl_table.posting_date < to_date)
-			.groupby(gl_table.account)
-		)
+		movements = {}
+
+		for doctype, table, query in self._get_ledger_queries(to_date):
+			query = (
+				query.select(table.account, Sum(table.debit - table.credit).as_("movement"))
+				.where(table.account.isin(account_names))
+				.where(table.posting_date > from_date)
+				.where(table.posting_date < to_date)
+				.groupby(table.account)
+			)
 
-		query = self._apply_standard_filters(query, gl_table)
-		results = self._execute_with_permissions(query, "GL Entry")
+			query = self._apply_standard_filters(query, table, doctype)
+			for row in self._execute_with_permissions(query, doctype):
+				movements[row["account"]] = movements.get(row["account"], 0.0) + (row["movement"] or 0.0)
 
-		return {row["account"]: row["movement"] or 0.0 for row in results}
+		return movements
 
 	def _get_gl_movements(self, account_names: list[str]) -> list[dict]:
-		gl_table = frappe.qb.DocType("GL Entry")
+		gl_movements = {}
+
+		for doctype, table, query in self._get_ledger_queries(self.periods[-1]["to_date"]):
+			query = (
+				query.select(table.account)
+				.where(table.account.isin(account_names))
+				.where(table.posting_date >= self.periods[0]["from_date"])
+				.groupby(table.account)
+			)
 
-		query = (
+			if not frappe.get_single_value("Accounts Settings", "ignore_is_opening_check_for_reporting"):
+				query = query.where(table.is_opening == "No")
+
+			# Add period-specific columns
+			for period in self.periods:
+				period_condition = (
+					Case()
+					.when(
+						(table.posting_date >= period["from_date"])
+						& (table.posting_date <= period["to_date"]),
+						table.debit - table.credit,
+					)
+					.else_(0)
+				)
+				query = query.select(Sum(period_condition).as_(period["key"]))
+
+			query = self._apply_standard_filters(query, table, doctype)
+			for row in self._execute_with_permissions(query, doctype):
+				if row["account"] not in gl_movements:
+					gl_movements[row["account"]] = row
+					continue
+
+				for period in self.periods:
+					gl_movements[row["account"]][period["key"]] = flt(
+						gl_movements[row["account"]][period["key"]]
+					) + flt(row[period["key"]])
+
+		return list(gl_movements.values())
+
+	def _get_ledger_queries(self, to_date: str) -> list[tuple]:
+		"""
+		Returns (doctype, table, base query) of the ledgers to read movements from.
+
+		GL Balance Snapshot holds daily balances till its date, GL Entry is read only after that.
+		"""
+		gl_table = frappe.qb.DocType("GL Entry")
+		gl_query = (
 			frappe.qb.from_(gl_table)
-			.select(gl_table.account)
 			.where(gl_table.company == self.company)
 			.where(gl_table.is_cancelled == 0)
-			.where(gl_table.account.isin(account_names))
-			.where(gl_table.posting_date >= self.periods[0]["from_date"])
-			.groupby(gl_table.account)
 		)
 
-		if not frappe.get_single_value("Accounts Settings", "ignore_is_opening_check_for_reporting"):
-			query = query.where(gl_table.is_opening == "No")
-
-		# Add period-specific columns
-		for period in self.periods:
-			period_condition = (
-				Case()
-				.when(
-					(gl_table.posting_date >= period["from_date"])
-					& (gl_table.posting_date <= period["to_date"]),
-					gl_table.debit - gl_table.credit,
-				)
-				.else_(0)
-			)
-			query = query.select(Sum(period_condition).as_(period["key"]))
+		snapshot_date = get_gl_balance_snapshot_date(self.company, to_date)
+		if not snapshot_date:
+			return [("GL Entry", gl_table, gl_query)]
 
-		query = self._apply_standard_filters(query, gl_table)
-		return self._execute_with_permissions(query, "GL Entry")
+		snapshot_table = frappe.qb.DocType("GL Balance Snapshot")
+		snapshot_query = (
+			frappe.qb.from_(snapshot_table)
+			.where(snapshot_table.company == self.company)
+			.where(snapshot_table.posting_date <= snapshot_date)
+		)
+
+		return [
+			("GL Balance Snapshot", snapshot_table, snapshot_query),
+			("GL Entry", gl_table, gl_query.where(gl_table.posting_date > snapshot_date)),
+		]
 
 	def _calculate_running_balances(self, balances_data: dict, gl_data: list[dict]) -> dict:
 		gl_dict = {row["account"]: row for row in gl_data}
@@ -0,0 +1,326 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import json
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Min, Sum
+from frappe.utils import add_days, flt, get_datetime, getdate, now, today
+
+from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
+	get_accounting_dimensions,
+)
+
+# number of days of GL Entry aggregated and committed at a time while building the snapshot
+SNAPSHOT_BUILD_WINDOW = 31
+
+SNAPSHOT_AMOUNT_FIELDS = (
+	"debit",
+	"credit",
+	"debit_in_account_currency",
+	"credit_in_account_currency",
+	"debit_in_reporting_currency",
+	"credit_in_reporting_currency",
+)
+
+
+class GLBalanceSnapshot(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		account: DF.Link | None
+		account_currency: DF.Link | None
+		company: DF.Link | None
+		cost_center: DF.Link | None
+		credit: DF.Currency
+		credit_in_account_currency: DF.Currency
+		credit_in_reporting_currency: DF.Currency
+		debit: DF.Currency
+		debit_in_account_currency: DF.Currency
+		debit_in_reporting_currency: DF.Currency
+		finance_book: DF.Link | None
+		fiscal_year: DF.Link | None
+		is_opening: DF.Literal["No", "Yes"]
+		is_period_closing_voucher_entry: DF.Check
+		posting_date: DF.Date | None
+		project: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("GL Balance Snapshot", ["company", "posting_date"])
+	frappe.db.add_index("GL Balance Snapshot", ["account", "posting_date"])
+
+
+def is_gl_balance_snapshot_enabled():
+	return frappe.get_single_value("Accounts Settings", "use_gl_balance_snapshot")
+
+
+def get_snapshot_state(company):
+	"""Returns the date till which the snapshot of the company is complete, the time its last build
+	started and the accounting dimensions it was built with"""
+	state = frappe.db.get_default(get_snapshot_state_key(company))
+	if state:
+		return frappe._dict(json.loads(state))
+
+
+def set_snapshot_state(company, upto, built_at, dimensions):
+	frappe.db.set_default(
+		get_snapshot_state_key(company),
+		json.dumps({"upto": str(upto), "built_at": str(built_at), "dimensions": dimensions}),
+	)
+
+
+def get_snapshot_state_key(company):
+	return f"gl_balance_snapshot::{company}"
+
+
+def get_gl_balance_snapshot_date(company, to_date=None, ignore_permissions=False):
+	"""Returns the date till which GL Balance Snapshot can be read instead of GL Entry,
+	None if the snapshot can not be used for the current user"""
+	if not is_gl_balance_snapshot_enabled():
+		return
+
+	state = get_snapshot_state(company)
+	if not state or not state.upto or state.dimensions != get_accounting_dimensions():
+		return
+
+	# snapshot rows don't carry the fields user permissions on GL Entry could be applied on
+	from frappe.desk.reportview import build_match_conditions
+
+	if not ignore_permissions and build_match_conditions("GL Entry"):
+		return
+
+	snapshot_date = getdate(state.upto)
+	if to_date:
+		snapshot_date = min(snapshot_date, getdate(to_date))
+
+	return snapshot_date
+
+
+def invalidate_gl_balance_snapshot(company, posting_date):
+	"""Exclude the snapshot from the posting date of a back dated GL Entry till it is rebuilt"""
+	state = get_snapshot_state(company)
+	if state and state.upto and getdate(posting_date) <= getdate(state.upto):
+		set_snapshot_state(company, add_days(posting_date, -1), state.built_at, state.dimensions)
+
+
+def invalidate_gl_balance_snapshot_of_voucher(voucher_type, voucher_no):
+	"""Exclude the snapshot from the earliest posting date of the GL Entries of the voucher,
+	called before the entries are deleted"""
+	gle = frappe.qb.DocType("GL Entry")
+	earliest_posting_dates = (
+		frappe.qb.from_(gle)
+		.select(gle.company, Min(gle.posting_date))
+		.where((gle.voucher_type == voucher_type) & (gle.voucher_no == voucher_no))
+		.groupby(gle.company)
+	).run()
+
+	for company, posting_date in earliest_posting_dates:
+		invalidate_gl_balance_snapshot(company, posting_date)
+
+
+def reset_gl_balance_snapshot(company):
+	frappe.db.delete("GL Balance Snapshot", {"company": company})
+	frappe.db.set_default(get_snapshot_state_key(company), None)
+
+
+def rebuild_gl_balance_snapshot(company):
+	"""Build the snapshot of the company again from GL Entry"""
+	reset_gl_balance_snapshot(company)
+	build_gl_balance_snapshot(company)
+
+
+def get_gl_balance_snapshot_differences(company):
+	"""Debit and credit per account and dimensions in the snapshot that don't match GL Entry
+	till the snapshot date, empty if the snapshot is consistent"""
+	state = get_snapshot_state(company)
+	if not state or not state.upto:
+		return []
+
+	from erpnext.accounts.utils import get_currency_precision
+
+	group_by_fields = ["account", "cost_center", "project", "finance_book", *state.dimensions]
+	precision = get_currency_precision()
+
+	def get_balances(doctype, condition):
+		table = frappe.qb.DocType(doctype)
+		query = (
+			frappe.qb.from_(table)
+			.select(*[table[field] for field in group_by_fields])
+			.select(Sum(table.debit).as_("debit"), Sum(table.credit).as_("credit"))
+			.where((table.company == company) & (table.posting_date <= state.upto))
+			.groupby(*[table[field] for field in group_by_fields])
+		)
+		if condition is not None:
+			query = query.where(condition(table))
+
+		return {
+			tuple(row[field] for field in group_by_fields): (
+				flt(row.debit, precision),
+				flt(row.credit, precision),
+			)
+			for row in query.run(as_dict=True)
+		}
+
+	snapshot_balances = get_balances("GL Balance Snapshot", None)
+	gl_balances = get_balances("GL Entry", lambda gle: gle.is_cancelled == 0)
+
+	differences = []
+	for key in set(snapshot_balances) | set(gl_balances):
+		snapshot_balance = snapshot_balances.get(key, (0.0, 0.0))
+		gl_balance = gl_balances.get(key, (0.0, 0.0))
+		if snapshot_balance != gl_balance:
+			differences.append(
+				frappe._dict(
+					zip(group_by_fields, key, strict=True),
+					snapshot_debit=snapshot_balance[0],
+					snapshot_credit=snapshot_balance[1],
+					debit=gl_balance[0],
+					credit=gl_balance[1],
+				)
+			)
+
+	return differences
+
+
+def update_gl_balance_snapshots():
+	"""Scheduled job to extend the snapshot of every company till yesterday"""
+	if not is_gl_balance_snapshot_enabled():
+		return
+
+	for company in frappe.get_all("Company", pluck="name"):
+		build_gl_balance_snapshot(company)
+
+
+def build_gl_balance_snapshot(company, upto=None):
+	upto = getdate(upto or add_days(today(), -1))
+	dimensions = get_accounting_dimensions()
+
+	state = get_snapshot_state(company)
+	if not state or state.dimensions != dimensions:
+		reset_gl_balance_snapshot(company)
+		state = frappe._dict()
+
+	if state.upto:
+		# back dated entries posted while the previous build was running
+		backdated_posting_date = get_earliest_posting_date(company, state.upto, state.built_at)
+		if backdated_posting_date:
+			state.upto = add_days(backdated_posting_date, -1)
+
+		from_date = add_days(state.upto, 1)
+	else:
+		from_date = get_earliest_posting_date(company)
+
+	built_at = now()
+	if not from_date or getdate(from_date) > upto:
+		set_snapshot_state(company, state.upto or upto, built_at, dimensions)
+		return
+
+	snapshot = frappe.qb.DocType("GL Balance Snapshot")
+	frappe.qb.from_(snapshot).delete().where(
+		(snapshot.company == company) & (snapshot.posting_date >= from_date)
+	).run()
+
+	from_date = getdate(from_date)
+	while from_date <= upto:
+		to_date = min(add_days(from_date, SNAPSHOT_BUILD_WINDOW - 1), upto)
+		insert_snapshot_rows(company, from_date, to_date, dimensions)
+
+		current_state = get_snapshot_state(company)
+		if current_state and current_state.upto and getdate(current_state.upto) < add_days(from_date, -1):
+			# a back dated entry was posted meanwhile, next build will continue from there
+			break
+
+		set_snapshot_state(company, to_date, built_at, dimensions)
+		if not frappe.in_test:
+			frappe.db.commit()  # nosemgrep
+		from_date = add_days(to_date, 1)
+
+
+def get_earliest_posting_date(company, upto=None, modified_after=None):
+	gle = frappe.qb.DocType("GL Entry")
+	query = frappe.qb.from_(gle).select(Min(gle.posting_date)).where(gle.company == company)
+
+	if upto:
+		query = query.where(gle.posting_date <= upto)
+
+	if modified_after:
+		query = query.where(gle.modified >= get_datetime(modified_after))
+
+	result = query.run()
+	return result[0][0] if result else None
+
+
+def insert_snapshot_rows(company, from_date, to_date, dimensions):
+	"""Aggregate GL Entry of a date range per day, account and dimensions"""
+	gle = frappe.qb.DocType("GL Entry")
+	group_by_fields = [
+		"posting_date",
+		"fiscal_year",
+		"account",
+		"account_currency",
+		"cost_center",
+		"project",
+		"finance_book",
+		"is_opening",
+		*dimensions,
+	]
+
+	fields = [
+		"name",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+		"company",
+		"is_period_closing_voucher_entry",
+		*group_by_fields,
+		*SNAPSHOT_AMOUNT_FIELDS,
+	]
+	timestamp = now()
+	values = []
+
+	for is_period_closing_voucher_entry in (0, 1):
+		query = (
+			frappe.qb.from_(gle)
+			.select(*[gle[field] for field in group_by_fields])
+			.select(*[Sum(gle[field]).as_(field) for field in SNAPSHOT_AMOUNT_FIELDS])
+			.where(
+				(gle.company == company)
+				& (gle.is_cancelled == 0)
+				& (gle.posting_date >= from_date)
+				& (gle.posting_date <= to_date)
+			)
+			.groupby(*[gle[field] for field in group_by_fields])
+		)
+
+		if is_period_closing_voucher_entry:
+			query = query.where(gle.voucher_type == "Period Closing Voucher")
+		else:
+			query = query.where(gle.voucher_type != "Period Closing Voucher")
+
+		for row in query.run(as_dict=True):
+			row.update(
+				{
+					"name": frappe.generate_hash(length=10),
+					"creation": timestamp,
+					"modified": timestamp,
+					"owner": "Administrator",
+					"modified_by": "Administrator",
+					"company": company,
+					"is_period_closing_voucher_entry": is_period_closing_voucher_entry,
+				}
+			)
+			values.append(tuple(row.get(field) for field in fields))
+
+	if values:
+		frappe.db.bulk_insert("GL Balance Snapshot", fields=fields, values=values)
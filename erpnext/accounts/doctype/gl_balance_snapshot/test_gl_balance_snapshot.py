@@ -0,0 +1,115 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import add_days, flt, getdate, today
+
+from erpnext.accounts.doctype.budget.budget import get_booked_expense
+from erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot import (
+	build_gl_balance_snapshot,
+	get_gl_balance_snapshot_date,
+	get_gl_balance_snapshot_differences,
+	get_snapshot_state,
+)
+from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+from erpnext.accounts.report.financial_statements import set_gl_entries_by_account
+from erpnext.accounts.utils import _delete_gl_entries
+
+
+class TestGLBalanceSnapshot(IntegrationTestCase):
+	def setUp(self):
+		self.company = "_Test Company"
+		self.accounts = ["_Test Bank - _TC", "_Test Cash - _TC"]
+
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def get_balances(self):
+		filters = frappe._dict(company=self.company, period_start_date=add_days(today(), -365))
+		gl_entries_by_account = set_gl_entries_by_account(
+			self.company, None, today(), filters, {}, ignore_closing_entries=True
+		)
+
+		return {
+			account: sum(
+				flt(entry.debit) - flt(entry.credit) for entry in gl_entries_by_account.get(account, [])
+			)
+			for account in self.accounts
+		}
+
+	@IntegrationTestCase.change_settings("Accounts Settings", {"use_gl_balance_snapshot": 1})
+	def test_snapshot_balances_match_gl_entry(self):
+		balances_from_gl_entry = self.get_balances()
+
+		make_journal_entry(*self.accounts, 100, posting_date=add_days(today(), -10), submit=True)
+		make_journal_entry(*self.accounts, 50, posting_date=today(), submit=True)
+		build_gl_balance_snapshot(self.company)
+
+		yesterday = add_days(today(), -1)
+		self.assertEqual(get_snapshot_state(self.company).upto, str(getdate(yesterday)))
+		self.assertEqual(get_gl_balance_snapshot_date(self.company), getdate(yesterday))
+
+		balances = self.get_balances()
+		self.assertEqual(balances[self.accounts[0]], balances_from_gl_entry[self.accounts[0]] + 150)
+		self.assertEqual(balances[self.accounts[1]], balances_from_gl_entry[self.accounts[1]] - 150)
+
+		# back dated posting moves the snapshot date before it till the snapshot is rebuilt
+		make_journal_entry(*self.accounts, 30, posting_date=add_days(today(), -20), submit=True)
+		self.assertEqual(get_gl_balance_snapshot_date(self.company), getdate(add_days(today(), -21)))
+		self.assertEqual(self.get_balances()[self.accounts[0]], balances[self.accounts[0]] + 30)
+
+		build_gl_balance_snapshot(self.company)
+		self.assertEqual(get_gl_balance_snapshot_date(self.company), getdate(yesterday))
+		self.assertEqual(self.get_balances()[self.accounts[0]], balances[self.accounts[0]] + 30)
+
+	@IntegrationTestCase.change_settings("Accounts Settings", {"use_gl_balance_snapshot": 1})
+	def test_deleted_gl_entries_invalidate_snapshot(self):
+		journal_entry = make_journal_entry(
+			*self.accounts, 70, posting_date=add_days(today(), -15), submit=True
+		)
+		build_gl_balance_snapshot(self.company)
+		balances = self.get_balances()
+
+		# entries deleted while reposting move the snapshot date before them
+		_delete_gl_entries(journal_entry.doctype, journal_entry.name)
+		self.assertEqual(get_gl_balance_snapshot_date(self.company), getdate(add_days(today(), -16)))
+		self.assertEqual(self.get_balances()[self.accounts[0]], balances[self.accounts[0]] - 70)
+
+	def test_booked_expense_from_snapshot(self):
+		expense_account, cost_center = "_Test Account Cost for Goods Sold - _TC", "_Test Cost Center - _TC"
+		from_date, to_date = add_days(today(), -30), today()
+
+		def get_expense():
+			return get_booked_expense(
+				self.company,
+				expense_account,
+				from_date,
+				to_date,
+				lambda table: table.cost_center == cost_center,
+			)
+
+		make_journal_entry(
+			expense_account, self.accounts[0], 100, posting_date=add_days(today(), -10), submit=True
+		)
+		expense_from_gl_entry = get_expense()
+
+		frappe.db.set_single_value("Accounts Settings", "use_gl_balance_snapshot", 1)
+		build_gl_balance_snapshot(self.company)
+		self.assertEqual(get_gl_balance_snapshot_date(self.company), getdate(add_days(today(), -1)))
+		self.assertFalse(get_gl_balance_snapshot_differences(self.company))
+		self.assertEqual(get_expense(), expense_from_gl_entry)
+
+		journal_entry = make_journal_entry(
+			expense_account, self.accounts[0], 40, posting_date=today(), submit=True
+		)
+		self.assertEqual(get_expense(), expense_from_gl_entry + 40)
+
+		# expense booked in the snapshot period isn't read from it once its entries are deleted
+		backdated_entry = make_journal_entry(
+			expense_account, self.accounts[0], 25, posting_date=add_days(today(), -5), submit=True
+		)
+		build_gl_balance_snapshot(self.company)
+		_delete_gl_entries(backdated_entry.doctype, backdated_entry.name)
+		_delete_gl_entries(journal_entry.doctype, journal_entry.name)
+		self.assertEqual(get_expense(), expense_from_gl_entry)
@@ -13,6 +13,9 @@ import erpnext
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_checks_for_pl_and_bs_accounts,
 )
+from erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot import (
+	invalidate_gl_balance_snapshot,
+)
 from erpnext.accounts.party import (
 	validate_account_party_type,
 	validate_party_frozen_disabled,
@@ -96,38 +99,42 @@ class GLEntry(Document):
 
 	def on_update(self):
 		adv_adj = self.flags.adv_adj
+		invalidate_gl_balance_snapshot(self.company, self.posting_date)
+
 		if not self.flags.from_repost and self.voucher_type != "Period Closing Voucher":
 			self.validate_account_details(adv_adj)
 			self.validate_dimensions_for_pl_and_bs()
 			validate_balance_type(self.account, adv_adj)
 			validate_frozen_account(self.company, self.account, adv_adj)
 
-			if (
-				self.voucher_type == "Journal Entry"
-				and frappe.get_cached_value("Journal Entry", self.voucher_no, "voucher_type")
-				== "Exchange Gain Or Loss"
-			):
-				return
-
-			if frappe.get_cached_value("Account", self.account, "account_type") not in [
-				"Receivable",
-				"Payable",
-			]:
-				# Update outstanding amt on against voucher
-				if (
-					self.against_voucher_type
-					in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
-					and self.against_voucher
-					and self.flags.update_outstanding == "Yes"
-					and not frappe.flags.is_reverse_depr_entry
-				):
-					update_outstanding_amt(
-						self.account,
-						self.party_type,
-						self.party,
-						self.against_voucher_type,
-						self.against_voucher,
-					)
+			if self.should_update_outstanding():
+				update_outstanding_amt(
+					self.account,
+					self.party_type,
+					self.party,
+					self.against_voucher_type,
+					self.against_voucher,
+				)
+
+	def should_update_outstanding(self):
+		"""Outstanding of the against voucher is updated from entries of accounts other than
+		receivable / payable, those are updated from Payment Ledger Entry"""
+		if (
+			self.voucher_type == "Journal Entry"
+			and frappe.get_cached_value("Journal Entry", self.voucher_no, "voucher_type")
+			== "Exchange Gain Or Loss"
+		):
+			return False
+
+		if frappe.get_cached_value("Account", self.account, "account_type") in ["Receivable", "Payable"]:
+			return False
+
+		return bool(
+			self.against_voucher_type in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
+			and self.against_voucher
+			and self.flags.update_outstanding == "Yes"
+			and not frappe.flags.is_reverse_depr_entry
+		)
 
 	def check_mandatory(self):
 		mandatory = ["account", "voucher_type", "voucher_no", "company"]
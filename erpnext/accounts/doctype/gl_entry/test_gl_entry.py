@@ -139,3 +139,42 @@ class TestGLEntry(IntegrationTestCase):
 
 		jv.save().submit()
 		self.assertEqual(1, jv.docstatus)
+
+	def test_bulk_insert_of_large_voucher(self):
+		from erpnext.accounts.general_ledger import BULK_GL_INSERT_THRESHOLD
+
+		rows = BULK_GL_INSERT_THRESHOLD + 5
+		jv = make_journal_entry("_Test Bank - _TC", "Debtors - _TC", 10 * rows, save=False)
+		jv.accounts[1].update(
+			{"party_type": "Customer", "party": "_Test Customer", "credit_in_account_currency": 10}
+		)
+		for _i in range(rows - 1):
+			jv.append("accounts", {**jv.accounts[1].as_dict(), "name": None, "idx": None})
+
+		jv.submit()
+
+		gl_entries = frappe.get_all(
+			"GL Entry",
+			filters={"voucher_type": "Journal Entry", "voucher_no": jv.name, "is_cancelled": 0},
+			fields=["account", "debit", "credit", "fiscal_year", "creation"],
+			order_by="creation",
+		)
+		self.assertEqual(len(gl_entries), rows + 1)
+		self.assertEqual(len({gle.creation for gle in gl_entries}), rows + 1)
+		self.assertTrue(all(gle.fiscal_year for gle in gl_entries))
+		self.assertEqual(sum(gle.debit for gle in gl_entries), sum(gle.credit for gle in gl_entries))
+
+		payment_ledger_entries = frappe.get_all(
+			"Payment Ledger Entry",
+			filters={"voucher_type": "Journal Entry", "voucher_no": jv.name, "delinked": 0},
+			pluck="amount",
+		)
+		self.assertEqual(payment_ledger_entries, [-10] * rows)
+
+		jv.cancel()
+		self.assertFalse(
+			frappe.db.exists(
+				"Payment Ledger Entry",
+				{"voucher_type": "Journal Entry", "voucher_no": jv.name, "delinked": 0},
+			)
+		)
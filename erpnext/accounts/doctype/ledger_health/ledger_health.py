@@ -15,9 +15,12 @@ class LedgerHealth(Document):
 		from frappe.types import DF
 
 		checked_on: DF.Datetime | None
+		company: DF.Link | None
 		debit_credit_mismatch: DF.Check
 		general_and_payment_ledger_mismatch: DF.Check
 		name: DF.Int | None
+		stock_and_account_value_mismatch: DF.Check
+		stock_ledger_mismatch: DF.Check
 		voucher_no: DF.Data | None
 		voucher_type: DF.Data | None
 	# end: auto-generated types
@@ -107,3 +107,37 @@ class TestLedgerHealth(AccountsTestMixin, IntegrationTestCase):
 		)
 		self.assertEqual(len(actual), 1)
 		self.assertEqual(expected, actual[0])
+
+	def test_only_vouchers_posted_since_last_check_are_verified(self):
+		self.create_journal()
+		run_ledger_health_checks()
+		self.assertFalse(frappe.db.get_all("Ledger Health"))
+
+		checked_upto = frappe.db.get_value(
+			"Ledger Health Monitor Company", {"company": self.company}, "checked_upto"
+		)
+		self.assertTrue(checked_upto)
+
+		# already verified voucher is not checked again
+		old_je = self.je
+		old_gle = frappe.db.get_all(
+			"GL Entry", filters={"voucher_no": old_je.name, "account": self.income_account}
+		)[0]
+		frappe.db.set_value("GL Entry", old_gle.name, "credit", 8000, update_modified=False)
+
+		self.create_journal()
+		gle = frappe.db.get_all(
+			"GL Entry", filters={"voucher_no": self.je.name, "account": self.income_account}
+		)[0]
+		frappe.db.set_value("GL Entry", gle.name, "credit", 8000)
+
+		run_ledger_health_checks()
+		actual = frappe.db.get_all("Ledger Health", fields=["company", "voucher_no", "debit_credit_mismatch"])
+		self.assertEqual(
+			actual, [{"company": self.company, "voucher_no": self.je.name, "debit_credit_mismatch": 1}]
+		)
+
+		# entries updated in place by reposting are checked again
+		frappe.db.set_value("GL Entry", old_gle.name, "credit", 7000)
+		run_ledger_health_checks()
+		self.assertTrue(frappe.db.exists("Ledger Health", {"voucher_no": old_je.name}))
@@ -1,8 +1,19 @@
 # Copyright (c) 2024, Frappe Technologies Pvt. Ltd. and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
+from frappe.query_builder.functions import Max, Sum
+from frappe.utils import add_days, create_batch, flt, get_datetime, getdate, now
+
+import erpnext
+from erpnext.accounts.utils import get_currency_precision, get_stock_accounts
+
+# number of vouchers verified per query
+LEDGER_HEALTH_BATCH_SIZE = 1000
+
+# stock value and account value of a voucher may differ by rounding of the individual entries
+STOCK_VALUE_TOLERANCE = 0.1
 
 
 class LedgerHealthMonitor(Document):
@@ -23,6 +34,361 @@ class LedgerHealthMonitor(Document):
 		enable_health_monitor: DF.Check
 		general_and_payment_ledger_mismatch: DF.Check
 		monitor_for_last_x_days: DF.Int
+		stock_and_account_value_mismatch: DF.Check
+		stock_ledger_mismatch: DF.Check
 	# end: auto-generated types
 
 	pass
+
+
+def get_ledger_health_checks():
+	"""Map of Ledger Health Monitor check to the method returning the vouchers failing it"""
+	return {
+		"debit_credit_mismatch": get_debit_credit_mismatch,
+		"general_and_payment_ledger_mismatch": get_general_and_payment_ledger_mismatch,
+		"stock_and_account_value_mismatch": get_stock_and_account_value_mismatch,
+		"stock_ledger_mismatch": get_stock_ledger_mismatch,
+	}
+
+
+def enqueue_ledger_health_checks():
+	settings = frappe.get_single("Ledger Health Monitor")
+	if not settings.enable_health_monitor:
+		return
+
+	checks = [check for check in get_ledger_health_checks() if settings.get(check)]
+	if not checks:
+		return
+
+	for row in settings.companies:
+		frappe.enqueue(
+			check_ledger_health,
+			company=row.company,
+			checks=checks,
+			monitor_for_last_x_days=settings.monitor_for_last_x_days,
+			queue="long",
+			job_id=f"ledger_health::{row.company}",
+			deduplicate=True,
+			now=frappe.in_test,
+		)
+
+
+def check_ledger_health(company, checks, monitor_for_last_x_days=60):
+	"""Verify the vouchers of the company posted or reposted since the last check"""
+	checked_upto = frappe.db.get_value(
+		"Ledger Health Monitor Company",
+		{"parent": "Ledger Health Monitor", "company": company},
+		"checked_upto",
+	)
+
+	run_date = get_datetime()
+	if checked_upto:
+		vouchers, last_modified = get_vouchers_to_check(company, modified_after=checked_upto)
+	else:
+		from_date = add_days(getdate(), -abs(monitor_for_last_x_days))
+		vouchers, last_modified = get_vouchers_to_check(company, from_date=from_date)
+
+	findings = {}
+	ledger_health_checks = get_ledger_health_checks()
+	for batch in create_batch(vouchers, LEDGER_HEALTH_BATCH_SIZE):
+		batch = set(batch)
+		voucher_nos = list({voucher_no for _voucher_type, voucher_no in batch})
+
+		for check in checks:
+			for voucher in ledger_health_checks[check](company, voucher_nos):
+				if voucher in batch:
+					findings.setdefault(voucher, set()).add(check)
+
+	make_ledger_health_entries(company, findings, run_date)
+
+	# entries committed after they were read but modified before the job started are checked next time
+	if last_modified:
+		frappe.db.set_value(
+			"Ledger Health Monitor Company",
+			{"parent": "Ledger Health Monitor", "company": company},
+			"checked_upto",
+			last_modified,
+		)
+
+
+def get_vouchers_to_check(company, modified_after=None, from_date=None):
+	"""Vouchers with ledger entries modified since the last check, reposting updates them in place,
+	and the latest modified timestamp among the entries read"""
+	vouchers = set()
+	last_modified = None
+	for doctype in ("GL Entry", "Payment Ledger Entry", "Stock Ledger Entry"):
+		ledger = frappe.qb.DocType(doctype)
+		query = (
+			frappe.qb.from_(ledger)
+			.select(ledger.voucher_type, ledger.voucher_no, Max(ledger.modified).as_("modified"))
+			.where(ledger.company == company)
+			.groupby(ledger.voucher_type, ledger.voucher_no)
+		)
+
+		if modified_after:
+			query = query.where(ledger.modified > modified_after)
+		else:
+			query = query.where(ledger.posting_date >= from_date)
+
+		for d in query.run(as_dict=True):
+			vouchers.add((d.voucher_type, d.voucher_no))
+			if not last_modified or d.modified > last_modified:
+				last_modified = d.modified
+
+	return sorted(vouchers), last_modified
+
+
+def make_ledger_health_entries(company, findings, checked_on):
+	checks = list(get_ledger_health_checks())
+	fields = ["creation", "modified", "owner", "modified_by", "company", "voucher_type", "voucher_no"]
+	fields += ["checked_on", *checks]
+
+	timestamp = now()
+	values = []
+	for (voucher_type, voucher_no), failed_checks in findings.items():
+		values.append(
+			(
+				timestamp,
+				timestamp,
+				frappe.session.user,
+				frappe.session.user,
+				company,
+				voucher_type,
+				voucher_no,
+				checked_on,
+				*(int(check in failed_checks) for check in checks),
+			)
+		)
+
+	if values:
+		frappe.db.bulk_insert("Ledger Health", fields=fields, values=values)
+
+
+def get_debit_credit_mismatch(company, voucher_nos):
+	gle = frappe.qb.DocType("GL Entry")
+	gl_entries = (
+		frappe.qb.from_(gle)
+		.select(gle.voucher_type, gle.voucher_no, Sum(gle.debit).as_("debit"), Sum(gle.credit).as_("credit"))
+		.where((gle.company == company) & (gle.is_cancelled == 0) & (gle.voucher_no.isin(voucher_nos)))
+		.groupby(gle.voucher_type, gle.voucher_no)
+	).run(as_dict=True)
+
+	precision = get_currency_precision()
+	return [
+		(d.voucher_type, d.voucher_no)
+		for d in gl_entries
+		if flt(d.debit, precision) != flt(d.credit, precision)
+	]
+
+
+def get_general_and_payment_ledger_mismatch(company, voucher_nos):
+	accounts = frappe.get_all(
+		"Account",
+		filters={"company": company, "account_type": ("in", ["Receivable", "Payable"])},
+		fields=["name", "account_type"],
+	)
+	if not accounts:
+		return []
+
+	payable_accounts = [d.name for d in accounts if d.account_type == "Payable"]
+
+	gle = frappe.qb.DocType("GL Entry")
+	gl_entries = (
+		frappe.qb.from_(gle)
+		.select(
+			gle.account,
+			gle.voucher_type,
+			gle.voucher_no,
+			gle.party_type,
+			gle.party,
+			(Sum(gle.debit) - Sum(gle.credit)).as_("balance"),
+		)
+		.where(
+			(gle.company == company)
+			& (gle.is_cancelled == 0)
+			& (gle.account.isin([d.name for d in accounts]))
+			& (gle.voucher_no.isin(voucher_nos))
+		)
+		.groupby(gle.account, gle.voucher_type, gle.voucher_no, gle.party_type, gle.party)
+	).run(as_dict=True)
+
+	ple = frappe.qb.DocType("Payment Ledger Entry")
+	payment_ledger_entries = (
+		frappe.qb.from_(ple)
+		.select(
+			ple.account,
+			ple.voucher_type,
+			ple.voucher_no,
+			ple.party_type,
+			ple.party,
+			Sum(ple.amount).as_("balance"),
+		)
+		.where(
+			(ple.company == company)
+			& (ple.delinked == 0)
+			& (ple.account.isin([d.name for d in accounts]))
+			& (ple.voucher_no.isin(voucher_nos))
+		)
+		.groupby(ple.account, ple.voucher_type, ple.voucher_no, ple.party_type, ple.party)
+	).run(as_dict=True)
+
+	precision = get_currency_precision()
+	balances = {}
+	for d in gl_entries:
+		# payment ledger holds payable balances as credit - debit
+		balance = -d.balance if d.account in payable_accounts else d.balance
+		balances[(d.account, d.voucher_type, d.voucher_no, d.party_type, d.party)] = flt(balance, precision)
+
+	for d in payment_ledger_entries:
+		key = (d.account, d.voucher_type, d.voucher_no, d.party_type, d.party)
+		balances[key] = flt(balances.get(key, 0) - flt(d.balance, precision), precision)
+
+	return list({(key[1], key[2]) for key, difference in balances.items() if difference})
+
+
+def get_stock_and_account_value_mismatch(company, voucher_nos):
+	if not erpnext.is_perpetual_inventory_enabled(company):
+		return []
+
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	stock_values = (
+		frappe.qb.from_(sle)
+		.select(sle.voucher_type, sle.voucher_no, Sum(sle.stock_value_difference).as_("value"))
+		.where((sle.company == company) & (sle.is_cancelled == 0) & (sle.voucher_no.isin(voucher_nos)))
+		.groupby(sle.voucher_type, sle.voucher_no)
+	).run(as_dict=True)
+
+	differences = {(d.voucher_type, d.voucher_no): flt(d.value) for d in stock_values}
+
+	stock_accounts = get_stock_accounts(company)
+	if stock_accounts:
+		gle = frappe.qb.DocType("GL Entry")
+		account_values = (
+			frappe.qb.from_(gle)
+			.select(
+				gle.voucher_type,
+				gle.voucher_no,
+				(Sum(gle.debit_in_account_currency) - Sum(gle.credit_in_account_currency)).as_("value"),
+			)
+			.where(
+				(gle.company == company)
+				& (gle.is_cancelled == 0)
+				& (gle.account.isin(stock_accounts))
+				& (gle.voucher_no.isin(voucher_nos))
+			)
+			.groupby(gle.voucher_type, gle.voucher_no)
+		).run(as_dict=True)
+
+		for d in account_values:
+			key = (d.voucher_type, d.voucher_no)
+			differences[key] = differences.get(key, 0) - flt(d.value)
+
+	return [voucher for voucher, difference in differences.items() if abs(difference) > STOCK_VALUE_TOLERANCE]
+
+
+def get_stock_ledger_mismatch(company, voucher_nos):
+	"""Vouchers whose stock ledger entries don't continue the balance qty and stock value
+	of the previous entry of the item and warehouse"""
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	entries = (
+		frappe.qb.from_(sle)
+		.select(sle.item_code, sle.warehouse, sle.posting_datetime)
+		.where((sle.company == company) & (sle.is_cancelled == 0) & (sle.voucher_no.isin(voucher_nos)))
+	).run(as_dict=True)
+
+	# verify every item and warehouse from the earliest entry of the vouchers
+	from_datetime = {}
+	for d in entries:
+		key = (d.item_code, d.warehouse)
+		if key not in from_datetime or d.posting_datetime < from_datetime[key]:
+			from_datetime[key] = d.posting_datetime
+
+	if not from_datetime:
+		return []
+
+	previous_entries = get_previous_stock_ledger_entries(from_datetime)
+	entries_to_verify = {}
+	for d in get_stock_ledger_entries(from_datetime):
+		key = (d.item_code, d.warehouse)
+		if key in from_datetime and d.posting_datetime >= from_datetime[key]:
+			entries_to_verify.setdefault(key, []).append(d)
+
+	qty_precision = frappe.get_precision("Stock Ledger Entry", "qty_after_transaction")
+	mismatched_vouchers = set()
+	for key, entries in entries_to_verify.items():
+		previous_sle = previous_entries.get(key)
+		for d in entries:
+			if previous_sle and d.voucher_type != "Stock Reconciliation":
+				qty_difference = previous_sle.qty_after_transaction + d.actual_qty - d.qty_after_transaction
+				value_difference = previous_sle.stock_value + d.stock_value_difference - d.stock_value
+
+				if flt(qty_difference, qty_precision) or abs(value_difference) > STOCK_VALUE_TOLERANCE:
+					mismatched_vouchers.add((d.voucher_type, d.voucher_no))
+
+			previous_sle = d
+
+	return list(mismatched_vouchers)
+
+
+def get_stock_ledger_entry_query():
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	return (
+		frappe.qb.from_(sle)
+		.select(
+			sle.item_code,
+			sle.warehouse,
+			sle.posting_datetime,
+			sle.voucher_type,
+			sle.voucher_no,
+			sle.actual_qty,
+			sle.qty_after_transaction,
+			sle.stock_value,
+			sle.stock_value_difference,
+		)
+		.where(sle.is_cancelled == 0)
+	)
+
+
+def get_stock_ledger_entries(from_datetime):
+	"""Entries of the items and warehouses from the earliest of the datetimes, in posting order"""
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	items = {item_code for item_code, _warehouse in from_datetime}
+	warehouses = {warehouse for _item_code, warehouse in from_datetime}
+
+	return (
+		get_stock_ledger_entry_query()
+		.where(
+			(sle.item_code.isin(items))
+			& (sle.warehouse.isin(warehouses))
+			& (sle.posting_datetime >= min(from_datetime.values()))
+		)
+		.orderby(sle.posting_datetime, sle.creation)
+	).run(as_dict=True)
+
+
+def get_previous_stock_ledger_entries(from_datetime):
+	"""Latest entry before the datetime of each item and warehouse, one query per batch"""
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	previous_entries = {}
+	for batch in create_batch(list(from_datetime.items()), LEDGER_HEALTH_BATCH_SIZE):
+		queries = [
+			get_stock_ledger_entry_query()
+			.where(
+				(sle.item_code == item_code)
+				& (sle.warehouse == warehouse)
+				& (sle.posting_datetime < posting_datetime)
+			)
+			.orderby(sle.posting_datetime, order=frappe.qb.desc)
+			.orderby(sle.creation, order=frappe.qb.desc)
+			.limit(1)
+			for (item_code, warehouse), posting_datetime in batch
+		]
+
+		query = queries[0]
+		for previous_query in queries[1:]:
+			query = query.union_all(previous_query)
+
+		for d in query.run(as_dict=True):
+			previous_entries[(d.item_code, d.warehouse)] = d
+
+	return previous_entries
@@ -14,6 +14,7 @@ class LedgerHealthMonitorCompany(Document):
 	if TYPE_CHECKING:
 		from frappe.types import DF
 
+		checked_upto: DF.Datetime | None
 		company: DF.Link | None
 		parent: DF.Data
 		parentfield: DF.Data
@@ -0,0 +1,244 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Case
+from frappe.query_builder.functions import Max, Sum
+from frappe.utils import create_batch, flt, get_datetime, now
+
+# number of against vouchers refreshed per query
+OUTSTANDING_BATCH_SIZE = 1000
+
+
+class PaymentLedgerOutstanding(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		account: DF.Link | None
+		account_currency: DF.Link | None
+		against_voucher_no: DF.DynamicLink | None
+		against_voucher_type: DF.Link | None
+		company: DF.Link | None
+		is_standalone: DF.Check
+		last_posting_date: DF.Date | None
+		outstanding: DF.Currency
+		outstanding_in_account_currency: DF.Currency
+		party: DF.DynamicLink | None
+		party_type: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Payment Ledger Outstanding", ["against_voucher_no", "against_voucher_type"])
+	frappe.db.add_index("Payment Ledger Outstanding", ["company", "account", "party_type", "party"])
+
+
+def is_payment_ledger_outstanding_enabled():
+	return frappe.get_single_value("Accounts Settings", "use_payment_ledger_outstanding")
+
+
+def get_outstanding_state_key(company):
+	return f"payment_ledger_outstanding::{company}"
+
+
+def is_payment_ledger_outstanding_built(company):
+	"""Outstanding of a company can be read once it was built after enabling the setting"""
+	return is_payment_ledger_outstanding_enabled() and bool(
+		frappe.db.get_default(get_outstanding_state_key(company))
+	)
+
+
+def reset_payment_ledger_outstanding(company=None):
+	companies = [company] if company else frappe.get_all("Company", pluck="name")
+	for company_name in companies:
+		frappe.db.delete("Payment Ledger Outstanding", {"company": company_name})
+		frappe.db.set_default(get_outstanding_state_key(company_name), None)
+
+
+def refresh_payment_ledger_outstanding(voucher_nos):
+	"""Recompute the outstanding of the given vouchers, and of the vouchers they are allocated against,
+	from Payment Ledger Entry"""
+	if not is_payment_ledger_outstanding_enabled():
+		return
+
+	voucher_nos = list({voucher_no for voucher_no in voucher_nos if voucher_no})
+	for batch in create_batch(voucher_nos, OUTSTANDING_BATCH_SIZE):
+		update_outstanding_rows(batch)
+
+
+def update_payment_ledger_outstanding():
+	"""Scheduled job to build the outstanding of every company, and to refresh the vouchers whose
+	entries changed since the previous build started"""
+	if not is_payment_ledger_outstanding_enabled():
+		return
+
+	for company in frappe.get_all("Company", pluck="name"):
+		build_payment_ledger_outstanding(company)
+
+
+def build_payment_ledger_outstanding(company):
+	built_at = frappe.db.get_default(get_outstanding_state_key(company))
+	started_at = now()
+
+	ple = frappe.qb.DocType("Payment Ledger Entry")
+	if built_at:
+		query = (
+			frappe.qb.from_(ple)
+			.select(ple.voucher_no, ple.against_voucher_no)
+			.distinct()
+			.where((ple.company == company) & (ple.modified >= get_datetime(built_at)))
+		)
+		voucher_nos = {voucher_no for row in query.run() for voucher_no in row}
+	else:
+		frappe.db.delete("Payment Ledger Outstanding", {"company": company})
+		query = (
+			frappe.qb.from_(ple)
+			.select(ple.against_voucher_no)
+			.distinct()
+			.where((ple.company == company) & (ple.delinked == 0))
+		)
+		voucher_nos = query.run(pluck=True)
+
+	for batch in create_batch(list(voucher_nos), OUTSTANDING_BATCH_SIZE):
+		update_outstanding_rows(batch)
+		if not frappe.in_test:
+			frappe.db.commit()  # nosemgrep
+
+	frappe.db.set_default(get_outstanding_state_key(company), started_at)
+
+
+def update_outstanding_rows(voucher_nos):
+	"""Replace the outstanding rows of the against vouchers with the sum of their Payment Ledger Entries"""
+	outstanding = frappe.qb.DocType("Payment Ledger Outstanding")
+	frappe.qb.from_(outstanding).delete().where(outstanding.against_voucher_no.isin(voucher_nos)).run()
+
+	ple = frappe.qb.DocType("Payment Ledger Entry")
+	group_by_fields = [
+		"company",
+		"account",
+		"account_currency",
+		"party_type",
+		"party",
+		"against_voucher_type",
+		"against_voucher_no",
+	]
+	is_self_entry = (ple.voucher_type == ple.against_voucher_type) & (
+		ple.voucher_no == ple.against_voucher_no
+	)
+
+	rows = (
+		frappe.qb.from_(ple)
+		.select(*[ple[field] for field in group_by_fields])
+		.select(
+			Sum(ple.amount).as_("outstanding"),
+			Sum(ple.amount_in_account_currency).as_("outstanding_in_account_currency"),
+			Max(ple.posting_date).as_("last_posting_date"),
+			Max(Case().when(is_self_entry, 1).else_(0)).as_("has_self_entry"),
+		)
+		.where((ple.delinked == 0) & (ple.against_voucher_no.isin(voucher_nos)))
+		.groupby(*[ple[field] for field in group_by_fields])
+	).run(as_dict=True)
+
+	if not rows:
+		return
+
+	from erpnext.accounts.utils import get_currency_precision
+
+	linked_vouchers = get_vouchers_linked_to_other_vouchers(voucher_nos)
+	precision = get_currency_precision()
+
+	fields = [
+		"name",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+		*group_by_fields,
+		"outstanding",
+		"outstanding_in_account_currency",
+		"last_posting_date",
+		"is_standalone",
+	]
+	timestamp = now()
+	values = []
+	for row in rows:
+		row.update(
+			{
+				"name": frappe.generate_hash(length=10),
+				"creation": timestamp,
+				"modified": timestamp,
+				"owner": "Administrator",
+				"modified_by": "Administrator",
+				"outstanding": flt(row.outstanding, precision),
+				"outstanding_in_account_currency": flt(row.outstanding_in_account_currency, precision),
+				"is_standalone": int(
+					bool(row.has_self_entry) and row.against_voucher_no not in linked_vouchers
+				),
+			}
+		)
+		values.append(tuple(row.get(field) for field in fields))
+
+	frappe.db.bulk_insert("Payment Ledger Outstanding", fields=fields, values=values)
+
+
+def get_vouchers_linked_to_other_vouchers(voucher_nos):
+	"""Vouchers with entries allocated against another voucher, and invoices with returns made against them.
+	Receivable / Payable report can show their balances on the row of another voucher."""
+	ple = frappe.qb.DocType("Payment Ledger Entry")
+	linked_vouchers = set(
+		frappe.qb.from_(ple)
+		.select(ple.voucher_no)
+		.distinct()
+		.where(
+			(ple.delinked == 0)
+			& (ple.voucher_no.isin(voucher_nos))
+			& (ple.against_voucher_no != ple.voucher_no)
+		)
+		.run(pluck=True)
+	)
+
+	for doctype in ("Sales Invoice", "Purchase Invoice"):
+		linked_vouchers.update(
+			frappe.get_all(
+				doctype,
+				filters={
+					"is_return": 1,
+					"docstatus": 1,
+					"update_outstanding_for_self": 0,
+					"return_against": ("in", voucher_nos),
+				},
+				pluck="return_against",
+			)
+		)
+
+	return linked_vouchers
+
+
+def get_settled_voucher_query(ple, report_date):
+	"""Outstanding rows settled on or before the report date, for the Payment Ledger Entries
+	of the query on `ple` to be excluded with"""
+	outstanding = frappe.qb.DocType("Payment Ledger Outstanding")
+	return (
+		frappe.qb.from_(outstanding)
+		.select(outstanding.name)
+		.where(
+			(outstanding.against_voucher_no == ple.against_voucher_no)
+			& (outstanding.against_voucher_type == ple.against_voucher_type)
+			& (outstanding.company == ple.company)
+			& (outstanding.account == ple.account)
+			& (outstanding.party_type == ple.party_type)
+			& (outstanding.party == ple.party)
+			& (outstanding.is_standalone == 1)
+			& (outstanding.outstanding == 0)
+			& (outstanding.outstanding_in_account_currency == 0)
+			& (outstanding.last_posting_date <= report_date)
+		)
+	)
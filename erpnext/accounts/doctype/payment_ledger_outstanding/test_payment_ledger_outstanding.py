@@ -0,0 +1,88 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import today
+
+from erpnext.accounts.doctype.payment_entry.payment_entry import get_payment_entry
+from erpnext.accounts.doctype.payment_ledger_outstanding.payment_ledger_outstanding import (
+	build_payment_ledger_outstanding,
+	is_payment_ledger_outstanding_built,
+)
+from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
+from erpnext.accounts.report.accounts_receivable.accounts_receivable import (
+	ReceivablePayableReport,
+	execute,
+)
+from erpnext.accounts.test.accounts_mixin import AccountsTestMixin
+
+
+class TestPaymentLedgerOutstanding(AccountsTestMixin, IntegrationTestCase):
+	def setUp(self):
+		self.create_company()
+		self.create_customer()
+		self.create_item()
+		self.clear_old_entries()
+
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def create_sales_invoice(self):
+		return create_sales_invoice(
+			item=self.item,
+			company=self.company,
+			customer=self.customer,
+			debit_to=self.debit_to,
+			parent_cost_center=self.cost_center,
+			cost_center=self.cost_center,
+			rate=100,
+			price_list_rate=100,
+		)
+
+	def get_outstanding(self, voucher_no):
+		return frappe.db.get_value(
+			"Payment Ledger Outstanding",
+			{"against_voucher_no": voucher_no},
+			["outstanding", "is_standalone"],
+			as_dict=True,
+		)
+
+	@IntegrationTestCase.change_settings("Accounts Settings", {"use_payment_ledger_outstanding": 1})
+	def test_settled_invoices_skipped_in_receivable_report(self):
+		filters = {
+			"company": self.company,
+			"party_type": "Customer",
+			"party": [self.customer],
+			"report_date": today(),
+			"range": "30, 60, 90, 120",
+		}
+
+		paid_invoice = self.create_sales_invoice()
+		open_invoice = self.create_sales_invoice()
+		build_payment_ledger_outstanding(self.company)
+		self.assertTrue(is_payment_ledger_outstanding_built(self.company))
+		self.assertEqual(self.get_outstanding(paid_invoice.name), {"outstanding": 100, "is_standalone": 1})
+
+		pe = get_payment_entry(paid_invoice.doctype, paid_invoice.name, bank_account=self.cash)
+		pe.submit()
+		self.assertEqual(self.get_outstanding(paid_invoice.name), {"outstanding": 0, "is_standalone": 1})
+		self.assertEqual(self.get_outstanding(open_invoice.name), {"outstanding": 100, "is_standalone": 1})
+
+		# entries of the paid invoice and its payment are not read
+		report = ReceivablePayableReport(dict(filters, account_type="Receivable"))
+		report.set_defaults()
+		report.prepare_ple_query()
+		self.assertEqual({ple.voucher_no for ple in report.ple_query.run(as_dict=True)}, {open_invoice.name})
+
+		rows = execute(filters)[1]
+		self.assertEqual([(row.voucher_no, row.outstanding) for row in rows], [(open_invoice.name, 100)])
+
+		# cancelled payment opens the invoice again
+		pe.cancel()
+		self.assertEqual(self.get_outstanding(paid_invoice.name), {"outstanding": 100, "is_standalone": 1})
+
+		rows = execute(filters)[1]
+		self.assertEqual(
+			sorted(row.voucher_no for row in rows), sorted([paid_invoice.name, open_invoice.name])
+		)
@@ -914,6 +914,62 @@ def get_stock_availability(item_code, warehouse):
 			return 0, is_stock_item, False
 
 
+def get_stock_availability_of_items(item_codes, warehouse):
+	"""Available qty of the items in the warehouse, as `get_stock_availability` returns it,
+	with the Bin, POS reservations and Product Bundles of all the items read in one query each"""
+	item_codes = list(set(item_codes))
+	if not item_codes:
+		return {}
+
+	stock_items = set(
+		frappe.get_all("Item", filters={"name": ("in", item_codes), "is_stock_item": 1}, pluck="name")
+	)
+
+	bundle_items = {}
+	non_stock_items = [item_code for item_code in item_codes if item_code not in stock_items]
+	if non_stock_items:
+		bundle = frappe.qb.DocType("Product Bundle")
+		bundle_item = frappe.qb.DocType("Product Bundle Item")
+		for d in (
+			frappe.qb.from_(bundle)
+			.join(bundle_item)
+			.on(bundle_item.parent == bundle.name)
+			.select(bundle.name, bundle_item.item_code, bundle_item.qty)
+			.where((bundle.name.isin(non_stock_items)) & (bundle.disabled == 0))
+			.orderby(bundle_item.idx)
+		).run(as_dict=True):
+			bundle_items.setdefault(d.name, []).append(d)
+
+	component_codes = {d.item_code for rows in bundle_items.values() for d in rows}
+	stock_components = set()
+	if component_codes:
+		stock_components = set(
+			frappe.get_all(
+				"Item", filters={"name": ("in", list(component_codes)), "is_stock_item": 1}, pluck="name"
+			)
+		)
+
+	bin_qty = get_bin_qty_of_items(list(stock_items | component_codes), warehouse)
+	reserved_qty = get_pos_reserved_qty_of_items(list(stock_items) + list(bundle_items), warehouse)
+
+	availability = {}
+	for item_code in item_codes:
+		if item_code in stock_items:
+			availability[item_code] = bin_qty.get(item_code, 0) - reserved_qty.get(item_code, 0)
+		elif item_code in bundle_items:
+			bundle_bin_qty = 1000000
+			for d in bundle_items[item_code]:
+				max_available_bundles = bin_qty.get(d.item_code, 0) / d.qty
+				if bundle_bin_qty > max_available_bundles and d.item_code in stock_components:
+					bundle_bin_qty = max_available_bundles
+
+			availability[item_code] = bundle_bin_qty - reserved_qty.get(item_code, 0)
+		else:
+			availability[item_code] = 0
+
+	return availability
+
+
 def get_product_bundle_stock_availability(item_code, warehouse, item_qty):
 	is_stock_item = True
 	bundle = frappe.get_doc("Product Bundle", item_code)
@@ -963,6 +1019,20 @@ def get_bin_qty(item_code, warehouse):
 	return bin_qty[0].actual_qty or 0 if bin_qty else 0
 
 
+def get_bin_qty_of_items(item_codes, warehouse):
+	if not item_codes:
+		return {}
+
+	bin = frappe.qb.DocType("Bin")
+	return frappe._dict(
+		(
+			frappe.qb.from_(bin)
+			.select(bin.item_code, IfNull(bin.actual_qty, 0))
+			.where((bin.item_code.isin(item_codes)) & (bin.warehouse == warehouse))
+		).run()
+	)
+
+
 def get_pos_reserved_qty(item_code, warehouse):
 	"""
 	Calculate total quantity reserved for the given item and warehouse.
@@ -1019,6 +1089,36 @@ def get_pos_reserved_qty_from_table(child_table, item_code, warehouse):
 	return flt(reserved_qty[0].stock_qty) if reserved_qty else 0
 
 
+def get_pos_reserved_qty_of_items(item_codes, warehouse):
+	"""Reserved qty of the items in the warehouse from submitted, unconsolidated POS Invoices,
+	summed from both the POS Invoice Item and Packed Item tables"""
+	reserved_qty = {}
+	if not item_codes:
+		return reserved_qty
+
+	p_inv = frappe.qb.DocType("POS Invoice")
+	for child_table in ("POS Invoice Item", "Packed Item"):
+		p_item = frappe.qb.DocType(child_table)
+		qty_column = "qty" if child_table == "Packed Item" else "stock_qty"
+
+		for item_code, qty in (
+			frappe.qb.from_(p_inv)
+			.from_(p_item)
+			.select(p_item.item_code, Sum(p_item[qty_column]))
+			.where(
+				(p_inv.name == p_item.parent)
+				& (IfNull(p_inv.consolidated_invoice, "") == "")
+				& (p_item.docstatus == 1)
+				& (p_item.item_code.isin(item_codes))
+				& (p_item.warehouse == warehouse)
+			)
+			.groupby(p_item.item_code)
+		).run():
+			reserved_qty[item_code] = reserved_qty.get(item_code, 0) + flt(qty)
+
+	return reserved_qty
+
+
 @frappe.whitelist()
 def make_sales_return(source_name, target_doc=None):
 	from erpnext.controllers.sales_and_purchase_return import make_return_doc
@@ -145,6 +145,24 @@ class PricingRule(Document):
 		if not self.margin_type:
 			self.margin_rate_or_amount = 0.0
 
+	def on_update(self):
+		self.clear_pricing_rule_index()
+
+	def on_trash(self):
+		self.clear_pricing_rule_index()
+
+	def after_rename(self, old_name, new_name, merge=False):
+		self.clear_pricing_rule_index()
+
+	def clear_pricing_rule_index(self):
+		from erpnext.accounts.doctype.pricing_rule.utils import clear_pricing_rule_index
+
+		clear_pricing_rule_index()
+		# index built before the commit, here or in a concurrent request, would miss the changes
+		frappe.db.after_commit.add(clear_pricing_rule_index)
+		# index built in this transaction would keep the changes after a rollback
+		frappe.db.after_rollback.add(clear_pricing_rule_index)
+
 	def validate_duplicate_apply_on(self):
 		if self.apply_on != "Transaction":
 			apply_on_table = apply_on_dict.get(self.apply_on)
@@ -341,6 +359,8 @@ def apply_pricing_rule(args, doc=None):
 	}
 	"""
 
+	from erpnext.accounts.doctype.pricing_rule.utils import prefetch_pricing_rules
+
 	if isinstance(args, str):
 		args = json.loads(args)
 
@@ -369,11 +389,15 @@ def apply_pricing_rule(args, doc=None):
 	for item_code, val in query_items:
 		serialized_items.setdefault(item_code, val)
 
-	for item in item_list:
-		args_copy = copy.deepcopy(args)
-		args_copy.update(item)
-		data = get_pricing_rule_for_item(args_copy, doc=doc)
-		out.append(data)
+	prefetch_pricing_rules(args, item_list)
+	try:
+		for item in item_list:
+			args_copy = copy.deepcopy(args)
+			args_copy.update(item)
+			data = get_pricing_rule_for_item(args_copy, doc=doc)
+			out.append(data)
+	finally:
+		frappe.flags.prefetched_pricing_rules = None
 
 	return out
 
@@ -1444,6 +1444,105 @@ class TestPricingRule(IntegrationTestCase):
 			item_group_rule.delete()
 			item_code_rule.delete()
 
+	def test_pricing_rules_for_batch_of_items(self):
+		from erpnext.accounts.doctype.pricing_rule.pricing_rule import (
+			apply_pricing_rule,
+			get_pricing_rule_for_item,
+		)
+
+		for item_code in ["PR Batch Item 1", "PR Batch Item 2"]:
+			make_item(item_code, {"item_group": "_Test Item Group"})
+
+		item_rule = make_pricing_rule(
+			title="_Test Pricing Rule 1", item_code="PR Batch Item 1", selling=1, discount_percentage=10
+		)
+		make_pricing_rule(
+			title="_Test Pricing Rule 2",
+			apply_on="Item Group",
+			item_group="_Test Item Group",
+			selling=1,
+			discount_percentage=5,
+		)
+
+		args = {
+			"doctype": "Sales Order",
+			"customer": "_Test Customer",
+			"company": "_Test Company",
+			"currency": "INR",
+			"price_list": "_Test Price List",
+			"transaction_date": frappe.utils.today(),
+			"conversion_rate": 1,
+			"plc_conversion_rate": 1,
+		}
+		items = [
+			{
+				"doctype": "Sales Order Item",
+				"name": f"row-{idx}",
+				"child_docname": f"row-{idx}",
+				"item_code": item_code,
+				"qty": 1,
+				"stock_qty": 1,
+				"price_list_rate": 100,
+				"conversion_factor": 1,
+			}
+			for idx, item_code in enumerate(["PR Batch Item 1", "PR Batch Item 2"])
+		]
+
+		def assert_batch_matches_single_items(expected_discounts):
+			out = apply_pricing_rule({**args, "items": items})
+			for item, item_details, discount in zip(items, out, expected_discounts, strict=True):
+				item_args = frappe._dict({**args, **item, "transaction_type": "selling"})
+				self.assertEqual(item_details, get_pricing_rule_for_item(item_args))
+				self.assertEqual(item_details.discount_percentage, discount)
+
+		assert_batch_matches_single_items([10, 5])
+
+		# pricing rule index is rebuilt after the items of a pricing rule change
+		item_rule.items[0].item_code = "PR Batch Item 2"
+		item_rule.save()
+		assert_batch_matches_single_items([5, 10])
+
+	def test_pricing_rule_saved_after_index_is_built(self):
+		from erpnext.accounts.doctype.pricing_rule.pricing_rule import apply_pricing_rule
+		from erpnext.accounts.doctype.pricing_rule.utils import PRICING_RULE_INDEX, get_pricing_rule_index
+
+		make_item("PR Index Item", {"item_group": "_Test Item Group"})
+		args = {
+			"doctype": "Sales Order",
+			"customer": "_Test Customer",
+			"company": "_Test Company",
+			"currency": "INR",
+			"price_list": "_Test Price List",
+			"transaction_date": frappe.utils.today(),
+			"conversion_rate": 1,
+			"plc_conversion_rate": 1,
+			"items": [
+				{
+					"doctype": "Sales Order Item",
+					"name": "row-1",
+					"child_docname": "row-1",
+					"item_code": "PR Index Item",
+					"qty": 1,
+					"stock_qty": 1,
+					"price_list_rate": 100,
+					"conversion_factor": 1,
+				}
+			],
+		}
+		self.assertFalse(apply_pricing_rule(args)[0].discount_percentage)
+		stale_index = get_pricing_rule_index("_Test Company")
+
+		frappe.db.after_commit.reset()
+		make_pricing_rule(
+			title="_Test Pricing Rule 1", item_code="PR Index Item", selling=1, discount_percentage=10
+		)
+
+		# a concurrent request rebuilds the index before the rule is committed
+		frappe.cache.hset(PRICING_RULE_INDEX, "_Test Company", stale_index)
+		frappe.db.after_commit.run()
+
+		self.assertEqual(apply_pricing_rule(args)[0].discount_percentage, 10)
+
 	def test_validation_on_mixed_condition_with_recursion(self):
 		pricing_rule = make_pricing_rule(
 			discount_percentage=10,
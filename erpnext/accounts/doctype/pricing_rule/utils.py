@@ -9,7 +9,8 @@ import json
 
 import frappe
 from frappe import _, bold
-from frappe.utils import cint, flt, fmt_money, get_link_to_form, getdate, today
+from frappe.query_builder.functions import IfNull
+from frappe.utils import cint, cstr, flt, fmt_money, get_link_to_form, getdate, today
 
 from erpnext.setup.doctype.item_group.item_group import get_child_item_groups
 from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
@@ -22,6 +23,22 @@ class MultiplePricingRuleConflict(frappe.ValidationError):
 
 apply_on_table = {"Item Code": "items", "Item Group": "item_groups", "Brand": "brands"}
 
+selling_doctypes = (
+	"Quotation",
+	"Quotation Item",
+	"Sales Order",
+	"Sales Order Item",
+	"Delivery Note",
+	"Delivery Note Item",
+	"Sales Invoice",
+	"Sales Invoice Item",
+	"POS Invoice",
+	"POS Invoice Item",
+)
+
+# redis hash of pricing rule names by the item, item group or brand they apply on, per company
+PRICING_RULE_INDEX = "pricing_rule_index"
+
 
 def get_pricing_rules(args, doc=None):
 	pricing_rules = []
@@ -104,6 +121,11 @@ def _get_pricing_rules(apply_on, args, values):
 	if not args.get(apply_on_field):
 		return []
 
+	if frappe.flags.prefetched_pricing_rules:
+		pricing_rules = _get_prefetched_pricing_rules(apply_on, args)
+		if pricing_rules is not None:
+			return pricing_rules
+
 	child_doc = f"`tabPricing Rule {apply_on}`"
 
 	conditions = item_variant_condition = item_conditions = ""
@@ -172,6 +194,203 @@ def _get_pricing_rules(apply_on, args, values):
 	return pricing_rules
 
 
+def get_pricing_rule_index(company):
+	index = frappe.cache.hget(PRICING_RULE_INDEX, company or "")
+	if index is None:
+		index = _build_pricing_rule_index(company)
+		frappe.cache.hset(PRICING_RULE_INDEX, company or "", index)
+
+	return index
+
+
+def clear_pricing_rule_index():
+	frappe.cache.delete_value(PRICING_RULE_INDEX)
+
+
+def _build_pricing_rule_index(company):
+	pr = frappe.qb.DocType("Pricing Rule")
+	company_condition = IfNull(pr.company, "").isin([company or "", ""])
+
+	index = {}
+	for apply_on in apply_on_table:
+		apply_on_field = frappe.scrub(apply_on)
+		child = frappe.qb.DocType(f"Pricing Rule {apply_on}")
+
+		rules = (
+			frappe.qb.from_(child)
+			.join(pr)
+			.on(child.parent == pr.name)
+			.select(child[apply_on_field], pr.name)
+			.where(company_condition & child[apply_on_field].isnotnull())
+			.run()
+		)
+
+		rules += (
+			frappe.qb.from_(pr)
+			.select(pr[f"other_{apply_on_field}"], pr.name)
+			.where(company_condition & pr[f"other_{apply_on_field}"].isnotnull())
+			.run()
+		)
+
+		for value, name in rules:
+			index.setdefault((apply_on_field, value), set()).add(name)
+
+	return index
+
+
+def _get_candidate_pricing_rules(index, apply_on_field, args):
+	"""Names of the pricing rules which apply on the item, item group or brand of `args` directly,
+	through its parent item group or template item, or as other item"""
+	value = args.get(apply_on_field)
+	if apply_on_field == "item_group":
+		values = _get_tree_parents("Item Group", value)
+	elif apply_on_field == "item_code" and args.get("variant_of"):
+		values = [value, args.variant_of]
+	else:
+		values = [value]
+
+	candidates = set()
+	for d in values:
+		candidates.update(index.get((apply_on_field, d), ()))
+
+	return candidates
+
+
+def prefetch_pricing_rules(args, items):
+	"""Load the pricing rules which can apply on any of the items of a transaction in one pass.
+	`_get_pricing_rules` then evaluates them in memory instead of querying for every item."""
+	if not frappe.db.count("Pricing Rule", cache=True):
+		return
+
+	item_codes = list({item.get("item_code") for item in items if item.get("item_code")})
+	item_details = {
+		d.name: d
+		for d in frappe.get_all(
+			"Item", filters={"name": ("in", item_codes)}, fields=["name", "item_group", "brand", "variant_of"]
+		)
+	}
+
+	index = get_pricing_rule_index(args.get("company"))
+	candidates = {apply_on: set() for apply_on in apply_on_table}
+	for item in items:
+		for item_args in (item, item_details.get(item.get("item_code"))):
+			if not item_args:
+				continue
+
+			for apply_on in apply_on_table:
+				apply_on_field = frappe.scrub(apply_on)
+				if item_args.get(apply_on_field):
+					candidates[apply_on].update(
+						_get_candidate_pricing_rules(index, apply_on_field, frappe._dict(item_args))
+					)
+
+	prefetched = frappe._dict(index=index, names=candidates, rules={})
+	for apply_on, names in candidates.items():
+		prefetched.rules[apply_on] = {}
+		if not names:
+			continue
+
+		apply_on_field = frappe.scrub(apply_on)
+		child_doc = f"`tabPricing Rule {apply_on}`"
+		for d in frappe.db.sql(
+			f"""select `tabPricing Rule`.*,
+				{child_doc}.{apply_on_field}, {child_doc}.uom
+			from `tabPricing Rule`, {child_doc}
+			where {child_doc}.parent = `tabPricing Rule`.name
+				and `tabPricing Rule`.name in %(names)s""",
+			{"names": tuple(names)},
+			as_dict=1,
+		):
+			prefetched.rules[apply_on].setdefault(d.name, []).append(d)
+
+	frappe.flags.prefetched_pricing_rules = prefetched
+
+
+def _get_prefetched_pricing_rules(apply_on, args):
+	"""Evaluates the conditions of the query in `_get_pricing_rules` on the prefetched pricing rules.
+	Returns None if the pricing rules of the item were not prefetched."""
+	prefetched = frappe.flags.prefetched_pricing_rules
+	apply_on_field = frappe.scrub(apply_on)
+	value = args.get(apply_on_field)
+
+	if apply_on_field == "item_code" and "variant_of" not in args:
+		args.variant_of = frappe.get_cached_value("Item", args.item_code, "variant_of")
+
+	candidates = _get_candidate_pricing_rules(prefetched.index, apply_on_field, args)
+	if not candidates.issubset(prefetched.names[apply_on]):
+		return
+
+	if not args.price_list:
+		args.price_list = None
+
+	item_groups = _get_tree_parents("Item Group", value) if apply_on_field == "item_group" else []
+	allowed_values = {"warehouse": _get_allowed_tree_values(args, "Warehouse")}
+	for field in ["company", "customer", "supplier", "campaign", "sales_partner"]:
+		allowed_values[field] = (args.get(field), "") if args.get(field) else ("",)
+	for parenttype in ["Customer Group", "Territory", "Supplier Group"]:
+		allowed_values[frappe.scrub(parenttype)] = _get_allowed_tree_values(args, parenttype)
+
+	date = args.get("transaction_date") or frappe.get_value(
+		args.get("doctype"), args.get("name"), "posting_date", ignore=True
+	)
+	date = getdate(date) if date else None
+	selling_or_buying = "selling" if args.get("doctype") in selling_doctypes else "buying"
+
+	def is_applicable(rule):
+		if (
+			rule.disable
+			or cint(rule.get(args.transaction_type)) != 1
+			or not cint(rule.get(selling_or_buying))
+		):
+			return False
+
+		if (rule.for_price_list or "") not in (args.price_list, ""):
+			return False
+
+		for field, values in allowed_values.items():
+			if values is not None and (rule.get(field) or "") not in values:
+				return False
+
+		if date and not (
+			getdate(rule.valid_from or "2000-01-01") <= date <= getdate(rule.valid_upto or "2500-12-31")
+		):
+			return False
+
+		if rule.apply_rule_on_other is not None and rule.get(f"other_{apply_on_field}") == value:
+			return True
+
+		if apply_on_field == "item_code" and args.variant_of and rule.item_code == args.variant_of:
+			return True
+
+		if args.get("uom") and apply_on_field != "brand" and (rule.uom or "") not in (args.uom, ""):
+			return False
+
+		if apply_on_field == "item_group":
+			return (rule.item_group or "") in item_groups
+
+		return rule.get(apply_on_field) == value
+
+	pricing_rules = [
+		frappe._dict(rule)
+		for name in candidates
+		for rule in prefetched.rules[apply_on].get(name, [])
+		if is_applicable(rule)
+	]
+
+	return sorted(pricing_rules, key=lambda d: (cstr(d.priority), d.name), reverse=True)
+
+
+def _get_allowed_tree_values(args, parenttype):
+	"""Values of the tree field a pricing rule can have to apply on `args`, None if any value is allowed"""
+	field = frappe.scrub(parenttype)
+	if not args.get(field):
+		return ("",)
+
+	parent_groups = _get_tree_parents(parenttype, args.get(field))
+	if parent_groups:
+		return (*parent_groups, "")
+
+
 def apply_multiple_pricing_rules(pricing_rules):
 	for d in pricing_rules:
 		if not d.apply_multiple_pricing_rules:
@@ -184,51 +403,56 @@ def _get_tree_conditions(args, parenttype, table, allow_blank=True):
 	field = frappe.scrub(parenttype)
 	condition = ""
 	if args.get(field):
-		if not frappe.flags.tree_conditions:
-			frappe.flags.tree_conditions = {}
-		key = (parenttype, args.get(field))
-		if key in frappe.flags.tree_conditions:
-			return frappe.flags.tree_conditions[key]
-
-		try:
-			lft, rgt = frappe.db.get_value(parenttype, args.get(field), ["lft", "rgt"])
-		except TypeError:
-			frappe.throw(_("Invalid {0}").format(args.get(field)))
-
-		parent_groups = frappe.db.sql_list(
-			"""select name from `tab{}`
-			where lft<={} and rgt>={}""".format(parenttype, "%s", "%s"),
-			(lft, rgt),
-		)
-
-		if parenttype in ["Customer Group", "Item Group", "Territory"]:
-			parent_field = f"parent_{frappe.scrub(parenttype)}"
-			root_name = frappe.db.get_list(
-				parenttype,
-				{"is_group": 1, parent_field: ("is", "not set")},
-				"name",
-				as_list=1,
-				ignore_permissions=True,
-			)
-
-			if root_name and root_name[0][0]:
-				parent_groups.append(root_name[0][0])
+		parent_groups = _get_tree_parents(parenttype, args.get(field))
 
 		if parent_groups:
 			if allow_blank:
-				parent_groups.append("")
+				parent_groups = [*parent_groups, ""]
 			condition = "ifnull({table}.{field}, '') in ({parent_groups})".format(
 				table=table, field=field, parent_groups=", ".join(frappe.db.escape(d) for d in parent_groups)
 			)
 
-			frappe.flags.tree_conditions[key] = condition
-
 	elif allow_blank:
 		condition = f"ifnull({table}.{field}, '') = ''"
 
 	return condition
 
 
+def _get_tree_parents(parenttype, name):
+	if not frappe.flags.tree_parents:
+		frappe.flags.tree_parents = {}
+	key = (parenttype, name)
+	if key in frappe.flags.tree_parents:
+		return frappe.flags.tree_parents[key]
+
+	try:
+		lft, rgt = frappe.db.get_value(parenttype, name, ["lft", "rgt"])
+	except TypeError:
+		frappe.throw(_("Invalid {0}").format(name))
+
+	parent_groups = frappe.db.sql_list(
+		"""select name from `tab{}`
+		where lft<={} and rgt>={}""".format(parenttype, "%s", "%s"),
+		(lft, rgt),
+	)
+
+	if parenttype in ["Customer Group", "Item Group", "Territory"]:
+		parent_field = f"parent_{frappe.scrub(parenttype)}"
+		root_name = frappe.db.get_list(
+			parenttype,
+			{"is_group": 1, parent_field: ("is", "not set")},
+			"name",
+			as_list=1,
+			ignore_permissions=True,
+		)
+
+		if root_name and root_name[0][0]:
+			parent_groups.append(root_name[0][0])
+
+	frappe.flags.tree_parents[key] = parent_groups
+	return parent_groups
+
+
 def get_other_conditions(conditions, values, args):
 	for field in ["company", "customer", "supplier", "campaign", "sales_partner"]:
 		if args.get(field):
@@ -250,18 +474,7 @@ def get_other_conditions(conditions, values, args):
 			and ifnull(`tabPricing Rule`.valid_upto, '2500-12-31')"""
 		values["transaction_date"] = date
 
-	if args.get("doctype") in [
-		"Quotation",
-		"Quotation Item",
-		"Sales Order",
-		"Sales Order Item",
-		"Delivery Note",
-		"Delivery Note Item",
-		"Sales Invoice",
-		"Sales Invoice Item",
-		"POS Invoice",
-		"POS Invoice Item",
-	]:
+	if args.get("doctype") in selling_doctypes:
 		conditions += """ and ifnull(`tabPricing Rule`.selling, 0) = 1"""
 	else:
 		conditions += """ and ifnull(`tabPricing Rule`.buying, 0) = 1"""
@@ -3,7 +3,9 @@
 
 import frappe
 from frappe.tests import IntegrationTestCase
+from frappe.utils import getdate
 
+from erpnext.accounts.deferred_revenue import get_booked_deferred_amounts
 from erpnext.accounts.doctype.account.test_account import create_account
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import (
 	check_gl_entries,
@@ -68,6 +70,12 @@ class TestProcessDeferredAccounting(IntegrationTestCase):
 
 		check_gl_entries(self, si.name, expected_gle, "2023-07-01")
 
+		booked = get_booked_deferred_amounts(
+			"Sales Invoice", si.company, deferred_account, [si.items[0].name]
+		)
+		self.assertEqual(booked[si.items[0].name].base_amount, 2000)
+		self.assertEqual(getdate(booked[si.items[0].name].posting_date), getdate("2023-06-30"))
+
 		# cancel the process deferred accounting document
 		process_deferred_accounting.cancel()
 
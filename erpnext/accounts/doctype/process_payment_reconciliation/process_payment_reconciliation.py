@@ -2,13 +2,17 @@
 # For license information, please see license.txt
 
 import json
+import time
 
 import frappe
 from frappe import _, qb
 from frappe.model.document import Document
-from frappe.utils import get_link_to_form
+from frappe.utils import flt, get_link_to_form, now_datetime, time_diff_in_seconds
 from frappe.utils.scheduler import is_scheduler_inactive
 
+# seconds after which a reconcile job enqueues the next one, instead of reconciling the next reference
+RECONCILE_JOB_TIME_LIMIT = 600
+
 
 class ProcessPaymentReconciliation(Document):
 	# begin: auto-generated types
@@ -212,7 +216,6 @@ def trigger_reconciliation_for_queued_docs():
 		)
 
 		docs_to_trigger = []
-		unique_filters = set()
 		queue_size = frappe.get_single_value("Accounts Settings", "reconciliation_queue_size") or 5
 
 		fields = ["company", "party_type", "party", "receivable_payable_account", "default_advance_account"]
@@ -223,6 +226,17 @@ def trigger_reconciliation_for_queued_docs():
 				filters += tuple(doc.get(x))
 			return filters
 
+		# docs of different parties are reconciled in parallel, those of a party already being
+		# reconciled wait for it to complete
+		unique_filters = {
+			get_filters_as_tuple(fields, doc)
+			for doc in frappe.db.get_all(
+				"Process Payment Reconciliation",
+				filters={"docstatus": 1, "status": ("in", ["Running", "Paused"])},
+				fields=fields,
+			)
+		}
+
 		for x in all_queued:
 			doc = frappe.get_doc("Process Payment Reconciliation", x)
 			filters = get_filters_as_tuple(fields, doc)
@@ -405,42 +419,33 @@ def reconcile(doc: None | str = None) -> None:
 
 			reconciled_entries, total_allocations = res[0]
 			if reconciled_entries != total_allocations:
+				started_at = time.monotonic()
+				account_currencies = {}
 				try:
-					# Fetch next allocation
-					allocations = get_next_allocation(log)
-
-					pr = get_pr_instance(doc)
-
-					# pass allocation to PR instance
-					for x in allocations:
-						pr.append("allocation", x)
-
-					skip_ref_details_update_for_pe = check_multi_currency(pr)
-					# reconcile
-					pr.reconcile_allocations(skip_ref_details_update_for_pe=skip_ref_details_update_for_pe)
-
-					# If Payment Entry, update details only for newly linked references
-					# This is for performance
-					if allocations[0].reference_type == "Payment Entry":
-						references = [(x.invoice_type, x.invoice_number) for x in allocations]
-						pe = frappe.get_doc(allocations[0].reference_type, allocations[0].reference_name)
-						pe.flags.ignore_validate_update_after_submit = True
-						pe.set_missing_ref_details(update_ref_details_only_for=references)
-						pe.save()
-
-					# Update reconciled flag
-					allocation_names = [x.name for x in allocations]
-					ppa = qb.DocType("Process Payment Reconciliation Log Allocations")
-					qb.update(ppa).set(ppa.reconciled, True).where(ppa.name.isin(allocation_names)).run()
-
-					# Update reconciled count
-					reconciled_count = frappe.db.count(
-						"Process Payment Reconciliation Log Allocations",
-						filters={"parent": log, "reconciled": True},
-					)
-					frappe.db.set_value(
-						"Process Payment Reconciliation Log", log, "reconciled_entries", reconciled_count
-					)
+					# keep reconciling the allocations of the next reference within the same job,
+					# instead of enqueuing a job per reference
+					while True:
+						allocations = get_next_allocation(log)
+						reconcile_allocations_of_reference(doc, allocations, account_currencies)
+
+						# Update reconciled count
+						reconciled_entries = frappe.db.count(
+							"Process Payment Reconciliation Log Allocations",
+							filters={"parent": log, "reconciled": True},
+						)
+						update_reconciled_count(log, reconciled_entries)
+
+						if not frappe.in_test:
+							frappe.db.commit()  # nosemgrep
+
+						if reconciled_entries == total_allocations:
+							break
+
+						if time.monotonic() - started_at > RECONCILE_JOB_TIME_LIMIT:
+							break
+
+						if frappe.db.get_value("Process Payment Reconciliation", doc, "status") == "Paused":
+							break
 
 				except Exception:
 					# Update the parent doc about the exception
@@ -505,11 +510,58 @@ def reconcile(doc: None | str = None) -> None:
 				frappe.db.set_value("Process Payment Reconciliation", doc, "status", "Completed")
 
 
-def check_multi_currency(pr_doc):
+def reconcile_allocations_of_reference(doc, allocations, account_currencies=None):
+	pr = get_pr_instance(doc)
+
+	# pass allocation to PR instance
+	for x in allocations:
+		pr.append("allocation", x)
+
+	skip_ref_details_update_for_pe = check_multi_currency(pr, account_currencies)
+	# reconcile
+	pr.reconcile_allocations(skip_ref_details_update_for_pe=skip_ref_details_update_for_pe)
+
+	# If Payment Entry, update details only for newly linked references
+	# This is for performance
+	if allocations[0].reference_type == "Payment Entry":
+		references = [(x.invoice_type, x.invoice_number) for x in allocations]
+		pe = frappe.get_doc(allocations[0].reference_type, allocations[0].reference_name)
+		pe.flags.ignore_validate_update_after_submit = True
+		pe.set_missing_ref_details(update_ref_details_only_for=references)
+		pe.save()
+
+	# Update reconciled flag
+	allocation_names = [x.name for x in allocations]
+	ppa = qb.DocType("Process Payment Reconciliation Log Allocations")
+	qb.update(ppa).set(ppa.reconciled, True).where(ppa.name.isin(allocation_names)).run()
+
+
+def update_reconciled_count(log, reconciled_entries):
+	"""Set the reconciled count of the log, with the allocations reconciled per minute since it was created"""
+	created_on = frappe.db.get_value("Process Payment Reconciliation Log", log, "creation")
+	minutes = time_diff_in_seconds(now_datetime(), created_on) / 60
+	frappe.db.set_value(
+		"Process Payment Reconciliation Log",
+		log,
+		{
+			"reconciled_entries": reconciled_entries,
+			"reconciled_per_minute": flt(reconciled_entries / minutes, 2) if minutes > 0 else 0,
+		},
+	)
+
+
+def check_multi_currency(pr_doc, account_currencies=None):
 	GL = frappe.qb.DocType("GL Entry")
 	Account = frappe.qb.DocType("Account")
 
+	# currencies of the vouchers are shared by the allocations of a reconcile job
+	if account_currencies is None:
+		account_currencies = {}
+
 	def get_account_currency(voucher_type, voucher_no):
+		if (voucher_type, voucher_no) in account_currencies:
+			return account_currencies[(voucher_type, voucher_no)]
+
 		currency = (
 			frappe.qb.from_(GL)
 			.join(Account)
@@ -523,7 +575,8 @@ def check_multi_currency(pr_doc):
 			.limit(1)
 		).run(as_dict=True)
 
-		return currency[0].account_currency if currency else None
+		account_currencies[(voucher_type, voucher_no)] = currency[0].account_currency if currency else None
+		return account_currencies[(voucher_type, voucher_no)]
 
 	for allocation in pr_doc.allocation:
 		reference_currency = get_account_currency(allocation.reference_type, allocation.reference_name)
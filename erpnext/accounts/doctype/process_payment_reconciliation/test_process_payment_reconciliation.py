@@ -1,9 +1,83 @@
 # Copyright (c) 2023, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
-# import frappe
+from unittest.mock import patch
+
+import frappe
+from frappe import qb
 from frappe.tests import IntegrationTestCase
+from frappe.utils import add_to_date
+
+from erpnext.accounts.doctype.process_payment_reconciliation.process_payment_reconciliation import (
+	reconcile,
+)
+
+MODULE = "erpnext.accounts.doctype.process_payment_reconciliation.process_payment_reconciliation"
 
 
 class TestProcessPaymentReconciliation(IntegrationTestCase):
-	pass
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def test_reconcile_several_references_in_one_job(self):
+		process_pr = frappe.get_doc(
+			{
+				"doctype": "Process Payment Reconciliation",
+				"company": "_Test Company",
+				"party_type": "Customer",
+				"party": "_Test Customer",
+				"receivable_payable_account": "Debtors - _TC",
+				"default_advance_account": "Debtors - _TC",
+			}
+		).insert()
+
+		log = frappe.get_doc(
+			{
+				"doctype": "Process Payment Reconciliation Log",
+				"process_pr": process_pr.name,
+				"status": "Running",
+				"allocated": 1,
+				"total_allocations": 3,
+				"reconciled_entries": 0,
+			}
+		)
+		for reference_name, invoice_number in (
+			("_T-JV-1", "_T-SI-1"),
+			("_T-JV-1", "_T-SI-2"),
+			("_T-JV-2", "_T-SI-3"),
+		):
+			log.append(
+				"allocations",
+				{
+					"reference_type": "Journal Entry",
+					"reference_name": reference_name,
+					"invoice_type": "Sales Invoice",
+					"invoice_number": invoice_number,
+					"allocated_amount": 100,
+				},
+			)
+		log.flags.ignore_links = True
+		log.insert()
+
+		def reconcile_allocations_of_reference(doc, allocations, account_currencies=None):
+			ppa = qb.DocType("Process Payment Reconciliation Log Allocations")
+			qb.update(ppa).set(ppa.reconciled, True).where(ppa.name.isin([x.name for x in allocations])).run()
+
+		with (
+			patch(
+				f"{MODULE}.reconcile_allocations_of_reference", side_effect=reconcile_allocations_of_reference
+			) as reconcile_reference,
+			patch(f"{MODULE}.now_datetime", return_value=add_to_date(log.creation, minutes=2)),
+			patch(f"{MODULE}.frappe.enqueue") as enqueue,
+		):
+			reconcile(process_pr.name)
+
+		# both references are reconciled by the same job, without enqueuing another one
+		self.assertEqual(reconcile_reference.call_count, 2)
+		enqueue.assert_not_called()
+
+		log.reload()
+		self.assertEqual(log.reconciled_entries, 3)
+		self.assertEqual(log.reconciled_per_minute, 1.5)
+		self.assertEqual(log.status, "Reconciled")
+		self.assertEqual(frappe.db.get_value(process_pr.doctype, process_pr.name, "status"), "Completed")
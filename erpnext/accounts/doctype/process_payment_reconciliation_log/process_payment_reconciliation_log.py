@@ -24,6 +24,7 @@ class ProcessPaymentReconciliationLog(Document):
 		process_pr: DF.Link
 		reconciled: DF.Check
 		reconciled_entries: DF.Int
+		reconciled_per_minute: DF.Float
 		status: DF.Literal["Running", "Paused", "Reconciled", "Partially Reconciled", "Failed", "Cancelled"]
 		total_allocations: DF.Int
 	# end: auto-generated types
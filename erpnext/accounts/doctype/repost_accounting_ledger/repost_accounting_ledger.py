@@ -153,6 +153,9 @@ class RepostAccountingLedger(Document):
 
 @frappe.whitelist()
 def start_repost(account_repost_doc=str) -> None:
+	from erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot import (
+		invalidate_gl_balance_snapshot_of_voucher,
+	)
 	from erpnext.accounts.general_ledger import make_reverse_gl_entries
 
 	frappe.flags.through_repost_accounting_ledger = True
@@ -167,6 +170,7 @@ def start_repost(account_repost_doc=str) -> None:
 				doc = frappe.get_doc(x.voucher_type, x.voucher_no)
 
 				if repost_doc.delete_cancelled_entries:
+					invalidate_gl_balance_snapshot_of_voucher(doc.doctype, doc.name)
 					frappe.db.delete(
 						"GL Entry", filters={"voucher_type": doc.doctype, "voucher_no": doc.name}
 					)
@@ -3,11 +3,12 @@
 
 
 import copy
+from datetime import timedelta
 
 import frappe
 from frappe import _
 from frappe.model.meta import get_field_precision
-from frappe.utils import cint, flt, formatdate, get_link_to_form, getdate, now
+from frappe.utils import cint, flt, formatdate, get_datetime, get_link_to_form, getdate, now
 from frappe.utils.caching import request_cache
 
 import erpnext
@@ -20,10 +21,21 @@ from erpnext.accounts.doctype.accounting_dimension_filter.accounting_dimension_f
 )
 from erpnext.accounts.doctype.accounting_period.accounting_period import ClosedAccountingPeriod
 from erpnext.accounts.doctype.budget.budget import validate_expense_against_budget
+from erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot import (
+	invalidate_gl_balance_snapshot,
+)
+from erpnext.accounts.doctype.gl_entry.gl_entry import (
+	update_outstanding_amt,
+	validate_balance_type,
+	validate_frozen_account,
+)
 from erpnext.accounts.utils import create_payment_ledger_entry, is_immutable_ledger_enabled
 from erpnext.controllers.budget_controller import BudgetValidation
 from erpnext.exceptions import InvalidAccountDimensionError, MandatoryAccountDimensionError
 
+# vouchers with at least these many GL entries are inserted in bulk
+BULK_GL_INSERT_THRESHOLD = 50
+
 
 def make_gl_entries(
 	gl_map,
@@ -54,6 +66,7 @@ def make_gl_entries(
 						adv_adj=adv_adj,
 						update_outstanding=update_outstanding,
 						from_repost=from_repost,
+						bulk_insert=len(gl_map) >= BULK_GL_INSERT_THRESHOLD,
 					)
 				save_entries(gl_map, adv_adj, update_outstanding, from_repost)
 			# Post GL Map process there may no be any GL Entries
@@ -275,6 +288,7 @@ def merge_similar_entries(gl_map, precision=None):
 	accounting_dimensions = get_accounting_dimensions()
 	merge_properties = get_merge_properties(accounting_dimensions)
 
+	entries_by_merge_key = {}
 	for entry in gl_map:
 		if entry._skip_merge:
 			merged_gl_map.append(entry)
@@ -283,7 +297,7 @@ def merge_similar_entries(gl_map, precision=None):
 		entry.merge_key = get_merge_key(entry, merge_properties)
 		# if there is already an entry in this account then just add it
 		# to that entry
-		same_head = check_if_in_list(entry, merged_gl_map)
+		same_head = entries_by_merge_key.get(entry.merge_key)
 		if same_head:
 			same_head.debit = flt(same_head.debit) + flt(entry.debit)
 			same_head.debit_in_account_currency = flt(same_head.debit_in_account_currency) + flt(
@@ -300,6 +314,7 @@ def merge_similar_entries(gl_map, precision=None):
 				entry.credit_in_transaction_currency
 			)
 		else:
+			entries_by_merge_key[entry.merge_key] = entry
 			merged_gl_map.append(entry)
 
 	company = gl_map[0].company if gl_map else erpnext.get_default_company()
@@ -312,12 +327,14 @@ def merge_similar_entries(gl_map, precision=None):
 
 	# filter zero debit and credit entries
 	merged_gl_map = filter(
-		lambda x: flt(x.debit, precision) != 0
-		or flt(x.credit, precision) != 0
-		or (
-			x.voucher_type == "Journal Entry"
-			and frappe.get_cached_value("Journal Entry", x.voucher_no, "voucher_type")
-			== "Exchange Gain Or Loss"
+		lambda x: (
+			flt(x.debit, precision) != 0
+			or flt(x.credit, precision) != 0
+			or (
+				x.voucher_type == "Journal Entry"
+				and frappe.get_cached_value("Journal Entry", x.voucher_no, "voucher_type")
+				== "Exchange Gain Or Loss"
+			)
 		),
 		merged_gl_map,
 	)
@@ -354,12 +371,6 @@ def get_merge_key(entry, merge_properties):
 	return tuple(merge_key)
 
 
-def check_if_in_list(gle, gl_map):
-	for e in gl_map:
-		if e.merge_key == gle.merge_key:
-			return e
-
-
 def toggle_debit_credit_if_negative(gl_map):
 	debit_credit_field_map = {
 		"debit": "credit",
@@ -418,6 +429,12 @@ def save_entries(gl_map, adv_adj, update_outstanding, from_repost=False):
 
 	for entry in gl_map:
 		validate_allowed_dimensions(entry, dimension_filter_map)
+
+	if len(gl_map) >= BULK_GL_INSERT_THRESHOLD:
+		make_entries_in_bulk(gl_map, adv_adj, update_outstanding, from_repost)
+		return
+
+	for entry in gl_map:
 		make_entry(entry, adv_adj, update_outstanding, from_repost)
 
 
@@ -439,6 +456,89 @@ def make_entry(args, adv_adj, update_outstanding, from_repost=False):
 		validate_expense_against_budget(args)
 
 
+def make_entries_in_bulk(gl_map, adv_adj, update_outstanding, from_repost=False):
+	"""Insert GL Entries of a voucher with one multi-row insert.
+
+	Row level validations run for every entry, while validations of the accounts, updates of
+	outstanding of the against vouchers and budget checks run once per account / voucher / budget head."""
+
+	gl_entries = make_gle_docs_for_bulk_insert(gl_map, adv_adj, update_outstanding, from_repost)
+
+	fields = frappe.get_meta("GL Entry").get_valid_columns()
+	values = []
+	for gle in gl_entries:
+		row = gle.get_valid_dict(convert_dates_to_str=True)
+		values.append(tuple(row.get(field) for field in fields))
+
+	frappe.db.bulk_insert("GL Entry", fields=fields, values=values)
+
+	company, voucher_type = gl_entries[0].company, gl_entries[0].voucher_type
+	invalidate_gl_balance_snapshot(company, min(getdate(gle.posting_date) for gle in gl_entries))
+
+	outstanding_to_update = set()
+	if not from_repost and voucher_type != "Period Closing Voucher":
+		for gle in gl_entries:
+			gle.validate_account_details(adv_adj)
+			gle.validate_dimensions_for_pl_and_bs()
+
+			if gle.should_update_outstanding():
+				outstanding_to_update.add(
+					(gle.account, gle.party_type, gle.party, gle.against_voucher_type, gle.against_voucher)
+				)
+
+		for account in {gle.account for gle in gl_entries}:
+			validate_balance_type(account, adv_adj)
+			validate_frozen_account(company, account, adv_adj)
+
+	for gle in gl_entries:
+		gle.run_method("on_submit")
+
+	for args in outstanding_to_update:
+		update_outstanding_amt(*args)
+
+	if not from_repost and voucher_type != "Period Closing Voucher":
+		validate_expense_against_budget_in_bulk(gl_entries, gl_map)
+
+
+def make_gle_docs_for_bulk_insert(gl_map, adv_adj, update_outstanding, from_repost=False):
+	# distinct creation for every entry to keep the order same as the voucher rows
+	creation = get_datetime(now())
+
+	gl_entries = []
+	for idx, args in enumerate(gl_map):
+		gle = frappe.new_doc("GL Entry")
+		gle.update(args)
+		gle.flags.ignore_permissions = 1
+		gle.flags.from_repost = from_repost
+		gle.flags.adv_adj = adv_adj
+		gle.flags.update_outstanding = update_outstanding or "Yes"
+		gle.docstatus = 1
+		gle.set_new_name()
+		gle.creation = gle.modified = creation + timedelta(microseconds=idx)
+		gle.owner = gle.modified_by = frappe.session.user
+
+		gle.run_method("validate")
+		gle.run_method("before_submit")
+		gl_entries.append(gle)
+
+	return gl_entries
+
+
+def validate_expense_against_budget_in_bulk(gl_entries, gl_map):
+	"""Budget is validated once per account and budget dimensions, with the expense of all
+	the entries of the voucher already posted"""
+	budget_dimensions = ["cost_center", "project", *get_accounting_dimensions()]
+
+	entries_by_budget_head = {}
+	for gle, args in zip(gl_entries, gl_map, strict=True):
+		if gle.is_cancelled == 0 or gle.voucher_type == "Journal Entry":
+			budget_head = (gle.account, *(gle.get(dimension) for dimension in budget_dimensions))
+			entries_by_budget_head[budget_head] = args
+
+	for args in entries_by_budget_head.values():
+		validate_expense_against_budget(args)
+
+
 def validate_cwip_accounts(gl_map):
 	"""Validate that CWIP account are not used in Journal Entry"""
 	if gl_map and gl_map[0].voucher_type != "Journal Entry":
@@ -10,11 +10,16 @@ from frappe.database.schema import get_definition
 from frappe.query_builder import Criterion
 from frappe.query_builder.functions import Date, Substring, Sum
 from frappe.utils import cint, cstr, flt, getdate, nowdate
+from pypika.terms import ExistsCriterion
 
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimension_with_children,
 )
+from erpnext.accounts.doctype.payment_ledger_outstanding.payment_ledger_outstanding import (
+	get_settled_voucher_query,
+	is_payment_ledger_outstanding_built,
+)
 from erpnext.accounts.report.financial_statements import get_cost_centers_with_children
 from erpnext.accounts.utils import (
 	build_qb_match_conditions,
@@ -954,6 +959,11 @@ class ReceivablePayableReport:
 		if match_conditions := build_qb_match_conditions("Payment Ledger Entry"):
 			query = query.where(Criterion.all(match_conditions))
 
+		elif self.can_skip_settled_vouchers():
+			query = query.where(
+				ExistsCriterion(get_settled_voucher_query(ple, self.filters.report_date)).negate()
+			)
+
 		if self.filters.get("group_by_party"):
 			query = query.orderby(self.ple.party, self.ple.posting_date)
 		else:
@@ -961,6 +971,17 @@ class ReceivablePayableReport:
 
 		self.ple_query = query
 
+	def can_skip_settled_vouchers(self):
+		# settled vouchers are only known for all the entries of an account and party,
+		# rows merged across accounts or filtered per entry need all of them
+		if self.filters.get("ignore_accounts") or self.filters.cost_center or self.filters.finance_book:
+			return False
+
+		if any(self.filters.get(dimension) for dimension in get_accounting_dimensions()):
+			return False
+
+		return is_payment_ledger_outstanding_built(self.filters.company)
+
 	def get_sales_invoices_or_customers_based_on_sales_person(self):
 		if self.filters.get("sales_person"):
 			lft, rgt = frappe.db.get_value("Sales Person", self.filters.get("sales_person"), ["lft", "rgt"])
@@ -17,6 +17,7 @@ from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimension_with_children,
 )
+from erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot import get_gl_balance_snapshot_date
 from erpnext.accounts.report.utils import convert_to_presentation_currency, get_currency
 from erpnext.accounts.utils import get_fiscal_year, get_zero_cutoff
 
@@ -479,6 +480,24 @@ def set_gl_entries_by_account(
 			from_date = add_days(last_period_closing_voucher[0].period_end_date, 1)
 			ignore_opening_entries = True
 
+	# daily balances of the snapshot till its date, GL Entry only for the later postings
+	snapshot_date = get_gl_balance_snapshot_date(filters.company, to_date)
+	if snapshot_date and (not from_date or getdate(from_date) <= snapshot_date):
+		gl_entries += get_accounting_entries(
+			"GL Balance Snapshot",
+			from_date,
+			snapshot_date,
+			filters,
+			root_lft,
+			root_rgt,
+			root_type,
+			ignore_closing_entries,
+			ignore_opening_entries=ignore_opening_entries,
+			group_by_account=group_by_account,
+			ignore_reporting_currency=ignore_reporting_currency,
+		)
+		from_date = add_days(snapshot_date, 1)
+
 	gl_entries += get_accounting_entries(
 		"GL Entry",
 		from_date,
@@ -546,11 +565,13 @@ def get_accounting_entries(
 
 	ignore_is_opening = frappe.get_single_value("Accounts Settings", "ignore_is_opening_check_for_reporting")
 
-	if doctype == "GL Entry":
+	if doctype in ("GL Entry", "GL Balance Snapshot"):
 		query = query.select(gl_entry.posting_date, gl_entry.is_opening, gl_entry.fiscal_year)
-		query = query.where(gl_entry.is_cancelled == 0)
 		query = query.where(gl_entry.posting_date <= to_date)
-		query = query.force_index("posting_date_company_index")
+
+		if doctype == "GL Entry":
+			query = query.where(gl_entry.is_cancelled == 0)
+			query = query.force_index("posting_date_company_index")
 
 		if ignore_opening_entries and not ignore_is_opening:
 			query = query.where(gl_entry.is_opening == "No")
@@ -602,7 +623,7 @@ def apply_additional_conditions(doctype, query, from_date, ignore_closing_entrie
 		else:
 			query = query.where(gl_entry.is_period_closing_voucher_entry == 0)
 
-	if from_date and doctype == "GL Entry":
+	if from_date and doctype != "Account Closing Balance":
 		query = query.where(gl_entry.posting_date >= from_date)
 
 	if filters:
@@ -1,11 +1,14 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: GNU General Public License v3. See license.txt
 
+import csv
+import os
+from itertools import chain
 
 import frappe
 from frappe import _, _dict
 from frappe.query_builder import Criterion
-from frappe.utils import cstr, getdate
+from frappe.utils import cstr, get_files_path, getdate
 
 from erpnext import get_company_currency, get_default_company
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
@@ -25,11 +28,24 @@ DEBIT_CREDIT_DICT = {
 	"credit_in_transaction_currency": None,
 }
 
+# number of GL Entries read per query while streaming the report
+GL_STREAM_BATCH_SIZE = 10000
+
 
 def execute(filters=None):
 	if not filters:
 		return [], []
 
+	filters, account_details = prepare_filters(filters)
+
+	columns = get_columns(filters)
+
+	res = get_result(filters, account_details)
+
+	return columns, res
+
+
+def prepare_filters(filters):
 	account_details = {}
 
 	if filters and filters.get("print_in_account_currency") and not filters.get("account"):
@@ -47,11 +63,7 @@ def execute(filters=None):
 
 	filters = set_account_currency(filters)
 
-	columns = get_columns(filters)
-
-	res = get_result(filters, account_details)
-
-	return columns, res
+	return filters, account_details
 
 
 def validate_filters(filters, account_details):
@@ -159,14 +171,6 @@ def get_result(filters, account_details):
 
 def get_gl_entries(filters, accounting_dimensions):
 	currency_map = get_currency(filters)
-	select_fields = """, debit, credit, debit_in_account_currency,
-		credit_in_account_currency """
-
-	if filters.get("show_remarks"):
-		if remarks_length := frappe.get_single_value("Accounts Settings", "general_ledger_remarks_length"):
-			select_fields += f",substr(remarks, 1, {remarks_length}) as 'remarks'"
-		else:
-			select_fields += """,remarks"""
 
 	order_by_statement = "order by posting_date, account, creation"
 
@@ -178,29 +182,11 @@ def get_gl_entries(filters, accounting_dimensions):
 	if filters.get("categorize_by") == "Categorize by Account":
 		order_by_statement = "order by account, posting_date, creation"
 
-	if filters.get("include_default_book_entries"):
-		filters["company_fb"] = frappe.get_cached_value(
-			"Company", filters.get("company"), "default_finance_book"
-		)
-
-	dimension_fields = ""
-	if accounting_dimensions:
-		dimension_fields = ", ".join(accounting_dimensions) + ","
-
-	transaction_currency_fields = ""
-	if filters.get("add_values_in_transaction_currency"):
-		transaction_currency_fields = (
-			"debit_in_transaction_currency, credit_in_transaction_currency, transaction_currency,"
-		)
+	set_default_finance_book(filters)
 
 	gl_entries = frappe.db.sql(
 		f"""
-		select
-			name as gl_entry, posting_date, account, party_type, party,
-			voucher_type, voucher_subtype, voucher_no, {dimension_fields}
-			cost_center, project, {transaction_currency_fields}
-			against_voucher_type, against_voucher, account_currency,
-			against, is_opening, creation {select_fields}
+		select {get_gl_entry_fields(filters, accounting_dimensions)}
 		from `tabGL Entry`
 		where company=%(company)s {get_conditions(filters)}
 		{order_by_statement}
@@ -221,6 +207,41 @@ def get_gl_entries(filters, accounting_dimensions):
 		return gl_entries
 
 
+def set_default_finance_book(filters):
+	if filters.get("include_default_book_entries"):
+		filters["company_fb"] = frappe.get_cached_value(
+			"Company", filters.get("company"), "default_finance_book"
+		)
+
+
+def get_gl_entry_fields(filters, accounting_dimensions):
+	select_fields = """, debit, credit, debit_in_account_currency,
+		credit_in_account_currency """
+
+	if filters.get("show_remarks"):
+		if remarks_length := frappe.get_single_value("Accounts Settings", "general_ledger_remarks_length"):
+			select_fields += f",substr(remarks, 1, {remarks_length}) as 'remarks'"
+		else:
+			select_fields += """,remarks"""
+
+	dimension_fields = ""
+	if accounting_dimensions:
+		dimension_fields = ", ".join(accounting_dimensions) + ","
+
+	transaction_currency_fields = ""
+	if filters.get("add_values_in_transaction_currency"):
+		transaction_currency_fields = (
+			"debit_in_transaction_currency, credit_in_transaction_currency, transaction_currency,"
+		)
+
+	return f"""
+			name as gl_entry, posting_date, account, party_type, party,
+			voucher_type, voucher_subtype, voucher_no, {dimension_fields}
+			cost_center, project, {transaction_currency_fields}
+			against_voucher_type, against_voucher, account_currency,
+			against, is_opening, creation {select_fields}"""
+
+
 def get_conditions(filters):
 	conditions = []
 
@@ -495,49 +516,14 @@ def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map):
 	group_by = get_group_by_field(filters.get("categorize_by"))
 	group_by_voucher_consolidated = filters.get("categorize_by") == "Categorize by Voucher (Consolidated)"
 
+	account_type_map = None
 	if filters.get("show_net_values_in_party_account"):
 		account_type_map = get_account_type_map(filters.get("company"))
 
-	immutable_ledger = frappe.get_single_value("Accounts Settings", "enable_immutable_ledger")
-
 	def update_value_in_dict(data, key, gle, show_net_values=False):
-		data[key].debit += gle.debit
-		data[key].credit += gle.credit
-
-		data[key].debit_in_account_currency += gle.debit_in_account_currency
-		data[key].credit_in_account_currency += gle.credit_in_account_currency
-
-		if filters.get("add_values_in_transaction_currency") and key not in ["opening", "closing", "total"]:
-			data[key].debit_in_transaction_currency += gle.debit_in_transaction_currency
-			data[key].credit_in_transaction_currency += gle.credit_in_transaction_currency
-
-		if (
-			filters.get("show_net_values_in_party_account")
-			and account_type_map.get(data[key].account)
-			in (
-				"Receivable",
-				"Payable",
-			)
-		) or show_net_values:
-			net_value = data[key].debit - data[key].credit
-			net_value_in_account_currency = (
-				data[key].debit_in_account_currency - data[key].credit_in_account_currency
-			)
+		update_totals(filters, data, key, gle, show_net_values, account_type_map)
 
-			if net_value < 0:
-				dr_or_cr = "credit"
-				rev_dr_or_cr = "debit"
-			else:
-				dr_or_cr = "debit"
-				rev_dr_or_cr = "credit"
-
-			data[key][dr_or_cr] = abs(net_value)
-			data[key][dr_or_cr + "_in_account_currency"] = abs(net_value_in_account_currency)
-			data[key][rev_dr_or_cr] = 0
-			data[key][rev_dr_or_cr + "_in_account_currency"] = 0
-
-		if data[key].against_voucher and gle.against_voucher:
-			data[key].against_voucher += ", " + gle.against_voucher
+	immutable_ledger = frappe.get_single_value("Accounts Settings", "enable_immutable_ledger")
 
 	from_date, to_date = getdate(filters.from_date), getdate(filters.to_date)
 	show_opening_entries = filters.get("show_opening_entries")
@@ -545,10 +531,7 @@ def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map):
 	totals = get_totals_dict()
 	for gle in gl_entries:
 		group_by_value = gle.get(group_by)
-		gle.voucher_subtype = _(gle.voucher_subtype)
-		gle.against_voucher_type = _(gle.against_voucher_type)
-		gle.remarks = _(gle.remarks)
-		gle.party_type = _(gle.party_type)
+		set_translated_values(gle)
 
 		if gle.posting_date < from_date or (cstr(gle.is_opening) == "Yes" and not show_opening_entries):
 			if not group_by_voucher_consolidated:
@@ -568,36 +551,13 @@ def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map):
 				gle_map[group_by_value].entries.append(gle)
 
 			elif group_by_voucher_consolidated:
-				keylist = [
-					gle.get("posting_date"),
-					gle.get("voucher_type"),
-					gle.get("voucher_no"),
-					gle.get("account"),
-					gle.get("party_type"),
-					gle.get("party"),
-				]
-
-				if immutable_ledger:
-					keylist.append(gle.get("creation"))
-
-				if filters.get("include_dimensions"):
-					for dim in accounting_dimensions:
-						keylist.append(gle.get(dim))
-					keylist.append(gle.get("cost_center"))
-					keylist.append(gle.get("project"))
-
-				key = tuple(keylist)
+				key = get_consolidated_key(filters, accounting_dimensions, gle, immutable_ledger)
 				if key not in consolidated_gle:
 					consolidated_gle.setdefault(key, gle)
 				else:
 					update_value_in_dict(consolidated_gle, key, gle)
 
-		if filters.get("include_dimensions"):
-			dimensions = [*accounting_dimensions, "cost_center", "project"]
-
-			for dimension in dimensions:
-				if val := gle.get(dimension):
-					gle[dimension] = _(val)
+		set_translated_dimensions(filters, accounting_dimensions, gle)
 
 	for value in consolidated_gle.values():
 		update_value_in_dict(totals, "total", value)
@@ -607,6 +567,84 @@ def get_accountwise_gle(filters, accounting_dimensions, gl_entries, gle_map):
 	return totals, entries
 
 
+def set_translated_values(gle):
+	gle.voucher_subtype = _(gle.voucher_subtype)
+	gle.against_voucher_type = _(gle.against_voucher_type)
+	gle.remarks = _(gle.remarks)
+	gle.party_type = _(gle.party_type)
+
+
+def set_translated_dimensions(filters, accounting_dimensions, gle):
+	if filters.get("include_dimensions"):
+		dimensions = [*accounting_dimensions, "cost_center", "project"]
+
+		for dimension in dimensions:
+			if val := gle.get(dimension):
+				gle[dimension] = _(val)
+
+
+def get_consolidated_key(filters, accounting_dimensions, gle, immutable_ledger):
+	keylist = [
+		gle.get("posting_date"),
+		gle.get("voucher_type"),
+		gle.get("voucher_no"),
+		gle.get("account"),
+		gle.get("party_type"),
+		gle.get("party"),
+	]
+
+	if immutable_ledger:
+		keylist.append(gle.get("creation"))
+
+	if filters.get("include_dimensions"):
+		for dim in accounting_dimensions:
+			keylist.append(gle.get(dim))
+		keylist.append(gle.get("cost_center"))
+		keylist.append(gle.get("project"))
+
+	return tuple(keylist)
+
+
+def update_totals(filters, data, key, gle, show_net_values=False, account_type_map=None):
+	data[key].debit += gle.debit
+	data[key].credit += gle.credit
+
+	data[key].debit_in_account_currency += gle.debit_in_account_currency
+	data[key].credit_in_account_currency += gle.credit_in_account_currency
+
+	if filters.get("add_values_in_transaction_currency") and key not in ["opening", "closing", "total"]:
+		data[key].debit_in_transaction_currency += gle.debit_in_transaction_currency
+		data[key].credit_in_transaction_currency += gle.credit_in_transaction_currency
+
+	if (
+		filters.get("show_net_values_in_party_account")
+		and account_type_map.get(data[key].account)
+		in (
+			"Receivable",
+			"Payable",
+		)
+	) or show_net_values:
+		net_value = data[key].debit - data[key].credit
+		net_value_in_account_currency = (
+			data[key].debit_in_account_currency - data[key].credit_in_account_currency
+		)
+
+		if net_value < 0:
+			dr_or_cr = "credit"
+			rev_dr_or_cr = "debit"
+		else:
+			dr_or_cr = "debit"
+			rev_dr_or_cr = "credit"
+
+		data[key][dr_or_cr] = abs(net_value)
+		data[key][dr_or_cr + "_in_account_currency"] = abs(net_value_in_account_currency)
+		data[key][rev_dr_or_cr] = 0
+		data[key][rev_dr_or_cr + "_in_account_currency"] = 0
+
+	if data[key].against_voucher and gle.against_voucher:
+		data[key].against_voucher += ", " + gle.against_voucher
+
+
 def get_account_type_map(company):
 	account_type_map = frappe._dict(
 		frappe.get_all("Account", fields=["name", "account_type"], filters={"company": company}, as_list=1)
@@ -633,6 +671,381 @@ def get_result_as_list(data, filters):
 	return data
 
 
+def get_streamed_report(filters):
+	"""Returns the columns and an iterator over the rows of the report, for exports too large
+	to be built in memory"""
+	filters, _account_details = prepare_filters(filters)
+	columns = get_columns(filters)
+
+	return columns, get_streamed_result(filters)
+
+
+def get_streamed_result(filters):
+	"""Yields the rows of `get_result` with running balances without holding the GL Entries in memory.
+
+	GL Entries are read in batches with keyset pagination, the opening entries first and then the
+	entries of the period. A group is written as soon as its entries are read, so groups follow the
+	field they are categorized by instead of the order of their first entry."""
+	balance = 0
+
+	for d in get_streamed_data_with_opening_closing(filters):
+		if not d.get("posting_date"):
+			balance = 0
+
+		balance = get_balance(d, balance, "debit", "credit")
+
+		d["balance"] = balance
+
+		d["account_currency"] = filters.account_currency
+
+		d["presentation_currency"] = filters.presentation_currency
+
+		yield d
+
+
+def get_streamed_data_with_opening_closing(filters):
+	def get_total_row(totals, key):
+		row = totals[key]
+		row["account"] = labels[key]
+		return row
+
+	def get_blank_row():
+		return {"debit_in_transaction_currency": None, "credit_in_transaction_currency": None}
+
+	def update_value_in_dict(data, key, gle, show_net_values=False):
+		update_totals(filters, data, key, gle, show_net_values, account_type_map)
+
+	labels = get_translated_labels_for_totals()
+
+	accounting_dimensions = []
+	if filters.get("include_dimensions"):
+		accounting_dimensions = get_accounting_dimensions()
+
+	account_type_map = None
+	if filters.get("show_net_values_in_party_account"):
+		account_type_map = get_account_type_map(filters.get("company"))
+
+	set_default_finance_book(filters)
+	conditions = get_conditions(filters)
+	account_currencies = frappe.db.sql(
+		f"""select distinct account_currency from `tabGL Entry`
+		where company=%(company)s {conditions}""",
+		filters,
+		pluck=True,
+	)
+
+	categorize_by = filters.get("categorize_by")
+	group_by = get_group_by_field(categorize_by)
+	group_by_voucher_consolidated = categorize_by == "Categorize by Voucher (Consolidated)"
+
+	def get_entries(opening):
+		return get_gl_entries_in_batches(
+			filters, accounting_dimensions, conditions, account_currencies, opening=opening
+		)
+
+	# opening balances of the report and of every group
+	totals = get_totals_dict()
+	group_totals = {}
+	for gle in get_entries(opening=True):
+		set_translated_values(gle)
+		if not group_by_voucher_consolidated:
+			group = group_totals.setdefault(gle.get(group_by), get_totals_dict())
+			update_value_in_dict(group, "opening", gle, True)
+			update_value_in_dict(group, "closing", gle, True)
+
+		update_value_in_dict(totals, "opening", gle, True)
+		update_value_in_dict(totals, "closing", gle, True)
+
+	yield get_total_row(totals, "opening")
+
+	if group_by_voucher_consolidated:
+		immutable_ledger = frappe.get_single_value("Accounts Settings", "enable_immutable_ledger")
+		consolidated_gle = {}
+		posting_date = None
+
+		# entries of a consolidated row share the posting date, rows of a date are complete with the next date
+		for gle in chain(get_entries(opening=False), [None]):
+			if gle is None or gle.posting_date != posting_date:
+				for value in consolidated_gle.values():
+					update_value_in_dict(totals, "total", value)
+					update_value_in_dict(totals, "closing", value)
+					yield value
+
+				if gle is None:
+					break
+
+				consolidated_gle = {}
+				posting_date = gle.posting_date
+
+			set_translated_values(gle)
+			key = get_consolidated_key(filters, accounting_dimensions, gle, immutable_ledger)
+			if key not in consolidated_gle:
+				consolidated_gle.setdefault(key, gle)
+			else:
+				update_value_in_dict(consolidated_gle, key, gle)
+
+			set_translated_dimensions(filters, accounting_dimensions, gle)
+	else:
+		set_opening_closing = (not categorize_by and not filters.get("voucher_no")) or (
+			categorize_by and categorize_by != "Categorize by Voucher"
+		)
+		set_total = categorize_by or not filters.voucher_no
+
+		def get_group_closing_rows(group):
+			if set_total:
+				yield get_total_row(group, "total")
+
+			if set_opening_closing:
+				yield get_total_row(group, "closing")
+
+		group, group_by_value = None, None
+		for gle in get_entries(opening=False):
+			set_translated_values(gle)
+
+			if group is None or gle.get(group_by) != group_by_value:
+				if group:
+					yield from get_group_closing_rows(group)
+
+				group_by_value = gle.get(group_by)
+				group = group_totals.pop(group_by_value, None) or get_totals_dict()
+
+				yield get_blank_row()
+				if set_opening_closing:
+					yield get_total_row(group, "opening")
+
+			update_value_in_dict(group, "total", gle)
+			update_value_in_dict(group, "closing", gle)
+			update_value_in_dict(totals, "total", gle)
+			update_value_in_dict(totals, "closing", gle)
+
+			set_translated_dimensions(filters, accounting_dimensions, gle)
+			yield gle
+
+		if group:
+			yield from get_group_closing_rows(group)
+
+		yield get_blank_row()
+
+	yield get_total_row(totals, "total")
+	yield get_total_row(totals, "closing")
+
+
+def get_streamed_order_by(filters):
+	"""Fields the GL Entries are read in, every group of the report must be contiguous"""
+	categorize_by = filters.get("categorize_by")
+
+	if categorize_by == "Categorize by Voucher (Consolidated)":
+		if filters.get("include_dimensions"):
+			return ["posting_date", "creation"]
+
+		return ["posting_date", "account", "creation"]
+
+	if categorize_by == "Categorize by Account":
+		return ["account", "posting_date", "creation"]
+
+	if categorize_by == "Categorize by Party":
+		return ["party", "posting_date", "creation"]
+
+	return ["posting_date", "voucher_type", "voucher_no", "creation"]
+
+
+def get_gl_entries_in_batches(filters, accounting_dimensions, conditions, account_currencies, opening=False):
+	"""Yields the opening entries or the entries of the period in the order of `get_streamed_order_by`,
+	reading one slice of about `GL_STREAM_BATCH_SIZE` entries per query"""
+	currency_map = get_currency(filters)
+	party_name_map = get_party_name_map()
+	supplier_invoice_details = get_supplier_invoice_details()
+
+	# name breaks the ties, party can be null
+	order_by = [*get_streamed_order_by(filters), "name"]
+	sort_fields = [f"coalesce({field}, '')" if field == "party" else field for field in order_by]
+
+	opening_condition = "posting_date < %(from_date)s"
+	if not filters.get("show_opening_entries"):
+		opening_condition += " or coalesce(is_opening, 'No') = 'Yes'"
+	opening_condition = f"({opening_condition})" if opening else f"not ({opening_condition})"
+	conditions = f"{conditions} and {opening_condition}"
+
+	values = dict(filters)
+	for slice_condition, slice_values in get_gl_entry_slices(order_by[0], conditions, values):
+		gl_entries = frappe.db.sql(
+			f"""
+			select {get_gl_entry_fields(filters, accounting_dimensions)}
+			from `tabGL Entry`
+			where company=%(company)s {conditions}
+			and {slice_condition}
+			order by {", ".join(sort_fields)}
+		""",
+			{**values, **slice_values},
+			as_dict=1,
+		)
+
+		for gl_entry in gl_entries:
+			gl_entry["bill_no"] = supplier_invoice_details.get(gl_entry.get("against_voucher"), "")
+			if gl_entry.party_type and gl_entry.party:
+				gl_entry.party_name = party_name_map.get(gl_entry.party_type, {}).get(gl_entry.party)
+
+		if filters.get("presentation_currency"):
+			gl_entries = convert_to_presentation_currency(
+				gl_entries, currency_map, filters, account_currencies=account_currencies
+			)
+
+		yield from gl_entries
+
+
+def get_gl_entry_slices(sort_field, conditions, values):
+	"""Conditions on the indexed leading sort field, and on posting date if that is not the leading field,
+	splitting the entries into contiguous slices of about `GL_STREAM_BATCH_SIZE` entries.
+
+	Each slice is read with a range on the index and sorted on its own, instead of sorting the
+	rest of the entries again for every batch. Entries of a single key are never split."""
+	key_fields = ["posting_date"] if sort_field == "posting_date" else [sort_field, "posting_date"]
+	keys = ", ".join(f"coalesce({field}, '')" if field == "party" else field for field in key_fields)
+	entries_per_key = frappe.db.sql(
+		f"""
+		select {keys}, count(*)
+		from `tabGL Entry`
+		where company=%(company)s {conditions}
+		group by {keys}
+		order by {keys}
+	""",
+		values,
+	)
+
+	slices = []
+	first_key, entries = None, 0
+	for *key, count in entries_per_key:
+		first_key = first_key or key
+		entries += count
+		if entries >= GL_STREAM_BATCH_SIZE:
+			slices.append((first_key, key))
+			first_key, entries = None, 0
+
+	if first_key:
+		slices.append((first_key, key))
+
+	for first_key, last_key in slices:
+		slice_values = {"slice_from": first_key[-1], "slice_to": last_key[-1]}
+		if len(key_fields) == 1:
+			yield "posting_date between %(slice_from)s and %(slice_to)s", slice_values
+			continue
+
+		slice_values.update({"first_value": first_key[0], "last_value": last_key[0]})
+		first_value_condition = get_sort_field_condition(sort_field, "first_value", first_key[0])
+		if first_key[0] == last_key[0]:
+			yield (
+				f"({first_value_condition} and posting_date between %(slice_from)s and %(slice_to)s)",
+				slice_values,
+			)
+			continue
+
+		last_value_condition = get_sort_field_condition(sort_field, "last_value", last_key[0])
+		yield (
+			f"""(({first_value_condition} and posting_date >= %(slice_from)s)
+			or ({sort_field} > %(first_value)s and {sort_field} < %(last_value)s)
+			or ({last_value_condition} and posting_date <= %(slice_to)s))""",
+			slice_values,
+		)
+
+
+def get_sort_field_condition(sort_field, key, value):
+	# entries without a party are sorted as an empty party
+	if sort_field == "party" and not value:
+		return "(party is null or party = '')"
+
+	return f"{sort_field} = %({key})s"
+
+
+@frappe.whitelist()
+def export_general_ledger(filters, file_format="CSV"):
+	"""Export the report to a file in the background, for ledgers too large to be exported from the browser"""
+	if not frappe.get_cached_doc("Report", "General Ledger").is_permitted():
+		frappe.throw(
+			_("You don't have access to Report: {0}").format(_("General Ledger")), frappe.PermissionError
+		)
+
+	filters = frappe._dict(frappe.parse_json(filters))
+	prepare_filters(frappe._dict(filters))
+
+	frappe.enqueue(
+		make_general_ledger_export,
+		filters=filters,
+		file_format=file_format,
+		queue="long",
+		timeout=7200,
+		now=frappe.in_test,
+	)
+
+	frappe.msgprint(
+		_("General Ledger is being exported in the background, you will be notified once the file is ready.")
+	)
+
+
+def make_general_ledger_export(filters, file_format="CSV"):
+	from frappe.desk.doctype.notification_log.notification_log import make_notification_logs
+
+	columns, rows = get_streamed_report(frappe._dict(filters))
+	columns = [column for column in columns if not column.get("hidden")]
+
+	extension = "xlsx" if file_format == "Excel" else "csv"
+	file_name = f"general_ledger_{frappe.generate_hash(length=10)}.{extension}"
+	file_path = get_files_path(file_name, is_private=1)
+
+	try:
+		if extension == "xlsx":
+			write_xlsx_export(file_path, columns, rows)
+		else:
+			write_csv_export(file_path, columns, rows)
+	except Exception:
+		if os.path.exists(file_path):
+			os.remove(file_path)
+		raise
+
+	file = frappe.get_doc(
+		{
+			"doctype": "File",
+			"file_name": file_name,
+			"file_url": f"/private/files/{file_name}",
+			"is_private": 1,
+		}
+	)
+	file.insert(ignore_permissions=True)
+
+	make_notification_logs(
+		frappe._dict(
+			{
+				"type": "Alert",
+				"document_type": "File",
+				"document_name": file.name,
+				"subject": _("General Ledger export {0} is ready").format(file_name),
+			}
+		),
+		[frappe.session.user],
+	)
+
+
+def write_csv_export(file_path, columns, rows):
+	with open(file_path, "w", newline="", encoding="utf-8") as file:
+		writer = csv.writer(file)
+		writer.writerow([column["label"] for column in columns])
+
+		for row in rows:
+			writer.writerow([row.get(column["fieldname"]) for column in columns])
+
+
+def write_xlsx_export(file_path, columns, rows):
+	import openpyxl
+
+	wb = openpyxl.Workbook(write_only=True)
+	ws = wb.create_sheet("General Ledger")
+	ws.append([column["label"] for column in columns])
+
+	for row in rows:
+		ws.append([row.get(column["fieldname"]) for column in columns])
+
+	wb.save(file_path)
+
+
 def get_supplier_invoice_details():
 	inv_details = {}
 	for d in frappe.db.sql(
@@ -1,13 +1,15 @@
 # Copyright (c) 2022, Frappe Technologies Pvt. Ltd. and Contributors
 # MIT License. See license.txt
 
+from unittest.mock import patch
+
 import frappe
 from frappe import qb
 from frappe.tests import IntegrationTestCase
-from frappe.utils import flt, today
+from frappe.utils import add_days, flt, today
 
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
-from erpnext.accounts.report.general_ledger.general_ledger import execute
+from erpnext.accounts.report.general_ledger.general_ledger import execute, get_streamed_report
 from erpnext.controllers.sales_and_purchase_return import make_return_doc
 
 
@@ -332,3 +334,38 @@ class TestGeneralLedger(IntegrationTestCase):
 		)
 		actual = set([x.voucher_no for x in data if x.voucher_no])
 		self.assertEqual(expected, actual)
+
+	def test_streamed_result(self):
+		from erpnext.accounts.report.general_ledger import general_ledger
+
+		create_sales_invoice(posting_date=add_days(today(), -10))
+		for _ in range(3):
+			create_sales_invoice()
+
+		def get_rows(data):
+			return [
+				(
+					row.get("account"),
+					row.get("voucher_no"),
+					row.get("debit"),
+					row.get("credit"),
+					row.get("balance"),
+				)
+				for row in data
+			]
+
+		for categorize_by in ("Categorize by Voucher (Consolidated)", "Categorize by Account"):
+			filters = {
+				"company": self.company,
+				"from_date": today(),
+				"to_date": today(),
+				"categorize_by": categorize_by,
+			}
+
+			columns, data = execute(frappe._dict(filters))
+			with patch.object(general_ledger, "GL_STREAM_BATCH_SIZE", 2):
+				streamed_columns, rows = get_streamed_report(frappe._dict(filters))
+				streamed_data = list(rows)
+
+			self.assertEqual(streamed_columns, columns)
+			self.assertEqual(get_rows(streamed_data), get_rows(data))
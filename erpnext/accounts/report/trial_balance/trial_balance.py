@@ -12,6 +12,7 @@ from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimension_with_children,
 )
+from erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot import get_gl_balance_snapshot_date
 from erpnext.accounts.report.financial_statements import (
 	filter_accounts,
 	filter_out_zero_value_rows,
@@ -177,8 +178,7 @@ def get_rootwise_opening_balances(
 		# Report getting generate from the mid of a fiscal year
 		if getdate(last_period_closing_voucher[0].period_end_date) < getdate(add_days(filters.from_date, -1)):
 			start_date = add_days(last_period_closing_voucher[0].period_end_date, 1)
-			gle += get_opening_balance(
-				"GL Entry",
+			gle += get_opening_balance_from_ledger(
 				filters,
 				report_type,
 				accounting_dimensions,
@@ -187,8 +187,7 @@ def get_rootwise_opening_balances(
 				ignore_reporting_currency=ignore_reporting_currency,
 			)
 	else:
-		gle = get_opening_balance(
-			"GL Entry",
+		gle = get_opening_balance_from_ledger(
 			filters,
 			report_type,
 			accounting_dimensions,
@@ -223,6 +222,46 @@ def get_rootwise_opening_balances(
 	return opening
 
 
+def get_opening_balance_from_ledger(
+	filters,
+	report_type,
+	accounting_dimensions,
+	start_date=None,
+	ignore_is_opening=0,
+	ignore_reporting_currency=True,
+):
+	"""Opening balance from GL Balance Snapshot till its date and from GL Entry after that"""
+	gle = []
+	posted_after = None
+
+	snapshot_date = get_gl_balance_snapshot_date(filters.company, add_days(filters.from_date, -1))
+	if snapshot_date and (not start_date or getdate(start_date) <= snapshot_date):
+		gle += get_opening_balance(
+			"GL Balance Snapshot",
+			filters,
+			report_type,
+			accounting_dimensions,
+			start_date=start_date,
+			posted_upto=snapshot_date,
+			ignore_is_opening=ignore_is_opening,
+			ignore_reporting_currency=ignore_reporting_currency,
+		)
+		posted_after = snapshot_date
+
+	gle += get_opening_balance(
+		"GL Entry",
+		filters,
+		report_type,
+		accounting_dimensions,
+		start_date=start_date,
+		posted_after=posted_after,
+		ignore_is_opening=ignore_is_opening,
+		ignore_reporting_currency=ignore_reporting_currency,
+	)
+
+	return gle
+
+
 def get_opening_balance(
 	doctype,
 	filters,
@@ -230,6 +269,8 @@ def get_opening_balance(
 	accounting_dimensions,
 	period_closing_voucher=None,
 	start_date=None,
+	posted_after=None,
+	posted_upto=None,
 	ignore_is_opening=0,
 	ignore_reporting_currency=True,
 ):
@@ -277,21 +318,27 @@ def get_opening_balance(
 			else:
 				opening_balance = opening_balance.where(closing_balance.posting_date < filters.from_date)
 
+	if posted_after:
+		opening_balance = opening_balance.where(closing_balance.posting_date > posted_after)
+
+	if posted_upto:
+		opening_balance = opening_balance.where(closing_balance.posting_date <= posted_upto)
+
 	if doctype == "GL Entry":
 		opening_balance = opening_balance.where(closing_balance.is_cancelled == 0)
 
 	if (
 		not filters.show_unclosed_fy_pl_balances
 		and report_type == "Profit and Loss"
-		and doctype == "GL Entry"
+		and doctype != "Account Closing Balance"
 	):
 		opening_balance = opening_balance.where(closing_balance.posting_date >= filters.year_start_date)
 
 	if not flt(filters.with_period_closing_entry_for_opening):
-		if doctype == "Account Closing Balance":
-			opening_balance = opening_balance.where(closing_balance.is_period_closing_voucher_entry == 0)
-		else:
+		if doctype == "GL Entry":
 			opening_balance = opening_balance.where(closing_balance.voucher_type != "Period Closing Voucher")
+		else:
+			opening_balance = opening_balance.where(closing_balance.is_period_closing_voucher_entry == 0)
 
 	if filters.cost_center:
 		opening_balance = opening_balance.where(
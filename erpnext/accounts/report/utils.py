@@ -86,19 +86,21 @@ def get_rate_as_at(date, from_currency, to_currency):
 	return rate
 
 
-def convert_to_presentation_currency(gl_entries, currency_info, filters=None):
+def convert_to_presentation_currency(gl_entries, currency_info, filters=None, account_currencies=None):
 	"""
 	Take a list of GL Entries and change the 'debit' and 'credit' values to currencies
 	in `currency_info`.
 	:param gl_entries:
 	:param currency_info:
+	:param account_currencies: currencies of all the entries, when converting them in batches
 	:return:
 	"""
 	converted_gl_list = []
 	presentation_currency = currency_info["presentation_currency"]
 	company_currency = currency_info["company_currency"]
 
-	account_currencies = list(set(entry["account_currency"] for entry in gl_entries))
+	if account_currencies is None:
+		account_currencies = list(set(entry["account_currency"] for entry in gl_entries))
 	exchange_gain_or_loss = False
 
 	if filters and isinstance(filters.get("account"), list):
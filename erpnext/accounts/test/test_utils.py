@@ -6,6 +6,7 @@ from erpnext.accounts.doctype.payment_entry.payment_entry import get_payment_ent
 from erpnext.accounts.doctype.purchase_invoice.test_purchase_invoice import make_purchase_invoice
 from erpnext.accounts.party import get_party_shipping_address
 from erpnext.accounts.utils import (
+	compare_existing_and_expected_gle,
 	get_future_stock_vouchers,
 	get_voucherwise_gl_entries,
 	get_zero_cutoff,
@@ -59,6 +60,35 @@ class TestUtils(IntegrationTestCase):
 			msg="get_voucherwise_gl_entries not returning expected GLes",
 		)
 
+	def test_compare_existing_and_expected_gle(self):
+		def gle(account, cost_center, debit=0, credit=0):
+			return frappe._dict(account=account, cost_center=cost_center, debit=debit, credit=credit)
+
+		existing_gle = [gle("Stock", "Main", debit=100), gle("COGS", "Main", credit=100)]
+		self.assertTrue(
+			compare_existing_and_expected_gle(
+				existing_gle, [gle("COGS", "Main", credit=100), gle("Stock", None, debit=100)], 2
+			)
+		)
+		self.assertFalse(
+			compare_existing_and_expected_gle(
+				existing_gle, [gle("Stock", "Main", debit=90), gle("COGS", "Main", credit=90)], 2
+			)
+		)
+		self.assertFalse(
+			compare_existing_and_expected_gle(
+				existing_gle, [gle("Stock", "Main", debit=100), gle("Expense", "Main", credit=100)], 2
+			)
+		)
+
+		# entries of another cost center are not compared
+		existing_gle = [gle("Stock", "Main", debit=100), gle("Stock", "Other", debit=50)]
+		self.assertTrue(
+			compare_existing_and_expected_gle(
+				existing_gle, [gle("Stock", "Main", debit=100), gle("Stock", "Other", debit=50)], 2
+			)
+		)
+
 	def test_stock_voucher_sorting(self):
 		vouchers = []
 
@@ -3,6 +3,7 @@
 
 
 from collections import defaultdict
+from datetime import timedelta
 from json import loads
 from typing import TYPE_CHECKING, Optional
 
@@ -39,6 +40,9 @@ import erpnext
 # imported to enable erpnext.accounts.utils.get_account_currency
 from erpnext.accounts.doctype.account.account import get_account_currency
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import get_dimensions
+from erpnext.accounts.doctype.payment_ledger_outstanding.payment_ledger_outstanding import (
+	refresh_payment_ledger_outstanding,
+)
 from erpnext.stock import get_warehouse_account_map
 from erpnext.stock.utils import get_stock_value_on
 
@@ -972,6 +976,18 @@ def update_accounting_ledgers_after_reference_removal(
 
 	# Payment Ledger
 	ple = qb.DocType("Payment Ledger Entry")
+	# vouchers whose entries are moved back against themselves
+	if payment_name:
+		voucher_nos = [payment_name]
+	else:
+		voucher_nos = (
+			qb.from_(ple)
+			.select(ple.voucher_no)
+			.distinct()
+			.where((ple.against_voucher_type == ref_type) & (ple.against_voucher_no == ref_no))
+			.run(pluck=True)
+		)
+
 	ple_update_query = (
 		qb.update(ple)
 		.set(ple.against_voucher_type, ple.voucher_type)
@@ -986,6 +1002,7 @@ def update_accounting_ledgers_after_reference_removal(
 	if payment_name:
 		ple_update_query = ple_update_query.where(ple.voucher_no == payment_name)
 	ple_update_query.run()
+	refresh_payment_ledger_outstanding([ref_no, *voucher_nos])
 
 	# Advance Payment
 	adv = qb.DocType("Advance Payment Ledger Entry")
@@ -1627,7 +1644,15 @@ def repost_gle_for_stock_vouchers(
 
 def _delete_pl_entries(voucher_type, voucher_no):
 	ple = qb.DocType("Payment Ledger Entry")
+	against_voucher_nos = (
+		qb.from_(ple)
+		.select(ple.against_voucher_no)
+		.distinct()
+		.where((ple.voucher_type == voucher_type) & (ple.voucher_no == voucher_no))
+		.run(pluck=True)
+	)
 	qb.from_(ple).delete().where((ple.voucher_type == voucher_type) & (ple.voucher_no == voucher_no)).run()
+	refresh_payment_ledger_outstanding([voucher_no, *against_voucher_nos])
 
 
 def _delete_adv_pl_entries(voucher_type, voucher_no):
@@ -1636,6 +1661,12 @@ def _delete_adv_pl_entries(voucher_type, voucher_no):
 
 
 def _delete_gl_entries(voucher_type, voucher_no):
+	from erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot import (
+		invalidate_gl_balance_snapshot_of_voucher,
+	)
+
+	invalidate_gl_balance_snapshot_of_voucher(voucher_type, voucher_no)
+
 	gle = qb.DocType("GL Entry")
 	qb.from_(gle).delete().where((gle.voucher_type == voucher_type) & (gle.voucher_no == voucher_no)).run()
 
@@ -1738,29 +1769,39 @@ def get_voucherwise_gl_entries(future_stock_vouchers, posting_date):
 
 
 def compare_existing_and_expected_gle(existing_gle, expected_gle, precision):
+	"""Existing GL Entries match the expected ones if every expected entry's account exists, and the
+	existing entries of its account and cost center (or without cost center) have the same amounts"""
 	if len(existing_gle) != len(expected_gle):
 		return False
 
-	matched = True
+	# amounts of the existing entries by account and cost center, None holding those without one
+	existing_amounts = {}
+	for e in existing_gle:
+		amounts = existing_amounts.setdefault(e.account, {}).setdefault(e.cost_center or None, set())
+		amounts.add((flt(e.debit, precision), flt(e.credit, precision)))
+
+	def has_other_amount(amounts, amount):
+		return len(amounts) > 1 or (amounts and amount not in amounts)
+
 	for entry in expected_gle:
-		account_existed = False
-		for e in existing_gle:
-			if entry.account == e.account:
-				account_existed = True
-			if (
-				entry.account == e.account
-				and (not entry.cost_center or not e.cost_center or entry.cost_center == e.cost_center)
-				and (
-					flt(entry.debit, precision) != flt(e.debit, precision)
-					or flt(entry.credit, precision) != flt(e.credit, precision)
-				)
-			):
-				matched = False
-				break
-		if not account_existed:
-			matched = False
-			break
-	return matched
+		if entry.account not in existing_amounts:
+			return False
+
+		amount = (flt(entry.debit, precision), flt(entry.credit, precision))
+		amounts_by_cost_center = existing_amounts[entry.account]
+		if entry.cost_center:
+			cost_centers = {entry.cost_center, None}
+		else:
+			cost_centers = amounts_by_cost_center.keys()
+
+		if any(
+			has_other_amount(amounts_by_cost_center[cost_center], amount)
+			for cost_center in cost_centers
+			if cost_center in amounts_by_cost_center
+		):
+			return False
+
+	return True
 
 
 def get_stock_accounts(company, voucher_type=None, voucher_no=None, accounts=None):
@@ -2046,25 +2087,98 @@ def get_advance_ledger_entry(
 
 
 def create_payment_ledger_entry(
-	gl_entries, cancel=0, adv_adj=0, update_outstanding="Yes", from_repost=0, partial_cancel=False
+	gl_entries,
+	cancel=0,
+	adv_adj=0,
+	update_outstanding="Yes",
+	from_repost=0,
+	partial_cancel=False,
+	bulk_insert=False,
 ):
 	if gl_entries:
 		ple_map = get_payment_ledger_entries(gl_entries, cancel=cancel)
 
-		for entry in ple_map:
-			ple = frappe.get_doc(entry)
+		if bulk_insert and not cancel and ple_map:
+			make_payment_ledger_entries_in_bulk(ple_map, adv_adj, update_outstanding, from_repost)
+		else:
+			for entry in ple_map:
+				ple = frappe.get_doc(entry)
 
-			if cancel:
-				delink_original_entry(ple, partial_cancel=partial_cancel)
-				if is_immutable_ledger_enabled():
-					ple.delinked = 0
-					ple.posting_date = frappe.form_dict.get("posting_date") or getdate()
+				if cancel:
+					delink_original_entry(ple, partial_cancel=partial_cancel)
+					if is_immutable_ledger_enabled():
+						ple.delinked = 0
+						ple.posting_date = frappe.form_dict.get("posting_date") or getdate()
+
+				ple.flags.ignore_permissions = 1
+				ple.flags.adv_adj = adv_adj
+				ple.flags.from_repost = from_repost
+				ple.flags.update_outstanding = update_outstanding
+				ple.submit()
+
+		refresh_payment_ledger_outstanding(
+			[entry.voucher_no for entry in ple_map] + [entry.against_voucher_no for entry in ple_map]
+		)
 
-			ple.flags.ignore_permissions = 1
-			ple.flags.adv_adj = adv_adj
-			ple.flags.from_repost = from_repost
-			ple.flags.update_outstanding = update_outstanding
-			ple.submit()
+
+def make_payment_ledger_entries_in_bulk(ple_map, adv_adj=0, update_outstanding="Yes", from_repost=0):
+	"""Insert Payment Ledger Entries of a voucher with one multi-row insert, updating the
+	outstanding of every against voucher once"""
+	from erpnext.accounts.doctype.gl_entry.gl_entry import validate_balance_type, validate_frozen_account
+
+	# distinct creation for every entry to keep the order same as the voucher rows
+	creation = get_datetime(now())
+
+	ple_docs = []
+	for idx, entry in enumerate(ple_map):
+		ple = frappe.get_doc(entry)
+		ple.flags.ignore_permissions = 1
+		ple.flags.adv_adj = adv_adj
+		ple.flags.from_repost = from_repost
+		ple.flags.update_outstanding = update_outstanding
+		ple.docstatus = 1
+		ple.set_new_name()
+		ple.creation = ple.modified = creation + timedelta(microseconds=idx)
+		ple.owner = ple.modified_by = frappe.session.user
+
+		ple.run_method("validate")
+		ple.run_method("before_submit")
+		ple_docs.append(ple)
+
+	fields = frappe.get_meta("Payment Ledger Entry").get_valid_columns()
+	values = []
+	for ple in ple_docs:
+		row = ple.get_valid_dict(convert_dates_to_str=True)
+		values.append(tuple(row.get(field) for field in fields))
+
+	frappe.db.bulk_insert("Payment Ledger Entry", fields=fields, values=values)
+
+	if not from_repost:
+		for ple in ple_docs:
+			validate_frozen_account(ple.company, ple.account, adv_adj)
+			if not ple.delinked:
+				ple.validate_account_details()
+				ple.validate_dimensions_for_pl_and_bs()
+				ple.validate_allowed_dimensions()
+
+		for account in {ple.account for ple in ple_docs if not ple.delinked}:
+			validate_balance_type(account, adv_adj)
+
+	outstanding_to_update = set()
+	for ple in ple_docs:
+		ple.run_method("on_submit")
+
+		if (
+			ple.against_voucher_type in OUTSTANDING_DOCTYPES
+			and update_outstanding == "Yes"
+			and not frappe.flags.is_reverse_depr_entry
+		):
+			outstanding_to_update.add(
+				(ple.against_voucher_type, ple.against_voucher_no, ple.account, ple.party_type, ple.party)
+			)
+
+	for args in outstanding_to_update:
+		update_voucher_outstanding(*args)
 
 
 def update_voucher_outstanding(voucher_type, voucher_no, account, party_type, party):
@@ -2515,44 +2629,11 @@ def get_advance_payment_doctypes(payment_type=None):
 
 
 def run_ledger_health_checks():
-	health_monitor_settings = frappe.get_doc("Ledger Health Monitor")
-	if health_monitor_settings.enable_health_monitor:
-		period_end = getdate()
-		period_start = add_days(period_end, -abs(health_monitor_settings.monitor_for_last_x_days))
-
-		run_date = get_datetime()
-
-		# Debit-Credit mismatch report
-		if health_monitor_settings.debit_credit_mismatch:
-			for x in health_monitor_settings.companies:
-				filters = {"company": x.company, "from_date": period_start, "to_date": period_end}
-				voucher_wise = frappe.get_doc("Report", "Voucher-wise Balance")
-				res = voucher_wise.execute_script_report(filters=filters)
-				for x in res[1]:
-					doc = frappe.new_doc("Ledger Health")
-					doc.voucher_type = x.voucher_type
-					doc.voucher_no = x.voucher_no
-					doc.debit_credit_mismatch = True
-					doc.checked_on = run_date
-					doc.save()
-
-		# General Ledger and Payment Ledger discrepancy
-		if health_monitor_settings.general_and_payment_ledger_mismatch:
-			for x in health_monitor_settings.companies:
-				filters = {
-					"company": x.company,
-					"period_start_date": period_start,
-					"period_end_date": period_end,
-				}
-				gl_pl_comparison = frappe.get_doc("Report", "General and Payment Ledger Comparison")
-				res = gl_pl_comparison.execute_script_report(filters=filters)
-				for x in res[1]:
-					doc = frappe.new_doc("Ledger Health")
-					doc.voucher_type = x.voucher_type
-					doc.voucher_no = x.voucher_no
-					doc.general_and_payment_ledger_mismatch = True
-					doc.checked_on = run_date
-					doc.save()
+	from erpnext.accounts.doctype.ledger_health_monitor.ledger_health_monitor import (
+		enqueue_ledger_health_checks,
+	)
+
+	enqueue_ledger_health_checks()
 
 
 def sync_auto_reconcile_config(auto_reconciliation_job_trigger: int = 15):
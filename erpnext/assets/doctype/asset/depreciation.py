@@ -9,6 +9,7 @@ from frappe.query_builder.functions import Max, Min
 from frappe.utils import (
 	add_months,
 	cint,
+	create_batch,
 	flt,
 	get_last_day,
 	get_link_to_form,
@@ -32,6 +33,12 @@ from erpnext.assets.doctype.asset_depreciation_schedule.asset_depreciation_sched
 	reschedule_depreciation,
 )
 
+# number of asset depreciation schedules booked by a background job
+DEPRECIATION_JOB_SIZE = 500
+
+# number of depreciation rows booked together in a consolidated depreciation entry
+CONSOLIDATED_DEPRECIATION_ENTRY_SIZE = 200
+
 
 def post_depreciation_entries(date=None):
 	# Return if automatic booking of asset depreciation is disabled
@@ -43,14 +50,40 @@ def post_depreciation_entries(date=None):
 
 
 def book_depreciation_entries(date):
-	# Process depreciation entries for all depreciable assets
+	"""Book the due depreciation of all the depreciable assets in background jobs, each booking
+	upto `DEPRECIATION_JOB_SIZE` schedules of a company and asset category"""
+	schedules_by_category = {}
+	for data in get_depreciable_assets_data(date):
+		depr_schedule_name, company, asset_category = data[0], data[4], data[5]
+		schedules_by_category.setdefault((company, asset_category), []).append(depr_schedule_name)
+
+	for depr_schedule_names in schedules_by_category.values():
+		for batch in create_batch(depr_schedule_names, DEPRECIATION_JOB_SIZE):
+			frappe.enqueue(
+				book_depreciation_entries_of_schedules,
+				queue="long",
+				job_id=f"book_depreciation_entries::{date}::{batch[0]}",
+				deduplicate=True,
+				now=frappe.in_test,
+				date=date,
+				depr_schedule_names=batch,
+			)
+
+
+def book_depreciation_entries_of_schedules(date, depr_schedule_names):
 	failed_assets, error_logs = [], []
 
-	depreciable_assets_data = get_depreciable_assets_data(date)
+	# schedules booked meanwhile by another job or manually are skipped
+	depreciable_assets_data = get_depreciable_assets_data(date, depr_schedule_names)
 	accounting_dimensions = get_checks_for_pl_and_bs_accounts()
 
+	if cint(frappe.get_single_value("Accounts Settings", "book_consolidated_depreciation_entries")):
+		depreciable_assets_data = book_consolidated_depreciation_entries(
+			date, depreciable_assets_data, accounting_dimensions
+		)
+
 	for data in depreciable_assets_data:
-		(depr_schedule_name, asset_name, sch_start_idx, sch_end_idx) = data
+		(depr_schedule_name, asset_name, sch_start_idx, sch_end_idx, *_) = data
 
 		try:
 			make_depreciation_entry(
@@ -74,7 +107,7 @@ def book_depreciation_entries(date):
 	frappe.db.commit()
 
 
-def get_depreciable_assets_data(date):
+def get_depreciable_assets_data(date, depr_schedule_names=None):
 	a = frappe.qb.DocType("Asset")
 	ads = frappe.qb.DocType("Asset Depreciation Schedule")
 	ds = frappe.qb.DocType("Depreciation Schedule")
@@ -85,7 +118,7 @@ def get_depreciable_assets_data(date):
 		.on(ads.asset == a.name)
 		.join(ds)
 		.on(ads.name == ds.parent)
-		.select(ads.name, a.name, Min(ds.idx) - 1, Max(ds.idx))
+		.select(ads.name, a.name, Min(ds.idx) - 1, Max(ds.idx), a.company, a.asset_category)
 		.where(a.calculate_depreciation == 1)
 		.where(a.docstatus == 1)
 		.where(ads.docstatus == 1)
@@ -96,6 +129,9 @@ def get_depreciable_assets_data(date):
 		.orderby(a.creation, order=Order.desc)
 	)
 
+	if depr_schedule_names:
+		res = res.where(ads.name.isin(depr_schedule_names))
+
 	companies_with_frozen_limits = get_companies_with_frozen_limits()
 
 	for company, frozen_upto in companies_with_frozen_limits.items():
@@ -104,6 +140,133 @@ def get_depreciable_assets_data(date):
 	return res.run()
 
 
+def book_consolidated_depreciation_entries(date, depreciable_assets_data, accounting_dimensions):
+	"""Book the due depreciation of the schedules in one Journal Entry per company, finance book,
+	cost center and posting date, with a row per asset.
+
+	Returns the data of the schedules of the entries that failed, to be booked per asset."""
+	depr_cost_centers = get_depr_cost_center_and_series()
+
+	rows_by_entry = {}
+	for row in get_due_depreciation_rows(
+		date, [d[0] for d in depreciable_assets_data], accounting_dimensions
+	):
+		depr_cost_center = row.cost_center or depr_cost_centers[row.company][0]
+		rows_by_entry.setdefault(
+			(row.company, row.finance_book, depr_cost_center, row.schedule_date), []
+		).append(row)
+
+	failed_schedules = set()
+	for (company, finance_book, depr_cost_center, posting_date), rows in rows_by_entry.items():
+		for batch in create_batch(rows, CONSOLIDATED_DEPRECIATION_ENTRY_SIZE):
+			try:
+				make_consolidated_depreciation_entry(
+					company, finance_book, depr_cost_center, posting_date, batch, accounting_dimensions
+				)
+				frappe.db.commit()
+			except Exception:
+				frappe.db.rollback()
+				failed_schedules.update(row.depr_schedule_name for row in batch)
+				asset_categories = ", ".join(
+					sorted({row.asset_category for row in batch if row.asset_category})
+				)
+				frappe.log_error(
+					title=_(
+						"Consolidated depreciation entry failed for company {0}, asset category {1} on {2}"
+					).format(company, asset_categories, posting_date)
+				)
+
+	# booked per asset from the first due row, rows booked together meanwhile are skipped
+	return [
+		(depr_schedule_name, asset_name, None, None)
+		for depr_schedule_name, asset_name, *_ in depreciable_assets_data
+		if depr_schedule_name in failed_schedules
+	]
+
+
+def get_due_depreciation_rows(date, depr_schedule_names, accounting_dimensions):
+	if not depr_schedule_names:
+		return []
+
+	a = frappe.qb.DocType("Asset")
+	ads = frappe.qb.DocType("Asset Depreciation Schedule")
+	ds = frappe.qb.DocType("Depreciation Schedule")
+
+	query = (
+		frappe.qb.from_(ds)
+		.join(ads)
+		.on(ds.parent == ads.name)
+		.join(a)
+		.on(ads.asset == a.name)
+		.select(
+			ds.schedule_date,
+			ds.depreciation_amount,
+			ads.name.as_("depr_schedule_name"),
+			ads.finance_book,
+			a.name.as_("asset"),
+			a.company,
+			a.asset_category,
+			a.cost_center,
+			*[a[fieldname] for fieldname in dict.fromkeys(d["fieldname"] for d in accounting_dimensions)],
+		)
+		.where(ads.name.isin(depr_schedule_names))
+		.where(ds.journal_entry.isnull())
+		.where(ds.schedule_date <= date)
+		.orderby(ds.schedule_date)
+		.orderby(a.name)
+	)
+
+	for company, frozen_upto in get_companies_with_frozen_limits().items():
+		query = query.where((a.company != company) | (ds.schedule_date > frozen_upto))
+
+	return query.run(as_dict=True)
+
+
+def make_consolidated_depreciation_entry(
+	company, finance_book, depr_cost_center, posting_date, rows, accounting_dimensions
+):
+	je = frappe.new_doc("Journal Entry")
+	je.voucher_type = "Depreciation Entry"
+	if depr_series := frappe.get_cached_value("Company", company, "series_for_depreciation_entry"):
+		je.naming_series = depr_series
+
+	je.posting_date = posting_date
+	je.company = company
+	je.finance_book = finance_book
+	je.remark = _("Depreciation Entry against {0} assets worth {1}").format(
+		len(rows), sum(flt(row.depreciation_amount) for row in rows)
+	)
+
+	accounts_by_category = {}
+	for row in rows:
+		if row.asset_category not in accounts_by_category:
+			accounts_by_category[row.asset_category] = get_credit_debit_accounts_for_asset(
+				row.asset_category, company
+			)
+
+		credit_account, debit_account = accounts_by_category[row.asset_category]
+		asset = frappe._dict(row, name=row.asset)
+		credit_entry, debit_entry = get_credit_and_debit_entry(
+			credit_account, row, asset, depr_cost_center, debit_account, accounting_dimensions
+		)
+
+		je.append("accounts", credit_entry)
+		je.append("accounts", debit_entry)
+
+	je.flags.ignore_permissions = True
+	je.save()
+
+	if not je.meta.get_workflow():
+		je.submit()
+
+	asset = frappe.qb.DocType("Asset")
+	(
+		frappe.qb.update(asset)
+		.set(asset.depr_entry_posting_status, "Successful")
+		.where(asset.name.isin(list({row.asset for row in rows})))
+	).run()
+
+
 def get_companies_with_frozen_limits():
 	companies_with_frozen_limits = {}
 	for d in frappe.get_all(
@@ -1407,6 +1407,34 @@ class TestDepreciationBasics(AssetSetup):
 		self.assertFalse(depr_schedule[1].journal_entry)
 		self.assertFalse(depr_schedule[2].journal_entry)
 
+	@IntegrationTestCase.change_settings("Accounts Settings", {"book_consolidated_depreciation_entries": 1})
+	def test_post_consolidated_depreciation_entries(self):
+		"""Tests if the due depreciation of assets of a company is booked in one Journal Entry."""
+
+		assets = [
+			create_asset(
+				item_code="Macbook Pro",
+				calculate_depreciation=1,
+				available_for_use_date="2019-12-31",
+				depreciation_start_date="2020-12-31",
+				frequency_of_depreciation=12,
+				total_number_of_depreciations=3,
+				expected_value_after_useful_life=10000,
+				submit=1,
+			)
+			for _ in range(2)
+		]
+
+		post_depreciation_entries(date="2021-06-01")
+
+		depr_schedules = [get_depr_schedule(asset.name, "Active") for asset in assets]
+		journal_entry = depr_schedules[0][0].journal_entry
+
+		self.assertTrue(journal_entry)
+		self.assertEqual(depr_schedules[1][0].journal_entry, journal_entry)
+		self.assertFalse(depr_schedules[0][1].journal_entry)
+		self.assertEqual(len(frappe.get_doc("Journal Entry", journal_entry).accounts), 4)
+
 	def test_depr_entry_posting_when_depr_expense_account_is_an_expense_account(self):
 		"""Tests if the Depreciation Expense Account gets debited and the Accumulated Depreciation Account gets credited when the former's an Expense Account."""
 
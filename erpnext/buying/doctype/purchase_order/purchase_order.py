@@ -22,6 +22,7 @@ from erpnext.manufacturing.doctype.blanket_order.blanket_order import (
 	validate_against_blanket_order,
 )
 from erpnext.setup.doctype.item_group.item_group import get_item_group_defaults
+from erpnext.stock.doctype.bin.bin import coalesced_bin_updates
 from erpnext.stock.doctype.item.item import get_item_defaults, get_last_purchase_details
 from erpnext.stock.stock_balance import get_ordered_qty, update_bin_qty
 from erpnext.stock.utils import get_bin
@@ -578,10 +579,13 @@ class PurchaseOrder(BuyingController):
 
 	def update_reserved_qty_for_subcontract(self):
 		if self.is_old_subcontracting_flow:
-			for d in self.supplied_items:
-				if d.rm_item_code:
-					stock_bin = get_bin(d.rm_item_code, d.reserve_warehouse)
-					stock_bin.update_reserved_qty_for_sub_contracting(subcontract_doctype="Purchase Order")
+			with coalesced_bin_updates():
+				for d in self.supplied_items:
+					if d.rm_item_code:
+						stock_bin = get_bin(d.rm_item_code, d.reserve_warehouse)
+						stock_bin.update_reserved_qty_for_sub_contracting(
+							subcontract_doctype="Purchase Order"
+						)
 
 	def update_receiving_percentage(self):
 		total_qty, received_qty = 0.0, 0.0
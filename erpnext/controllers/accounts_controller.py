@@ -33,6 +33,9 @@ from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimensions,
 )
+from erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot import (
+	invalidate_gl_balance_snapshot_of_voucher,
+)
 from erpnext.accounts.doctype.pricing_rule.utils import (
 	apply_pricing_rule_for_free_items,
 	apply_pricing_rule_on_transaction,
@@ -74,6 +77,7 @@ from erpnext.stock.get_item_details import (
 	get_item_details,
 	get_item_tax_map,
 	get_item_warehouse_,
+	prefetched_item_details,
 )
 from erpnext.utilities.regional import temporary_flag
 from erpnext.utilities.transaction_base import TransactionBase
@@ -482,6 +486,7 @@ class AccountsController(TransactionBase):
 					== 1
 				)
 			).run()
+			invalidate_gl_balance_snapshot_of_voucher(self.doctype, self.name)
 			gle = frappe.qb.DocType("GL Entry")
 			frappe.qb.from_(gle).delete().where(
 				(gle.voucher_type == self.doctype) & (gle.voucher_no == self.name)
@@ -991,6 +996,21 @@ class AccountsController(TransactionBase):
 				)
 
 	def set_missing_item_details(self, for_validate=False):
+		"""set missing item values"""
+		with prefetched_item_details(self.get_items_ctx_to_prefetch()):
+			self._set_missing_item_details(for_validate=for_validate)
+
+	def get_items_ctx_to_prefetch(self):
+		parent_dict = {fieldname: self.get(fieldname) for fieldname in self.meta.get_valid_columns()}
+		ignore_pricing_rule = self.get("ignore_pricing_rule")
+
+		return [
+			ItemDetailsCtx({**parent_dict, **item.as_dict(), "ignore_pricing_rule": ignore_pricing_rule})
+			for item in self.get("items")
+			if item.get("item_code")
+		]
+
+	def _set_missing_item_details(self, for_validate=False):
 		"""set missing item values"""
 		from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
 
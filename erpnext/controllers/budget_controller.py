@@ -6,7 +6,11 @@ from frappe.query_builder import Criterion
 from frappe.query_builder.functions import IfNull, Sum
 from frappe.utils import fmt_money
 
-from erpnext.accounts.doctype.budget.budget import BudgetError, get_accumulated_monthly_budget
+from erpnext.accounts.doctype.budget.budget import (
+	BudgetError,
+	get_accumulated_monthly_budget,
+	get_booked_expense,
+)
 from erpnext.accounts.utils import get_fiscal_year
 
 
@@ -268,22 +272,15 @@ class BudgetValidation:
 
 	def get_actual_expense(self, key: tuple | None = None):
 		if key:
-			gl = qb.DocType("GL Entry")
-
-			query = (
-				qb.from_(gl)
-				.select((Sum(gl.debit) - Sum(gl.credit)).as_("balance"))
-				.where(
-					gl.is_cancelled.eq(0)
-					& gl.account.eq(key[2])
-					& gl.fiscal_year.eq(self.fiscal_year)
-					& gl.company.eq(self.company)
-					& gl[key[0]].eq(key[1])
-					& gl.posting_date[self.fy_start_date : self.fy_end_date]
-				)
+			# key structure - (dimension_type, dimension, GL account)
+			self.to_validate[key].actual_expense = get_booked_expense(
+				self.company,
+				key[2],
+				self.fy_start_date,
+				self.fy_end_date,
+				lambda table: table[key[0]] == key[1],
+				fiscal_year=self.fiscal_year,
 			)
-			if actual_expense := query.run(as_dict=True):
-				self.to_validate[key].actual_expense = actual_expense[0].balance or 0
 
 	def stop(self, msg):
 		frappe.throw(msg, BudgetError, title=_("Budget Exceeded"))
@@ -2132,6 +2132,7 @@ def is_reposting_pending():
 
 
 def future_sle_exists(args, sl_entries=None):
+	from erpnext.stock.doctype.bin.bin import get_last_posting_datetimes
 	from erpnext.stock.utils import get_combine_datetime
 
 	key = (args.voucher_type, args.voucher_no)
@@ -2148,10 +2149,22 @@ def future_sle_exists(args, sl_entries=None):
 		if not sl_entries:
 			return
 
-	or_conditions = get_conditions_to_validate_future_sle(sl_entries)
-
 	args["posting_datetime"] = get_combine_datetime(args["posting_date"], args["posting_time"])
 
+	# Bin has the latest posting of the item and warehouse, only those posted till now need to be checked
+	last_posting_datetimes = get_last_posting_datetimes((d.item_code, d.warehouse) for d in sl_entries)
+	sl_entries = [
+		d
+		for d in sl_entries
+		if (last_posting := last_posting_datetimes.get((d.item_code, d.warehouse)))
+		and last_posting.last_posting_datetime
+		and last_posting.last_posting_datetime >= args.posting_datetime
+	]
+	if not sl_entries:
+		return 0
+
+	or_conditions = get_conditions_to_validate_future_sle(sl_entries)
+
 	data = frappe.db.sql(
 		"""
 		select item_code, warehouse, count(name) as total_row
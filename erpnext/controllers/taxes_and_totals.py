@@ -76,6 +76,7 @@ class calculate_taxes_and_totals:
 		self.validate_item_tax_template()
 		self.update_item_tax_map()
 		self.initialize_taxes()
+		self.tax_plan = self.get_tax_plan()
 		self.determine_exclusive_rate()
 		self.calculate_net_total()
 		self.calculate_taxes()
@@ -135,12 +136,40 @@ class calculate_taxes_and_totals:
 							self.need_recomputation = True
 
 	def update_item_tax_map(self):
+		# the map only depends on the tax rows and the template, resolve it once per template
+		item_tax_maps = {}
 		for item in self.doc.items:
-			item.item_tax_rate = get_item_tax_map(
-				doc=self.doc,
-				tax_template=item.item_tax_template,
-				as_json=True,
+			if item.item_tax_template not in item_tax_maps:
+				item_tax_maps[item.item_tax_template] = get_item_tax_map(
+					doc=self.doc,
+					tax_template=item.item_tax_template,
+					as_json=True,
+				)
+
+			item.item_tax_rate = item_tax_maps[item.item_tax_template]
+
+	def get_tax_plan(self):
+		"""
+		Parsed item tax maps and inclusive tax fractions per distinct `item_tax_rate` of the items,
+		kept on the document and reused by every calculation till the tax rows change
+		"""
+		signature = tuple(
+			(
+				tax.account_head,
+				tax.rate,
+				tax.charge_type,
+				tax.row_id,
+				cint(tax.included_in_print_rate),
+				tax.get("add_deduct_tax"),
 			)
+			for tax in self.doc.get("taxes")
+		)
+
+		plan = getattr(self.doc, "_tax_plan", None)
+		if not plan or plan.signature != signature:
+			plan = self.doc._tax_plan = frappe._dict(signature=signature, item_tax_maps={}, tax_fractions={})
+
+		return plan
 
 	def validate_conversion_rate(self):
 		# validate conversion rate
@@ -288,25 +317,17 @@ class calculate_taxes_and_totals:
 		if not any(cint(tax.included_in_print_rate) for tax in self.doc.get("taxes")):
 			return
 
+		tax_fractions = self.tax_plan.tax_fractions
 		for item in self.doc.items:
-			item_tax_map = self._load_item_tax_rate(item.item_tax_rate)
-			cumulated_tax_fraction = 0
-			total_inclusive_tax_amount_per_qty = 0
-			for i, tax in enumerate(self.doc.get("taxes")):
-				(
-					tax.tax_fraction_for_current_item,
-					inclusive_tax_amount_per_qty,
-				) = self.get_current_tax_fraction(tax, item_tax_map)
-
-				if i == 0:
-					tax.grand_total_fraction_for_current_item = 1 + tax.tax_fraction_for_current_item
-				else:
-					tax.grand_total_fraction_for_current_item = (
-						self.doc.get("taxes")[i - 1].grand_total_fraction_for_current_item
-						+ tax.tax_fraction_for_current_item
-					)
+			# fractions only depend on the item tax map, items sharing it share the fractions
+			if item.item_tax_rate not in tax_fractions:
+				tax_fractions[item.item_tax_rate] = self.get_tax_fractions(
+					self._load_item_tax_rate(item.item_tax_rate)
+				)
 
-				cumulated_tax_fraction += tax.tax_fraction_for_current_item
+			cumulated_tax_fraction, inclusive_tax_amounts_per_qty = tax_fractions[item.item_tax_rate]
+			total_inclusive_tax_amount_per_qty = 0
+			for inclusive_tax_amount_per_qty in inclusive_tax_amounts_per_qty:
 				total_inclusive_tax_amount_per_qty += inclusive_tax_amount_per_qty * flt(item.qty)
 
 			if (
@@ -324,8 +345,38 @@ class calculate_taxes_and_totals:
 
 				self._set_in_company_currency(item, ["net_rate", "net_amount"])
 
+	def get_tax_fractions(self, item_tax_map):
+		"""Returns the cumulated tax fraction and the inclusive tax amount per qty of every tax row"""
+		cumulated_tax_fraction = 0
+		inclusive_tax_amounts_per_qty = []
+		for i, tax in enumerate(self.doc.get("taxes")):
+			(
+				tax.tax_fraction_for_current_item,
+				inclusive_tax_amount_per_qty,
+			) = self.get_current_tax_fraction(tax, item_tax_map)
+
+			if i == 0:
+				tax.grand_total_fraction_for_current_item = 1 + tax.tax_fraction_for_current_item
+			else:
+				tax.grand_total_fraction_for_current_item = (
+					self.doc.get("taxes")[i - 1].grand_total_fraction_for_current_item
+					+ tax.tax_fraction_for_current_item
+				)
+
+			cumulated_tax_fraction += tax.tax_fraction_for_current_item
+			inclusive_tax_amounts_per_qty.append(inclusive_tax_amount_per_qty)
+
+		return cumulated_tax_fraction, inclusive_tax_amounts_per_qty
+
 	def _load_item_tax_rate(self, item_tax_rate):
-		return json.loads(item_tax_rate) if item_tax_rate else {}
+		if not item_tax_rate:
+			return {}
+
+		item_tax_maps = self.tax_plan.item_tax_maps
+		if item_tax_rate not in item_tax_maps:
+			item_tax_maps[item_tax_rate] = json.loads(item_tax_rate)
+
+		return item_tax_maps[item_tax_rate]
 
 	def get_current_tax_fraction(self, tax, item_tax_map):
 		"""
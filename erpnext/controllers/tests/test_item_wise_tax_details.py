@@ -120,3 +120,40 @@ class TestTaxesAndTotals(FrappeTestCase):
 		]
 
 		self.assertEqual(actual_values, expected_values)
+
+	def test_tax_plan_reused_till_taxes_change(self):
+		self.doc.append(
+			"items",
+			{
+				"item_code": "_Test Item",
+				"qty": 1,
+				"rate": 200,
+				"income_account": "Sales - _TC",
+				"expense_account": "Cost of Goods Sold - _TC",
+				"cost_center": "_Test Cost Center - _TC",
+			},
+		)
+		self.doc.append(
+			"taxes",
+			{
+				"charge_type": "On Net Total",
+				"account_head": "_Test Account VAT - _TC",
+				"cost_center": "_Test Cost Center - _TC",
+				"description": "VAT",
+				"rate": 10,
+				"included_in_print_rate": 1,
+			},
+		)
+		self.doc.calculate_taxes_and_totals()
+
+		tax_plan = self.doc._tax_plan
+		self.assertEqual([item.net_amount for item in self.doc.items], [90.91, 181.82])
+		self.assertEqual(len(tax_plan.tax_fractions), 1)
+
+		self.doc.calculate_taxes_and_totals()
+		self.assertIs(self.doc._tax_plan, tax_plan)
+
+		self.doc.taxes[0].rate = 25
+		self.doc.calculate_taxes_and_totals()
+		self.assertIsNot(self.doc._tax_plan, tax_plan)
+		self.assertEqual([item.net_amount for item in self.doc.items], [80.0, 160.0])
@@ -443,7 +443,12 @@ scheduler_events = {
 		"erpnext.utilities.doctype.video.video.update_youtube_data",
 	],
 	"daily": [],
-	"daily_long": [],
+	"daily_long": [
+		"erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot.update_gl_balance_snapshots",
+		"erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot.update_stock_balance_snapshots",
+		"erpnext.accounts.doctype.payment_ledger_outstanding.payment_ledger_outstanding.update_payment_ledger_outstanding",
+		"erpnext.stock.doctype.batch_warehouse_balance.batch_warehouse_balance.update_batch_warehouse_balance",
+	],
 	"daily_maintenance": [
 		"erpnext.support.doctype.issue.issue.auto_close_tickets",
 		"erpnext.crm.doctype.opportunity.opportunity.auto_close_opportunity",
@@ -564,6 +569,7 @@ accounting_dimension_doctypes = [
 	"Subcontracting Receipt",
 	"Subcontracting Receipt Item",
 	"Account Closing Balance",
+	"GL Balance Snapshot",
 	"Supplier Quotation",
 	"Supplier Quotation Item",
 	"Payment Reconciliation",
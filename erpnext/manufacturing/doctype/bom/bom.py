@@ -370,6 +370,7 @@ class BOM(WebsiteGenerator):
 
 	def on_update(self):
 		frappe.cache().hdel("bom_children", self.name)
+		frappe.cache().hdel("bom_components", self.name)
 		self.check_recursion()
 
 	def on_submit(self):
@@ -1461,6 +1462,50 @@ def get_bom_items(bom, company, qty=1, fetch_exploded=1):
 	return items
 
 
+def get_bom_components(bom_nos):
+	"""Return the BOMs with their BOM Item rows as `items`. The rows are cached per BOM along with
+	the BOM's modified timestamp, and are fetched again for the BOMs modified since they were cached."""
+	boms = frappe.get_all(
+		"BOM",
+		filters={"name": ("in", list(bom_nos))},
+		fields=["name", "item", "quantity", "docstatus", "modified"],
+	)
+
+	cache = frappe.cache()
+	stale_boms = {}
+	for bom in boms:
+		cached = cache.hget("bom_components", bom.name)
+		if cached and cached.get("modified") == str(bom.modified):
+			bom["items"] = cached["items"]
+		else:
+			bom["items"] = []
+			stale_boms[bom.name] = bom
+
+	if stale_boms:
+		bom_items = frappe.get_all(
+			"BOM Item",
+			filters={"parent": ("in", list(stale_boms)), "parenttype": "BOM"},
+			fields=[
+				"parent",
+				"item_code",
+				"stock_qty",
+				"source_warehouse",
+				"description",
+				"stock_uom",
+				"is_phantom_item",
+				"is_sub_assembly_item",
+			],
+			order_by="idx",
+		)
+		for row in bom_items:
+			stale_boms[row.pop("parent")]["items"].append(row)
+
+		for bom in stale_boms.values():
+			cache.hset("bom_components", bom.name, {"modified": str(bom.modified), "items": bom["items"]})
+
+	return {bom.name: bom for bom in boms}
+
+
 def validate_bom_no(item, bom_no):
 	"""Validate BOM No of sub-contracted items"""
 	bom = frappe.get_doc("BOM", bom_no)
@@ -55,6 +55,36 @@ class TestBOM(IntegrationTestCase):
 
 		self.assertEqual(len(get_bom_items(bom=get_default_bom(), company="_Test Company")), 3)
 
+	@timeout
+	def test_get_bom_components(self):
+		from erpnext.manufacturing.doctype.bom.bom import get_bom_components
+
+		bom_no = get_default_bom()
+		bom_items = frappe.get_all(
+			"BOM Item", filters={"parent": bom_no}, fields=["name", "item_code", "stock_qty"], order_by="idx"
+		)
+		self.addCleanup(
+			frappe.db.set_value, "BOM Item", bom_items[0].name, "stock_qty", bom_items[0].stock_qty
+		)
+
+		components = get_bom_components([bom_no])[bom_no]
+		self.assertEqual([row.item_code for row in components["items"]], [d.item_code for d in bom_items])
+
+		# an edit of a BOM Item alone is still served from the cache, only a change to the modified of
+		# the BOM reads the components again
+		frappe.db.set_value("BOM Item", bom_items[0].name, "stock_qty", 7)
+		self.assertNotEqual(get_bom_components([bom_no])[bom_no]["items"][0].stock_qty, 7)
+
+		self.addCleanup(
+			frappe.db.set_value,
+			"BOM",
+			bom_no,
+			"description",
+			frappe.db.get_value("BOM", bom_no, "description"),
+		)
+		frappe.db.set_value("BOM", bom_no, "description", "Modified")
+		self.assertEqual(get_bom_components([bom_no])[bom_no]["items"][0].stock_qty, 7)
+
 	@timeout
 	def test_default_bom(self):
 		def _get_default_bom_in_item():
@@ -26,10 +26,11 @@ from frappe.utils import (
 from frappe.utils.csvutils import build_csv_response
 from pypika.terms import ExistsCriterion
 
+from erpnext.manufacturing.doctype.bom.bom import get_bom_components, validate_bom_no
 from erpnext.manufacturing.doctype.bom.bom import get_children as get_bom_children
-from erpnext.manufacturing.doctype.bom.bom import validate_bom_no
 from erpnext.manufacturing.doctype.work_order.work_order import get_item_details
 from erpnext.setup.doctype.item_group.item_group import get_item_group_defaults
+from erpnext.stock.doctype.bin.bin import coalesced_bin_updates
 from erpnext.stock.doctype.stock_reservation_entry.stock_reservation_entry import StockReservation
 from erpnext.stock.get_item_details import get_conversion_factor
 from erpnext.stock.utils import get_or_make_bin
@@ -660,17 +661,19 @@ class ProductionPlan(Document):
 		return so_wise_planned_qty
 
 	def update_bin_qty(self):
-		for d in self.mr_items:
-			if d.warehouse:
-				bin_name = get_or_make_bin(d.item_code, d.warehouse)
-				bin = frappe.get_doc("Bin", bin_name, for_update=True)
-				bin.update_reserved_qty_for_production_plan()
-
-		for d in self.sub_assembly_items:
-			if d.fg_warehouse and d.type_of_manufacturing == "In House":
-				bin_name = get_or_make_bin(d.production_item, d.fg_warehouse)
-				bin = frappe.get_doc("Bin", bin_name, for_update=True)
-				bin.update_reserved_qty_for_for_sub_assembly()
+		# the Bins are locked in the order of their names when the block exits
+		with coalesced_bin_updates():
+			for d in self.mr_items:
+				if d.warehouse:
+					bin_name = get_or_make_bin(d.item_code, d.warehouse)
+					bin = frappe.get_doc("Bin", bin_name)
+					bin.update_reserved_qty_for_production_plan()
+
+			for d in self.sub_assembly_items:
+				if d.fg_warehouse and d.type_of_manufacturing == "In House":
+					bin_name = get_or_make_bin(d.production_item, d.fg_warehouse)
+					bin = frappe.get_doc("Bin", bin_name)
+					bin.update_reserved_qty_for_for_sub_assembly()
 
 	def delete_draft_work_order(self):
 		for d in frappe.get_all(
@@ -1341,84 +1344,155 @@ def get_subitems(
 	include_subcontracted_items,
 	parent_qty,
 	planned_qty=1,
+	bom_tree=None,
 ):
-	bom_item = frappe.qb.DocType("BOM Item")
-	bom = frappe.qb.DocType("BOM")
+	if bom_tree is None:
+		bom_tree = get_bom_tree(bom_no, company, data, include_subcontracted_items)
+
+	items = get_bom_sub_items(bom_tree, bom_no, include_non_stock_items, parent_qty * planned_qty)
+
+	for d in items:
+		if not data.get("include_exploded_items") or not d.default_bom:
+			if d.item_code in item_details:
+				item_details[d.item_code].qty = item_details[d.item_code].qty + d.qty
+			else:
+				if not d.conversion_factor and d.purchase_uom:
+					d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
+
+				item_details[d.item_code] = d
+
+		if is_sub_item_exploded(d, data, include_subcontracted_items) and d.qty > 0:
+			get_subitems(
+				doc,
+				data,
+				item_details,
+				d.default_bom,
+				company,
+				include_non_stock_items,
+				include_subcontracted_items,
+				d.qty,
+				bom_tree=bom_tree,
+			)
+	return {key: value for key, value in item_details.items() if not value.get("is_phantom_item")}
+
+
+def is_sub_item_exploded(d, data, include_subcontracted_items):
+	if not (d.is_phantom_item or (data.get("include_exploded_items") and d.default_bom)):
+		return False
+
+	return (
+		(d.default_material_request_type in ["Manufacture", "Purchase"] and not d.is_sub_contracted)
+		or (d.is_sub_contracted and include_subcontracted_items)
+		or d.is_phantom_item
+	)
+
+
+def get_bom_tree(bom_no, company, data, include_subcontracted_items):
+	"""BOMs and items exploded by `get_subitems` for the BOM, fetched a level of the tree at a time
+	instead of per BOM"""
+	bom_tree = frappe._dict({"boms": {}, "items": {}})
+
+	bom_nos = {bom_no}
+	while bom_nos:
+		boms = get_bom_components(bom_nos)
+		bom_tree.boms.update(boms)
+
+		item_codes = {row.item_code for bom in boms.values() for row in bom["items"]}
+		bom_tree.items.update(get_sub_item_details(item_codes - set(bom_tree.items), company))
+
+		bom_nos = set()
+		for bom in boms.values():
+			for row in bom["items"]:
+				item = bom_tree.items.get(row.item_code)
+				if not item or not item.default_bom or item.default_bom in bom_tree.boms:
+					continue
+
+				d = frappe._dict(item, is_phantom_item=row.is_phantom_item)
+				if is_sub_item_exploded(d, data, include_subcontracted_items):
+					bom_nos.add(item.default_bom)
+
+	return bom_tree
+
+
+def get_sub_item_details(item_codes, company):
+	if not item_codes:
+		return {}
+
 	item = frappe.qb.DocType("Item")
 	item_default = frappe.qb.DocType("Item Default")
 	item_uom = frappe.qb.DocType("UOM Conversion Detail")
 
 	items = (
-		frappe.qb.from_(bom_item)
-		.join(bom)
-		.on(bom.name == bom_item.parent)
-		.join(item)
-		.on(bom_item.item_code == item.name)
+		frappe.qb.from_(item)
 		.left_join(item_default)
 		.on((item.name == item_default.parent) & (item_default.company == company))
 		.left_join(item_uom)
 		.on((item.name == item_uom.parent) & (item_uom.uom == item.purchase_uom))
 		.select(
-			bom_item.item_code,
-			item.default_material_request_type,
+			item.name.as_("item_code"),
 			item.item_name,
-			IfNull(parent_qty * Sum(bom_item.stock_qty / IfNull(bom.quantity, 1)) * planned_qty, 0).as_(
-				"qty"
-			),
+			item.default_material_request_type,
 			item.is_sub_contracted_item.as_("is_sub_contracted"),
-			bom_item.source_warehouse,
-			item.default_bom.as_("default_bom"),
-			bom_item.description.as_("description"),
-			bom_item.stock_uom.as_("stock_uom"),
-			item.min_order_qty.as_("min_order_qty"),
-			item.safety_stock.as_("safety_stock"),
+			item.default_bom,
+			item.min_order_qty,
+			item.safety_stock,
+			item.is_stock_item,
 			item_default.default_warehouse,
 			item.purchase_uom,
 			item_uom.conversion_factor,
-			bom.item.as_("main_bom_item"),
-			bom_item.is_phantom_item,
-		)
-		.where(
-			(bom.name == bom_no)
-			& (bom_item.is_sub_assembly_item == 0)
-			& (bom_item.docstatus < 2)
-			& (
-				(item.is_stock_item.isin([0, 1]) if include_non_stock_items else item.is_stock_item == 1)
-				| (bom_item.is_phantom_item == 1)
-			)
 		)
-		.groupby(bom_item.item_code)
-		.orderby(bom_item.idx)
+		.where(item.name.isin(list(item_codes)))
 	).run(as_dict=True)
 
+	item_details = {}
 	for d in items:
-		if not data.get("include_exploded_items") or not d.default_bom:
-			if d.item_code in item_details:
-				item_details[d.item_code].qty = item_details[d.item_code].qty + d.qty
-			else:
-				if not d.conversion_factor and d.purchase_uom:
-					d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
+		item_details.setdefault(d.item_code, d)
 
-				item_details[d.item_code] = d
+	return item_details
 
-		if d.is_phantom_item or (data.get("include_exploded_items") and d.default_bom):
-			if (
-				(d.default_material_request_type in ["Manufacture", "Purchase"] and not d.is_sub_contracted)
-				or (d.is_sub_contracted and include_subcontracted_items)
-				or d.is_phantom_item
-			):
-				if d.qty > 0:
-					get_subitems(
-						doc,
-						data,
-						item_details,
-						d.default_bom,
-						company,
-						include_non_stock_items,
-						include_subcontracted_items,
-						d.qty,
-					)
-	return {key: value for key, value in item_details.items() if not value.get("is_phantom_item")}
+
+def get_bom_sub_items(bom_tree, bom_no, include_non_stock_items, qty):
+	"""Qty of the items of the BOM required for the qty of its finished good, summed per item"""
+	bom = bom_tree.boms.get(bom_no)
+	if not bom or bom.docstatus == 2:
+		return []
+
+	sub_items = {}
+	for row in bom["items"]:
+		item = bom_tree.items.get(row.item_code)
+		if not item or row.is_sub_assembly_item:
+			continue
+
+		if not (include_non_stock_items or item.is_stock_item or row.is_phantom_item):
+			continue
+
+		if row.item_code not in sub_items:
+			sub_items[row.item_code] = frappe._dict(
+				{
+					"item_code": row.item_code,
+					"default_material_request_type": item.default_material_request_type,
+					"item_name": item.item_name,
+					"qty": 0.0,
+					"is_sub_contracted": item.is_sub_contracted,
+					"source_warehouse": row.source_warehouse,
+					"default_bom": item.default_bom,
+					"description": row.description,
+					"stock_uom": row.stock_uom,
+					"min_order_qty": item.min_order_qty,
+					"safety_stock": item.safety_stock,
+					"default_warehouse": item.default_warehouse,
+					"purchase_uom": item.purchase_uom,
+					"conversion_factor": item.conversion_factor,
+					"main_bom_item": bom.item,
+					"is_phantom_item": row.is_phantom_item,
+				}
+			)
+
+		# a BOM without quantity counts as a quantity of 1, a zero quantity too, while the query this
+		# replaced gave 0 for a zero quantity
+		sub_items[row.item_code].qty += flt(row.stock_qty) / (flt(bom.quantity) or 1) * qty
+
+	return list(sub_items.values())
 
 
 def get_material_request_items(
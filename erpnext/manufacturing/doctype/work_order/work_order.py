@@ -34,6 +34,7 @@ from erpnext.manufacturing.doctype.manufacturing_settings.manufacturing_settings
 	get_mins_between_operations,
 )
 from erpnext.stock.doctype.batch.batch import make_batch
+from erpnext.stock.doctype.bin.bin import coalesced_bin_updates
 from erpnext.stock.doctype.item.item import get_item_defaults, validate_end_of_life
 from erpnext.stock.doctype.serial_no.serial_no import get_available_serial_nos, get_serial_nos
 from erpnext.stock.doctype.stock_reservation_entry.stock_reservation_entry import StockReservation
@@ -1492,10 +1493,11 @@ class WorkOrder(Document):
 
 	def update_reserved_qty_for_production(self, items=None):
 		"""update reserved_qty_for_production in bins"""
-		for d in self.required_items:
-			if d.source_warehouse:
-				stock_bin = get_bin(d.item_code, d.source_warehouse)
-				stock_bin.update_reserved_qty_for_production()
+		with coalesced_bin_updates():
+			for d in self.required_items:
+				if d.source_warehouse:
+					stock_bin = get_bin(d.item_code, d.source_warehouse)
+					stock_bin.update_reserved_qty_for_production()
 
 	@frappe.whitelist()
 	def get_items_and_operations_from_bom(self):
@@ -0,0 +1,25 @@
+import frappe
+
+
+def execute():
+	frappe.reload_doc("stock", "doctype", "bin")
+
+	frappe.db.sql(
+		"""
+        UPDATE `tabBin` b
+        INNER JOIN (
+            SELECT
+                item_code,
+                warehouse,
+                MAX(posting_datetime) AS last_posting_datetime,
+                MAX(CASE WHEN voucher_type = 'Stock Reconciliation' THEN posting_datetime END)
+                    AS last_stock_reco_datetime
+            FROM `tabStock Ledger Entry`
+            WHERE is_cancelled = 0
+            GROUP BY item_code, warehouse
+        ) sle ON sle.item_code = b.item_code AND sle.warehouse = b.warehouse
+        SET
+            b.last_posting_datetime = sle.last_posting_datetime,
+            b.last_stock_reco_datetime = sle.last_stock_reco_datetime
+    """
+	)
@@ -9,9 +9,13 @@ from frappe.query_builder import DocType, Order
 from frappe.utils import cint, get_datetime
 from frappe.utils.nestedset import get_root_of
 
-from erpnext.accounts.doctype.pos_invoice.pos_invoice import get_item_group, get_stock_availability
+from erpnext.accounts.doctype.pos_invoice.pos_invoice import (
+	get_item_group,
+	get_stock_availability,
+	get_stock_availability_of_items,
+)
 from erpnext.accounts.doctype.pos_profile.pos_profile import get_child_nodes, get_item_groups
-from erpnext.stock.get_item_details import get_conversion_factor
+from erpnext.stock.doctype.item.item import get_uom_conv_factor
 from erpnext.stock.utils import scan_barcode
 
 
@@ -198,29 +202,14 @@ def get_items(start, page_length, price_list, item_group, pos_profile, search_te
 	if not items_data:
 		return result
 
-	current_date = frappe.utils.today()
+	item_codes = [item.item_code for item in items_data]
+	stock_availability = get_stock_availability_of_items(item_codes, warehouse)
+	item_prices_map = get_item_prices(item_codes, price_list)
+	conversion_factors = get_conversion_factors(items_data)
 
 	for item in items_data:
-		item.actual_qty, _, is_negative_stock_allowed = get_stock_availability(item.item_code, warehouse)
-
-		ItemPrice = DocType("Item Price")
-		item_prices = (
-			frappe.qb.from_(ItemPrice)
-			.select(
-				ItemPrice.price_list_rate,
-				ItemPrice.currency,
-				ItemPrice.uom,
-				ItemPrice.batch_no,
-				ItemPrice.valid_from,
-				ItemPrice.valid_upto,
-			)
-			.where(ItemPrice.price_list == price_list)
-			.where(ItemPrice.item_code == item.item_code)
-			.where(ItemPrice.selling == 1)
-			.where((ItemPrice.valid_from <= current_date) | (ItemPrice.valid_from.isnull()))
-			.where((ItemPrice.valid_upto >= current_date) | (ItemPrice.valid_upto.isnull()))
-			.orderby(ItemPrice.valid_from, order=Order.desc)
-		).run(as_dict=True)
+		item.actual_qty = stock_availability.get(item.item_code, 0)
+		item_prices = item_prices_map.get(item.item_code, [])
 
 		stock_uom_price = next((d for d in item_prices if d.get("uom") == item.stock_uom), {})
 		item_uom = item.stock_uom
@@ -236,7 +225,7 @@ def get_items(start, page_length, price_list, item_group, pos_profile, search_te
 			item_uom = item_prices[0].get("uom")
 			item_uom_price = item_prices[0]
 
-		item_conversion_factor = get_conversion_factor(item.item_code, item_uom).get("conversion_factor")
+		item_conversion_factor = get_item_conversion_factor(item, item_uom, conversion_factors)
 
 		if item.stock_uom != item_uom:
 			item.actual_qty = item.actual_qty // item_conversion_factor
@@ -257,6 +246,74 @@ def get_items(start, page_length, price_list, item_group, pos_profile, search_te
 	return {"items": result}
 
 
+def get_item_prices(item_codes, price_list):
+	"""Selling prices of the items in the price list valid today, latest valid from first"""
+	current_date = frappe.utils.today()
+
+	ItemPrice = DocType("Item Price")
+	item_prices = (
+		frappe.qb.from_(ItemPrice)
+		.select(
+			ItemPrice.item_code,
+			ItemPrice.price_list_rate,
+			ItemPrice.currency,
+			ItemPrice.uom,
+			ItemPrice.batch_no,
+			ItemPrice.valid_from,
+			ItemPrice.valid_upto,
+		)
+		.where(ItemPrice.price_list == price_list)
+		.where(ItemPrice.item_code.isin(item_codes))
+		.where(ItemPrice.selling == 1)
+		.where((ItemPrice.valid_from <= current_date) | (ItemPrice.valid_from.isnull()))
+		.where((ItemPrice.valid_upto >= current_date) | (ItemPrice.valid_upto.isnull()))
+		.orderby(ItemPrice.valid_from, order=Order.desc)
+	).run(as_dict=True)
+
+	item_prices_map = {}
+	for d in item_prices:
+		item_prices_map.setdefault(d.pop("item_code"), []).append(d)
+
+	return item_prices_map
+
+
+def get_conversion_factors(items):
+	"""UOM conversion factors of the items and of their templates, by item code and uom"""
+	item_codes = [item.item_code for item in items]
+	templates = frappe._dict(
+		frappe.get_all(
+			"Item",
+			filters={"name": ("in", item_codes), "variant_of": ("is", "set")},
+			fields=["name", "variant_of"],
+			as_list=True,
+		)
+	)
+
+	ucd = DocType("UOM Conversion Detail")
+	conversion_factors = {}
+	for parent, uom, conversion_factor in (
+		frappe.qb.from_(ucd)
+		.select(ucd.parent, ucd.uom, ucd.conversion_factor)
+		.where((ucd.parenttype == "Item") & ucd.parent.isin(item_codes + list(templates.values())))
+	).run():
+		conversion_factors[(parent, uom)] = conversion_factor
+
+	return frappe._dict(templates=templates, conversion_factors=conversion_factors)
+
+
+def get_item_conversion_factor(item, uom, conversion_factors):
+	"""Same as `get_conversion_factor`, from the conversion factors loaded for the page"""
+	if uom == item.stock_uom:
+		return 1.0
+
+	# conversion factor of the item takes precedence over that of its template
+	for item_code in (item.item_code, conversion_factors.templates.get(item.item_code)):
+		if (item_code, uom) in conversion_factors.conversion_factors:
+			return conversion_factors.conversion_factors[(item_code, uom)] or 1.0
+
+	return get_uom_conv_factor(uom, item.stock_uom) or 1.0
+
+
 @frappe.whitelist()
 def search_for_serial_or_batch_or_barcode_number(search_value: str) -> dict[str, str | None]:
 	return scan_barcode(search_value)
@@ -12,6 +12,17 @@ from frappe.utils import cint, comma_and, create_batch, get_link_to_form
 from frappe.utils.background_jobs import get_job, is_job_enqueued
 from frappe.utils.caching import request_cache
 
+from erpnext.accounts.doctype.gl_balance_snapshot.gl_balance_snapshot import reset_gl_balance_snapshot
+from erpnext.accounts.doctype.payment_ledger_outstanding.payment_ledger_outstanding import (
+	reset_payment_ledger_outstanding,
+)
+from erpnext.stock.doctype.batch_warehouse_balance.batch_warehouse_balance import (
+	reset_batch_warehouse_balance,
+)
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	reset_stock_balance_snapshot,
+)
+
 LEDGER_ENTRY_DOCTYPES = frozenset(
 	(
 		"GL Entry",
@@ -910,6 +921,15 @@ class TransactionDeletionRecord(Document):
 	def delete_docs_linked_with_specified_company(self, doctype, reference_doc_names):
 		frappe.db.delete(doctype, {"name": ("in", reference_doc_names)})
 
+		if doctype == "GL Entry":
+			reset_gl_balance_snapshot(self.company)
+		elif doctype == "Payment Ledger Entry":
+			reset_payment_ledger_outstanding(self.company)
+		elif doctype == "Stock Ledger Entry":
+			reset_stock_balance_snapshot(self.company)
+			# balances are not kept per company, they are built again by the scheduled job
+			reset_batch_warehouse_balance()
+
 	@staticmethod
 	def get_naming_series_prefix(naming_series: str, doctype_name: str) -> str:
 		"""Extract the static prefix from an autoname pattern.
@@ -0,0 +1,371 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Case
+from frappe.query_builder.functions import Count, Max, Sum
+from frappe.utils import create_batch, flt, get_datetime, now, today
+
+# number of batches refreshed per query
+BALANCE_BATCH_SIZE = 1000
+
+
+class BatchWarehouseBalance(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		batch_no: DF.Link | None
+		item_code: DF.Link | None
+		last_posting_datetime: DF.Datetime | None
+		movement_count: DF.Int
+		qty: DF.Float
+		warehouse: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Batch Warehouse Balance", ["batch_no", "warehouse"])
+	frappe.db.add_index("Batch Warehouse Balance", ["item_code", "warehouse"])
+
+
+def is_batch_warehouse_balance_enabled():
+	return frappe.get_single_value("Stock Settings", "use_batch_warehouse_balance")
+
+
+def get_balance_state_key():
+	return "batch_warehouse_balance"
+
+
+def is_batch_warehouse_balance_built():
+	"""Balances can be read once they were built after enabling the setting"""
+	return is_batch_warehouse_balance_enabled() and bool(frappe.db.get_default(get_balance_state_key()))
+
+
+def reset_batch_warehouse_balance():
+	frappe.db.delete("Batch Warehouse Balance")
+	frappe.db.set_default(get_balance_state_key(), None)
+
+
+def refresh_batch_warehouse_balance(batch_nos):
+	"""Recompute the balances of the given batches in every warehouse from Stock Ledger Entry"""
+	if not is_batch_warehouse_balance_enabled():
+		return
+
+	batch_nos = list({batch_no for batch_no in batch_nos if batch_no})
+	for batch in create_batch(batch_nos, BALANCE_BATCH_SIZE):
+		update_balance_rows(batch)
+
+
+def apply_batch_warehouse_balance_of_sle(sle):
+	"""Add the batch movements of the Stock Ledger Entry to the balances, or take them out again for the
+	entry reversing a cancelled one"""
+	if not sle.serial_and_batch_bundle or not is_batch_warehouse_balance_enabled():
+		return
+
+	batch_ledger = frappe.qb.DocType("Serial and Batch Entry")
+	movements = (
+		frappe.qb.from_(batch_ledger)
+		.select(
+			batch_ledger.batch_no,
+			batch_ledger.warehouse,
+			Sum(batch_ledger.qty).as_("qty"),
+			Count(batch_ledger.name).as_("movement_count"),
+		)
+		.where((batch_ledger.parent == sle.serial_and_batch_bundle) & (batch_ledger.batch_no.isnotnull()))
+		.groupby(batch_ledger.batch_no, batch_ledger.warehouse)
+	).run(as_dict=True)
+
+	if not movements:
+		return
+
+	batch_nos = sorted({row.batch_no for row in movements})
+
+	# entries of the same batch wait for each other here, locking in the order of the names
+	batch_table = frappe.qb.DocType("Batch")
+	(
+		frappe.qb.from_(batch_table)
+		.select(batch_table.name)
+		.where(batch_table.name.isin(batch_nos))
+		.orderby(batch_table.name)
+		.for_update()
+	).run()
+
+	balance = frappe.qb.DocType("Batch Warehouse Balance")
+	existing_rows = {
+		(row.batch_no, row.warehouse): row.name
+		for row in (
+			frappe.qb.from_(balance)
+			.select(balance.name, balance.batch_no, balance.warehouse)
+			.where((balance.item_code == sle.item_code) & (balance.batch_no.isin(batch_nos)))
+			.orderby(balance.name)
+			.for_update()
+		).run(as_dict=True)
+	}
+
+	sign = -1 if sle.is_cancelled else 1
+	posting_datetime = get_datetime(sle.posting_datetime)
+	timestamp = now()
+	new_rows = []
+	for row in movements:
+		qty = sign * flt(row.qty)
+		movement_count = sign * row.movement_count
+
+		if name := existing_rows.get((row.batch_no, row.warehouse)):
+			(
+				frappe.qb.update(balance)
+				.set(balance.qty, balance.qty + qty)
+				.set(balance.movement_count, balance.movement_count + movement_count)
+				.set(
+					balance.last_posting_datetime,
+					Case()
+					.when(balance.last_posting_datetime >= posting_datetime, balance.last_posting_datetime)
+					.else_(posting_datetime),
+				)
+				.set(balance.modified, timestamp)
+				.where(balance.name == name)
+			).run()
+		else:
+			new_rows.append(
+				frappe._dict(
+					{
+						"item_code": sle.item_code,
+						"batch_no": row.batch_no,
+						"warehouse": row.warehouse,
+						"qty": qty,
+						"movement_count": movement_count,
+						"last_posting_datetime": posting_datetime,
+					}
+				)
+			)
+
+	insert_balance_rows(new_rows)
+
+
+def update_batch_warehouse_balance():
+	"""Scheduled job to build the balances, and to refresh the batches whose entries changed
+	since the previous build started"""
+	if not is_batch_warehouse_balance_enabled():
+		return
+
+	build_batch_warehouse_balance()
+
+
+def build_batch_warehouse_balance():
+	built_at = frappe.db.get_default(get_balance_state_key())
+	started_at = now()
+
+	if built_at:
+		batch_nos = get_batches_modified_after(get_datetime(built_at))
+	else:
+		frappe.db.delete("Batch Warehouse Balance")
+		batch_nos = frappe.get_all("Batch", pluck="name")
+
+	for batch in create_batch(list(batch_nos), BALANCE_BATCH_SIZE):
+		update_balance_rows(batch)
+		if not frappe.in_test:
+			frappe.db.commit()  # nosemgrep
+
+	frappe.db.set_default(get_balance_state_key(), started_at)
+
+
+def get_batches_modified_after(modified_after):
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	batch_ledger = frappe.qb.DocType("Serial and Batch Entry")
+
+	batch_nos = set()
+	for modified in (sle.modified, batch_ledger.modified):
+		query = (
+			frappe.qb.from_(sle)
+			.inner_join(batch_ledger)
+			.on(sle.serial_and_batch_bundle == batch_ledger.parent)
+			.select(batch_ledger.batch_no)
+			.distinct()
+			.where((modified >= modified_after) & (batch_ledger.batch_no.isnotnull()))
+		)
+		batch_nos.update(query.run(pluck=True))
+
+	return batch_nos
+
+
+def update_balance_rows(batch_nos):
+	"""Replace the balance rows of the batches with the sum of their Serial and Batch Entries"""
+	balance = frappe.qb.DocType("Batch Warehouse Balance")
+	frappe.qb.from_(balance).delete().where(balance.batch_no.isin(batch_nos)).run()
+
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	batch_ledger = frappe.qb.DocType("Serial and Batch Entry")
+	rows = (
+		frappe.qb.from_(sle)
+		.inner_join(batch_ledger)
+		.on(sle.serial_and_batch_bundle == batch_ledger.parent)
+		.select(
+			sle.item_code,
+			batch_ledger.batch_no,
+			batch_ledger.warehouse,
+			Sum(batch_ledger.qty).as_("qty"),
+			Count(batch_ledger.name).as_("movement_count"),
+			Max(sle.posting_datetime).as_("last_posting_datetime"),
+		)
+		.where((sle.is_cancelled == 0) & (batch_ledger.batch_no.isin(batch_nos)))
+		.groupby(sle.item_code, batch_ledger.batch_no, batch_ledger.warehouse)
+	).run(as_dict=True)
+
+	insert_balance_rows(rows)
+
+
+def insert_balance_rows(rows):
+	if not rows:
+		return
+
+	fields = [
+		"name",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+		"item_code",
+		"batch_no",
+		"warehouse",
+		"qty",
+		"movement_count",
+		"last_posting_datetime",
+	]
+	timestamp = now()
+	values = []
+	for row in rows:
+		row.update(
+			{
+				"name": frappe.generate_hash(length=10),
+				"creation": timestamp,
+				"modified": timestamp,
+				"owner": "Administrator",
+				"modified_by": "Administrator",
+			}
+		)
+		values.append(tuple(row.get(field) for field in fields))
+
+	frappe.db.bulk_insert("Batch Warehouse Balance", fields=fields, values=values)
+
+
+def get_batch_warehouse_balances(kwargs):
+	"""Available qty of the batches per warehouse from Batch Warehouse Balance, with the same filters
+	and ordering as `get_available_batches` reading Stock Ledger Entry.
+
+	Balances as on a posting datetime subtract the movements posted after it, which are only looked up
+	for the batches moved after that datetime."""
+	balance = frappe.qb.DocType("Batch Warehouse Balance")
+	batch_table = frappe.qb.DocType("Batch")
+
+	query = (
+		frappe.qb.from_(balance)
+		.inner_join(batch_table)
+		.on(balance.batch_no == batch_table.name)
+		.select(
+			balance.item_code,
+			balance.batch_no,
+			balance.warehouse,
+			balance.qty,
+			balance.movement_count,
+			balance.last_posting_datetime,
+			batch_table.expiry_date,
+		)
+		.where(batch_table.disabled == 0)
+	)
+
+	if not kwargs.get("for_stock_levels"):
+		query = query.where((batch_table.expiry_date >= today()) | (batch_table.expiry_date.isnull()))
+
+	for field in ["warehouse", "item_code", "batch_no"]:
+		if not kwargs.get(field):
+			continue
+
+		if isinstance(kwargs.get(field), list):
+			query = query.where(balance[field].isin(kwargs.get(field)))
+		else:
+			query = query.where(balance[field] == kwargs.get(field))
+
+	if kwargs.based_on == "LIFO":
+		query = query.orderby(batch_table.creation, order=frappe.qb.desc)
+	elif kwargs.based_on == "Expiry":
+		query = query.orderby(batch_table.expiry_date)
+	else:
+		query = query.orderby(batch_table.creation)
+
+	rows = query.run(as_dict=True)
+
+	future_movements = {}
+	if kwargs.get("posting_datetime"):
+		posting_datetime = get_datetime(kwargs.posting_datetime)
+		future_movements = get_movements_after(
+			[row for row in rows if get_datetime(row.last_posting_datetime) >= posting_datetime],
+			posting_datetime,
+			kwargs.get("creation"),
+		)
+
+	precision = frappe.get_precision("Serial and Batch Entry", "qty")
+	data = []
+	for row in rows:
+		qty = row.qty
+		if future := future_movements.get((row.item_code, row.batch_no, row.warehouse)):
+			if future.movement_count >= row.movement_count:
+				# the batch had not moved in the warehouse as on the posting datetime
+				continue
+
+			qty = flt(qty - future.qty, precision)
+
+		data.append(
+			frappe._dict(
+				{
+					"batch_no": row.batch_no,
+					"warehouse": row.warehouse,
+					"qty": qty,
+					"expiry_date": row.expiry_date,
+				}
+			)
+		)
+
+	return data
+
+
+def get_movements_after(rows, posting_datetime, creation=None):
+	"""Qty and number of the movements of the batch warehouse rows posted after the posting datetime,
+	or at the posting datetime but created at or after the creation"""
+	if not rows:
+		return {}
+
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	batch_ledger = frappe.qb.DocType("Serial and Batch Entry")
+
+	timestamp_condition = sle.posting_datetime > posting_datetime
+	if creation:
+		timestamp_condition |= (sle.posting_datetime == posting_datetime) & (sle.creation >= creation)
+
+	movements = {}
+	for batch_nos in create_batch(list({row.batch_no for row in rows}), BALANCE_BATCH_SIZE):
+		query = (
+			frappe.qb.from_(sle)
+			.inner_join(batch_ledger)
+			.on(sle.serial_and_batch_bundle == batch_ledger.parent)
+			.select(
+				sle.item_code,
+				batch_ledger.batch_no,
+				batch_ledger.warehouse,
+				Sum(batch_ledger.qty).as_("qty"),
+				Count(batch_ledger.name).as_("movement_count"),
+			)
+			.where((sle.is_cancelled == 0) & timestamp_condition & (batch_ledger.batch_no.isin(batch_nos)))
+			.groupby(sle.item_code, batch_ledger.batch_no, batch_ledger.warehouse)
+		)
+
+		for row in query.run(as_dict=True):
+			movements[(row.item_code, row.batch_no, row.warehouse)] = row
+
+	return movements
@@ -0,0 +1,102 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests import IntegrationTestCase
+from frappe.utils import add_days, add_to_date, get_datetime, nowtime, today
+
+from erpnext.stock.doctype.batch_warehouse_balance.batch_warehouse_balance import (
+	build_batch_warehouse_balance,
+	is_batch_warehouse_balance_built,
+	reset_batch_warehouse_balance,
+)
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
+	get_available_batches,
+)
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+
+
+class TestBatchWarehouseBalance(IntegrationTestCase):
+	def setUp(self):
+		self.warehouse = "_Test Warehouse - _TC"
+		self.item_code = make_item(
+			"_Test Batch Warehouse Balance Item",
+			{
+				"has_batch_no": 1,
+				"create_new_batch": 1,
+				"batch_number_series": "TBWB-.####",
+			},
+		).name
+
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def get_available_batches(self, **kwargs):
+		kwargs = frappe._dict({"item_code": self.item_code, "warehouse": self.warehouse, **kwargs})
+		return [(d.batch_no, d.warehouse, d.qty) for d in get_available_batches(kwargs)]
+
+	def get_available_batches_from_ledger(self, **kwargs):
+		frappe.db.set_single_value("Stock Settings", "use_batch_warehouse_balance", 0)
+		data = self.get_available_batches(**kwargs)
+		frappe.db.set_single_value("Stock Settings", "use_batch_warehouse_balance", 1)
+		return data
+
+	def test_available_batches_from_balance(self):
+		receipt = make_stock_entry(
+			item_code=self.item_code,
+			target=self.warehouse,
+			qty=10,
+			rate=100,
+			posting_date=add_days(today(), -10),
+		)
+		batch_no = frappe.db.get_value(
+			"Serial and Batch Entry", {"parent": receipt.items[0].serial_and_batch_bundle}, "batch_no"
+		)
+		make_stock_entry(
+			item_code=self.item_code,
+			target=self.warehouse,
+			qty=5,
+			rate=100,
+			posting_date=add_days(today(), -2),
+		)
+
+		frappe.db.set_single_value("Stock Settings", "use_batch_warehouse_balance", 1)
+		build_batch_warehouse_balance()
+		self.assertTrue(is_batch_warehouse_balance_built())
+
+		issue = make_stock_entry(
+			item_code=self.item_code,
+			source=self.warehouse,
+			qty=4,
+			batch_no=batch_no,
+			posting_date=add_days(today(), -5),
+		)
+		self.assertEqual(
+			frappe.db.get_value("Batch Warehouse Balance", {"batch_no": batch_no}, ["qty", "movement_count"]),
+			(6, 2),
+		)
+
+		posting_datetimes = [
+			None,
+			add_days(today(), -11),
+			add_days(today(), -7),
+			add_days(today(), -3),
+			get_datetime(f"{add_days(today(), -5)} {nowtime()}"),
+			add_to_date(get_datetime(), days=1),
+		]
+		for posting_datetime in posting_datetimes:
+			kwargs = {"posting_datetime": posting_datetime, "based_on": "LIFO"}
+			self.assertEqual(
+				self.get_available_batches(**kwargs), self.get_available_batches_from_ledger(**kwargs)
+			)
+
+		issue.cancel()
+		self.assertEqual(
+			frappe.db.get_value("Batch Warehouse Balance", {"batch_no": batch_no}, ["qty", "movement_count"]),
+			(10, 1),
+		)
+		self.assertEqual(self.get_available_batches(), self.get_available_batches_from_ledger())
+
+		reset_batch_warehouse_balance()
+		self.assertFalse(is_batch_warehouse_balance_built())
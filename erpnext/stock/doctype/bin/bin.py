@@ -1,12 +1,13 @@
 # Copyright (c) 2015, Frappe Technologies Pvt. Ltd. and Contributors
 # License: GNU General Public License v3. See license.txt
 
+from contextlib import contextmanager
 
 import frappe
 from frappe.model.document import Document
 from frappe.query_builder import Case, Order
-from frappe.query_builder.functions import Coalesce, Sum
-from frappe.utils import flt
+from frappe.query_builder.functions import Coalesce, Max, Sum
+from frappe.utils import flt, get_datetime
 
 
 class Bin(Document):
@@ -22,6 +23,8 @@ class Bin(Document):
 		company: DF.Link | None
 		indented_qty: DF.Float
 		item_code: DF.Link
+		last_posting_datetime: DF.Datetime | None
+		last_stock_reco_datetime: DF.Datetime | None
 		ordered_qty: DF.Float
 		planned_qty: DF.Float
 		projected_qty: DF.Float
@@ -61,8 +64,29 @@ class Bin(Document):
 	def before_save(self):
 		if self.get("__islocal") or not self.stock_uom:
 			self.stock_uom = frappe.get_cached_value("Item", self.item_code, "stock_uom")
+
+		if self.get("__islocal"):
+			self.set_last_posting_datetime()
+
 		self.set_projected_qty()
 
+	def set_last_posting_datetime(self):
+		sle = frappe.qb.DocType("Stock Ledger Entry")
+		is_stock_reco = sle.voucher_type == "Stock Reconciliation"
+
+		self.last_posting_datetime, self.last_stock_reco_datetime = (
+			frappe.qb.from_(sle)
+			.select(
+				Max(sle.posting_datetime),
+				Max(Case().when(is_stock_reco, sle.posting_datetime)),
+			)
+			.where(
+				(sle.item_code == self.item_code)
+				& (sle.warehouse == self.warehouse)
+				& (sle.is_cancelled == 0)
+			)
+		).run()[0]
+
 	def set_projected_qty(self):
 		self.projected_qty = (
 			flt(self.actual_qty)
@@ -91,16 +115,14 @@ class Bin(Document):
 
 		self.reserved_qty_for_production_plan = flt(reserved_qty_for_production_plan)
 
-		if update_qty:
+		if update_qty and skip_project_qty_update:
 			self.db_set(
 				"reserved_qty_for_production_plan",
 				flt(self.reserved_qty_for_production_plan),
 				update_modified=True,
 			)
-
-		if not skip_project_qty_update:
-			self.set_projected_qty()
-			self.db_set("projected_qty", self.projected_qty, update_modified=True)
+		elif update_qty:
+			self.db_set_qty({"reserved_qty_for_production_plan": self.reserved_qty_for_production_plan})
 
 	def update_reserved_qty_for_for_sub_assembly(self):
 		from erpnext.manufacturing.doctype.production_plan.production_plan import (
@@ -113,31 +135,24 @@ class Bin(Document):
 			return
 
 		self.reserved_qty_for_production_plan = flt(reserved_qty_for_production_plan)
-		self.set_projected_qty()
-
-		self.db_set(
-			{
-				"projected_qty": self.projected_qty,
-				"reserved_qty_for_production_plan": flt(self.reserved_qty_for_production_plan),
-			},
-			update_modified=True,
-		)
+		self.db_set_qty({"reserved_qty_for_production_plan": self.reserved_qty_for_production_plan})
 
 	def update_reserved_qty_for_production(self):
 		"""Update qty reserved for production from Production Item tables
 		in open work orders"""
 		from erpnext.manufacturing.doctype.work_order.work_order import get_reserved_qty_for_production
 
-		self.reserved_qty_for_production = get_reserved_qty_for_production(self.item_code, self.warehouse)
-
-		self.db_set(
-			"reserved_qty_for_production", flt(self.reserved_qty_for_production), update_modified=True
+		self.reserved_qty_for_production = flt(
+			get_reserved_qty_for_production(self.item_code, self.warehouse)
 		)
+		self.update_reserved_qty_for_production_plan(update_qty=False)
 
-		self.update_reserved_qty_for_production_plan(skip_project_qty_update=True)
-
-		self.set_projected_qty()
-		self.db_set("projected_qty", self.projected_qty, update_modified=True)
+		self.db_set_qty(
+			{
+				"reserved_qty_for_production": self.reserved_qty_for_production,
+				"reserved_qty_for_production_plan": flt(self.reserved_qty_for_production_plan),
+			}
+		)
 
 	def update_reserved_qty_for_sub_contracting(
 		self, subcontract_doctype="Subcontracting Order", update_qty=True
@@ -219,9 +234,7 @@ class Bin(Document):
 
 		self.reserved_qty_for_sub_contract = reserved_qty_for_sub_contract
 		if update_qty:
-			self.db_set("reserved_qty_for_sub_contract", reserved_qty_for_sub_contract, update_modified=True)
-			self.set_projected_qty()
-			self.db_set("projected_qty", self.projected_qty, update_modified=True)
+			self.db_set_qty({"reserved_qty_for_sub_contract": reserved_qty_for_sub_contract})
 
 	def update_reserved_stock(self):
 		"""Update `Reserved Stock` on change in Reserved Qty of Stock Reservation Entry"""
@@ -232,7 +245,18 @@ class Bin(Document):
 
 		reserved_stock = get_sre_reserved_qty_for_item_and_warehouse(self.item_code, self.warehouse)
 
-		self.db_set("reserved_stock", flt(reserved_stock), update_modified=True)
+		self.db_set_qty({"reserved_stock": flt(reserved_stock)})
+
+	def db_set_qty(self, values):
+		"""Write the quantities along with the projected qty. Inside `coalesced_bin_updates`
+		they are written with the other updates of the Bin when the block exits."""
+		bin_deltas = getattr(frappe.local, "bin_deltas", None)
+		if bin_deltas is not None:
+			get_bin_delta(bin_deltas, self.name, self.item_code, self.warehouse)["values"].update(values)
+			return
+
+		self.set_projected_qty()
+		self.db_set({**values, "projected_qty": self.projected_qty}, update_modified=True)
 
 
 def on_doctype_update():
@@ -257,9 +281,21 @@ def get_bin_details(bin_name):
 	)
 
 
+# fields of Bin which are updated with a delta from the stock ledger entry args
+BIN_DELTA_FIELDS = ("ordered_qty", "reserved_qty", "indented_qty", "planned_qty")
+
+# fields of Bin which only move forward, the latest of the values is written
+BIN_MAX_FIELDS = ("last_posting_datetime", "last_stock_reco_datetime")
+
+
 def update_qty(bin_name, args):
 	from erpnext.controllers.stock_controller import future_sle_exists
 
+	bin_deltas = getattr(frappe.local, "bin_deltas", None)
+	if bin_deltas is not None:
+		add_bin_delta(bin_deltas, bin_name, args)
+		return
+
 	bin_details = get_bin_details(bin_name)
 	# actual qty is already updated by processing current voucher
 	actual_qty = bin_details.actual_qty or 0.0
@@ -268,10 +304,14 @@ def update_qty(bin_name, args):
 	if future_sle_exists(args):
 		actual_qty = get_actual_qty(args.get("item_code"), args.get("warehouse"))
 
-	ordered_qty = flt(bin_details.ordered_qty) + flt(args.get("ordered_qty"))
-	reserved_qty = flt(bin_details.reserved_qty) + flt(args.get("reserved_qty"))
-	indented_qty = flt(bin_details.indented_qty) + flt(args.get("indented_qty"))
-	planned_qty = flt(bin_details.planned_qty) + flt(args.get("planned_qty"))
+	set_bin_qty(bin_name, bin_details, actual_qty, args)
+
+
+def set_bin_qty(bin_name, bin_details, actual_qty, deltas, values=None):
+	ordered_qty = flt(bin_details.ordered_qty) + flt(deltas.get("ordered_qty"))
+	reserved_qty = flt(bin_details.reserved_qty) + flt(deltas.get("reserved_qty"))
+	indented_qty = flt(bin_details.indented_qty) + flt(deltas.get("indented_qty"))
+	planned_qty = flt(bin_details.planned_qty) + flt(deltas.get("planned_qty"))
 
 	# compute projected qty
 	projected_qty = (
@@ -295,11 +335,175 @@ def update_qty(bin_name, args):
 			"indented_qty": indented_qty,
 			"planned_qty": planned_qty,
 			"projected_qty": projected_qty,
+			**(values or {}),
 		},
 		update_modified=True,
 	)
 
 
+@contextmanager
+def coalesced_bin_updates():
+	"""Collect the Bin updates made inside the block and write every Bin once when it exits.
+
+	Bins are locked in the order of their names while flushing, so that concurrent
+	transactions touching the same set of Bins don't deadlock each other."""
+
+	if getattr(frappe.local, "bin_deltas", None) is not None:
+		# already collecting, the outermost block flushes
+		yield
+		return
+
+	frappe.local.bin_deltas = {}
+	try:
+		yield
+		flush_bin_deltas(frappe.local.bin_deltas)
+	finally:
+		frappe.local.bin_deltas = None
+
+
+def get_bin_delta(bin_deltas, bin_name, item_code, warehouse):
+	return bin_deltas.setdefault(
+		bin_name,
+		frappe._dict(
+			{
+				"item_code": item_code,
+				"warehouse": warehouse,
+				"future_sle_exists": False,
+				# absolute values like the valuation from the stock ledger, the last one is written
+				"values": {},
+				**{fieldname: 0.0 for fieldname in BIN_DELTA_FIELDS},
+				**{fieldname: None for fieldname in BIN_MAX_FIELDS},
+			}
+		),
+	)
+
+
+def add_bin_delta(bin_deltas, bin_name, args):
+	from erpnext.controllers.stock_controller import future_sle_exists
+
+	delta = get_bin_delta(bin_deltas, bin_name, args.get("item_code"), args.get("warehouse"))
+
+	for fieldname in BIN_DELTA_FIELDS:
+		delta[fieldname] += flt(args.get(fieldname))
+
+	if not delta.future_sle_exists and future_sle_exists(args):
+		delta.future_sle_exists = True
+
+
+def flush_bin_deltas(bin_deltas):
+	if not bin_deltas:
+		return
+
+	bin = frappe.qb.DocType("Bin")
+	bins = (
+		frappe.qb.from_(bin)
+		.select(
+			bin.name,
+			bin.actual_qty,
+			bin.ordered_qty,
+			bin.reserved_qty,
+			bin.indented_qty,
+			bin.planned_qty,
+			bin.reserved_qty_for_production,
+			bin.reserved_qty_for_sub_contract,
+			bin.reserved_qty_for_production_plan,
+			bin.last_posting_datetime,
+			bin.last_stock_reco_datetime,
+		)
+		.where(bin.name.isin(sorted(bin_deltas)))
+		.orderby(bin.name)
+		.for_update()
+	).run(as_dict=True)
+
+	for bin_details in bins:
+		delta = bin_deltas[bin_details.name]
+		values = delta["values"]
+
+		for fieldname in BIN_MAX_FIELDS:
+			if delta[fieldname] and (not bin_details[fieldname] or bin_details[fieldname] < delta[fieldname]):
+				values[fieldname] = delta[fieldname]
+
+		# actual qty is not up to date in case of backdated transaction
+		if delta.future_sle_exists:
+			values["actual_qty"] = get_actual_qty(delta.item_code, delta.warehouse)
+
+		# values set inside the block count in the projected qty
+		bin_details.update(values)
+
+		set_bin_qty(bin_details.name, bin_details, bin_details.actual_qty or 0.0, delta, values)
+
+	bin_deltas.clear()
+
+
+def update_bin_values(bin_name, item_code, warehouse, values):
+	"""Write absolute values like the valuation from the stock ledger to the Bin. Inside
+	`coalesced_bin_updates` they are written with the other updates of the Bin when the block exits."""
+	bin_deltas = getattr(frappe.local, "bin_deltas", None)
+	if bin_deltas is not None:
+		get_bin_delta(bin_deltas, bin_name, item_code, warehouse)["values"].update(values)
+		return
+
+	frappe.db.set_value("Bin", bin_name, values, update_modified=True)
+
+
+def update_last_posting_datetime(sle):
+	"""Move the latest posting datetime of the Bin forward to the posting datetime of the Stock Ledger Entry"""
+	from erpnext.stock.utils import get_or_make_bin
+
+	bin_name = get_or_make_bin(sle.item_code, sle.warehouse)
+
+	bin_deltas = getattr(frappe.local, "bin_deltas", None)
+	if bin_deltas is not None:
+		delta = get_bin_delta(bin_deltas, bin_name, sle.item_code, sle.warehouse)
+		posting_datetime = get_datetime(sle.posting_datetime)
+		fieldnames = ["last_posting_datetime"]
+		if sle.voucher_type == "Stock Reconciliation":
+			fieldnames.append("last_stock_reco_datetime")
+
+		for fieldname in fieldnames:
+			if not delta[fieldname] or delta[fieldname] < posting_datetime:
+				delta[fieldname] = posting_datetime
+		return
+
+	bin = frappe.qb.DocType("Bin")
+	fields = [bin.last_posting_datetime]
+	if sle.voucher_type == "Stock Reconciliation":
+		fields.append(bin.last_stock_reco_datetime)
+
+	for field in fields:
+		(
+			frappe.qb.update(bin)
+			.set(field, sle.posting_datetime)
+			.where((bin.name == bin_name) & (field.isnull() | (field < sle.posting_datetime)))
+		).run()
+
+
+def get_last_posting_datetimes(items_and_warehouses):
+	"""Latest posting datetime of the Stock Ledger Entries and of the Stock Reconciliations
+	per item and warehouse. Items and warehouses without a Bin don't have any entries.
+
+	Cancelled entries aren't removed from it, so it is the latest datetime an entry can exist on."""
+	items_and_warehouses = set(items_and_warehouses)
+	if not items_and_warehouses:
+		return {}
+
+	bin = frappe.qb.DocType("Bin")
+	bins = (
+		frappe.qb.from_(bin)
+		.select(bin.item_code, bin.warehouse, bin.last_posting_datetime, bin.last_stock_reco_datetime)
+		.where(
+			(bin.item_code.isin({item_code for item_code, _warehouse in items_and_warehouses}))
+			& (bin.warehouse.isin({warehouse for _item_code, warehouse in items_and_warehouses}))
+		)
+	).run(as_dict=True)
+
+	return {(d.item_code, d.warehouse): d for d in bins if (d.item_code, d.warehouse) in items_and_warehouses}
+
+
+def get_last_posting_datetime(item_code, warehouse):
+	return get_last_posting_datetimes([(item_code, warehouse)]).get((item_code, warehouse)) or frappe._dict()
+
+
 def get_actual_qty(item_code, warehouse):
 	sle = frappe.qb.DocType("Stock Ledger Entry")
 
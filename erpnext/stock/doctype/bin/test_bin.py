@@ -4,8 +4,14 @@
 import frappe
 from frappe.tests import IntegrationTestCase
 
+from erpnext.stock.doctype.bin.bin import (
+	coalesced_bin_updates,
+	update_bin_values,
+	update_last_posting_datetime,
+	update_qty,
+)
 from erpnext.stock.doctype.item.test_item import make_item
-from erpnext.stock.utils import _create_bin
+from erpnext.stock.utils import _create_bin, get_or_make_bin
 
 
 class TestBin(IntegrationTestCase):
@@ -32,3 +38,115 @@ class TestBin(IntegrationTestCase):
 		indexes = frappe.db.sql("show index from tabBin where Non_unique = 0", as_dict=1)
 		if not any(index.get("Key_name") == "unique_item_warehouse" for index in indexes):
 			self.fail("Expected unique index on item-warehouse")
+
+	def test_coalesced_bin_updates(self):
+		item_code = make_item("_TestCoalescedBin", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+		bin_name = get_or_make_bin(item_code, warehouse)
+		initial_ordered_qty = frappe.db.get_value("Bin", bin_name, "ordered_qty")
+
+		args = {
+			"item_code": item_code,
+			"warehouse": warehouse,
+			"voucher_type": "Stock Entry",
+			"voucher_no": "_Test Coalesced Bin",
+			"posting_date": frappe.utils.nowdate(),
+			"posting_time": frappe.utils.nowtime(),
+		}
+		with coalesced_bin_updates():
+			update_qty(bin_name, frappe._dict(args, ordered_qty=5))
+			update_qty(bin_name, frappe._dict(args, ordered_qty=3, reserved_qty=2))
+
+			# nothing is written until the block exits
+			self.assertEqual(frappe.db.get_value("Bin", bin_name, "ordered_qty"), initial_ordered_qty)
+
+		bin = frappe.get_doc("Bin", bin_name)
+		self.assertEqual(bin.ordered_qty, initial_ordered_qty + 8)
+		self.assertEqual(bin.projected_qty, bin.actual_qty + bin.ordered_qty - bin.reserved_qty)
+
+		frappe.db.rollback()
+
+	def test_coalesced_bin_values(self):
+		item_code = make_item("_TestCoalescedBinValues", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+		bin_name = get_or_make_bin(item_code, warehouse)
+
+		with coalesced_bin_updates():
+			# valuation from a repost and reserved qty are written along with the qty deltas
+			update_bin_values(bin_name, item_code, warehouse, {"actual_qty": 10, "stock_value": 500})
+			update_bin_values(bin_name, item_code, warehouse, {"actual_qty": 20, "stock_value": 1200})
+			frappe.get_doc("Bin", bin_name).db_set_qty({"reserved_qty_for_production": 4})
+
+			self.assertEqual(frappe.db.get_value("Bin", bin_name, "actual_qty"), 0)
+
+		bin = frappe.get_doc("Bin", bin_name)
+		self.assertEqual(bin.actual_qty, 20)
+		self.assertEqual(bin.stock_value, 1200)
+		self.assertEqual(bin.reserved_qty_for_production, 4)
+		self.assertEqual(bin.projected_qty, 16)
+
+		frappe.db.rollback()
+
+	def test_last_posting_datetime(self):
+		from erpnext.controllers.stock_controller import future_sle_exists
+		from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+		from erpnext.stock.utils import get_combine_datetime
+
+		item_code = make_item("_TestBinLastPosting", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+		today = frappe.utils.nowdate()
+
+		make_stock_entry(
+			item_code=item_code, target=warehouse, qty=10, rate=100, posting_date=today, posting_time="10:00"
+		)
+		backdated_entry = make_stock_entry(
+			item_code=item_code,
+			target=warehouse,
+			qty=5,
+			rate=100,
+			posting_date=frappe.utils.add_days(today, -2),
+			posting_time="10:00",
+		)
+
+		bin = frappe.get_doc("Bin", get_or_make_bin(item_code, warehouse))
+		self.assertEqual(bin.last_posting_datetime, get_combine_datetime(today, "10:00"))
+		self.assertIsNone(bin.last_stock_reco_datetime)
+
+		def has_future_sle(posting_date, posting_time):
+			frappe.local.future_sle = {}
+			args = frappe._dict(
+				voucher_type="Stock Entry",
+				voucher_no="_Test Bin Last Posting",
+				posting_date=posting_date,
+				posting_time=posting_time,
+			)
+			sl_entries = [frappe._dict(item_code=item_code, warehouse=warehouse)]
+			return future_sle_exists(args, sl_entries)
+
+		self.assertTrue(has_future_sle(backdated_entry.posting_date, "11:00"))
+		self.assertFalse(has_future_sle(today, "11:00"))
+
+		# bins created later pick the latest posting from the stock ledger
+		frappe.db.delete("Bin", bin.name)
+		bin = frappe.get_doc("Bin", get_or_make_bin(item_code, warehouse))
+		self.assertEqual(bin.last_posting_datetime, get_combine_datetime(today, "10:00"))
+
+		# the latest posting of the block is written once it exits, it never moves back
+		sle = frappe._dict(item_code=item_code, warehouse=warehouse, voucher_type="Stock Reconciliation")
+		with coalesced_bin_updates():
+			update_last_posting_datetime(sle.update(posting_datetime=get_combine_datetime(today, "12:00")))
+			update_last_posting_datetime(sle.update(posting_datetime=get_combine_datetime(today, "11:00")))
+
+			self.assertIsNone(frappe.db.get_value("Bin", bin.name, "last_stock_reco_datetime"))
+
+		bin.reload()
+		self.assertEqual(bin.last_posting_datetime, get_combine_datetime(today, "12:00"))
+		self.assertEqual(bin.last_stock_reco_datetime, get_combine_datetime(today, "12:00"))
+
+		with coalesced_bin_updates():
+			update_last_posting_datetime(sle.update(posting_datetime=get_combine_datetime(today, "09:00")))
+
+		bin.reload()
+		self.assertEqual(bin.last_posting_datetime, get_combine_datetime(today, "12:00"))
+
+		frappe.db.rollback()
@@ -218,7 +218,7 @@ class InventoryDimension(Document):
 			self.add_transfer_field(self.document_type, dimension_fields)
 			custom_fields.setdefault(self.document_type, dimension_fields)
 
-		for dt in ["Stock Ledger Entry", "Stock Closing Balance"]:
+		for dt in ["Stock Ledger Entry", "Stock Closing Balance", "Stock Balance Snapshot"]:
 			if (
 				dimension_fields
 				and not frappe.db.get_value("Custom Field", {"dt": dt, "fieldname": self.target_fieldname})
@@ -2,6 +2,7 @@
 # For license information, please see license.txt
 
 import json
+import time
 
 import frappe
 from frappe import _
@@ -9,21 +10,29 @@ from frappe.desk.form.load import get_attachments
 from frappe.exceptions import QueryDeadlockError, QueryTimeoutError
 from frappe.model.document import Document
 from frappe.query_builder import DocType, Interval
-from frappe.query_builder.functions import CombineDatetime, Max, Now
+from frappe.query_builder.functions import CombineDatetime, IfNull, Max, Now
 from frappe.utils import cint, get_link_to_form, get_weekday, getdate, now, nowtime
+from frappe.utils.background_jobs import is_job_enqueued
 from frappe.utils.user import get_users_with_role
 from rq.timeouts import JobTimeoutException
 
 import erpnext
 from erpnext.accounts.general_ledger import validate_accounting_period
 from erpnext.accounts.utils import get_future_stock_vouchers, repost_gle_for_stock_vouchers
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	invalidate_stock_balance_snapshot,
+)
 from erpnext.stock.stock_ledger import (
 	get_affected_transactions,
 	get_items_to_be_repost,
 	repost_future_sle,
 )
+from erpnext.stock.utils import get_combine_datetime
 
 RecoverableErrors = (JobTimeoutException, QueryDeadlockError, QueryTimeoutError)
+REPOSTING_COMPONENT_TIMEOUT = 1800
+# a component job stops picking the next repost after this many seconds and enqueues the rest
+REPOSTING_COMPONENT_TIME_BUDGET = 1200
 
 
 class RepostItemValuation(Document):
@@ -51,6 +60,7 @@ class RepostItemValuation(Document):
 		posting_time: DF.Time | None
 		recreate_stock_ledgers: DF.Check
 		repost_only_accounting_ledgers: DF.Check
+		reposting_checkpoint: DF.Code | None
 		reposting_data_file: DF.Attach | None
 		reposting_reference: DF.Data | None
 		status: DF.Literal["Queued", "In Progress", "Completed", "Skipped", "Failed", "Cancelled"]
@@ -235,6 +245,8 @@ class RepostItemValuation(Document):
 		        These flags are useful for asserting real time behaviour like quantity updates.
 		"""
 
+		invalidate_stock_balance_snapshot(self.company, self.posting_date)
+
 		if not frappe.in_test:
 			return
 		if self.flags.dont_run_in_test or frappe.flags.dont_execute_stock_reposts:
@@ -257,6 +269,7 @@ class RepostItemValuation(Document):
 	def restart_reposting(self):
 		self.set_status("Queued", write=False)
 		self.current_index = 0
+		self.reposting_checkpoint = None
 		self.distinct_item_and_warehouse = None
 		self.items_to_be_repost = None
 		self.gl_reposting_index = 0
@@ -370,6 +383,7 @@ def repost(doc):
 		repost_gl_entries(doc)
 
 		doc.set_status("Completed")
+		invalidate_stock_balance_snapshot(doc.company, doc.posting_date)
 		doc.db_set("reposting_data_file", None)
 		remove_attached_file(doc.name)
 
@@ -555,33 +569,241 @@ def run_parallel_reposting():
 	if not in_configured_timeslot():
 		return
 
-	items = set()
 	no_of_parallel_reposting = (
 		frappe.db.get_single_value("Stock Reposting Settings", "no_of_parallel_reposting") or 4
 	)
 
 	riv_entries = get_repost_item_valuation_entries()
 
-	for row in riv_entries:
+	item_wise_entries = {}
+	for idx, row in enumerate(riv_entries):
+		row.queue_position = idx
 		if row.based_on != "Item and Warehouse" or row.repost_only_accounting_ledgers:
 			execute_reposting_entry(row.name)
 			continue
 
-		if row.item_code in items:
+		item_wise_entries.setdefault(row.item_code, []).append(row)
+
+	if not item_wise_entries:
+		return
+
+	no_of_jobs = 0
+	for component in get_independent_reposting_components(item_wise_entries):
+		if no_of_jobs >= no_of_parallel_reposting:
+			break
+
+		if enqueue_reposting_component(component):
+			no_of_jobs += 1
+
+
+def enqueue_reposting_component(component):
+	if is_reposting_component_locked(component.items):
+		return False
+
+	job_id = get_reposting_component_job_id(component)
+	if is_job_enqueued(job_id):
+		return False
+
+	lock_reposting_component(component.items, job_id)
+	frappe.enqueue(
+		execute_reposting_component,
+		names=component.names,
+		items=component.items,
+		job_id=job_id,
+		queue="long",
+		timeout=REPOSTING_COMPONENT_TIMEOUT,
+	)
+	return True
+
+
+class RepostDependencyGraph:
+	"""Union-find over item codes.
+
+	Two items belong to the same component when reposting one of them can
+	change the valuation of the other, e.g. via a Repack or Manufacture entry.
+	Components can therefore be reposted concurrently without stepping on
+	each other's stock ledger entries.
+	"""
+
+	def __init__(self, items=None):
+		self.parent = {}
+		for item_code in items or []:
+			self.add_item(item_code)
+
+	def add_item(self, item_code):
+		self.parent.setdefault(item_code, item_code)
+
+	def find(self, item_code):
+		self.add_item(item_code)
+
+		root = item_code
+		while self.parent[root] != root:
+			root = self.parent[root]
+
+		# path compression
+		while self.parent[item_code] != root:
+			self.parent[item_code], item_code = root, self.parent[item_code]
+
+		return root
+
+	def link(self, items):
+		items = list(items)
+		if not items:
+			return
+
+		root = self.find(items[0])
+		for item_code in items[1:]:
+			other_root = self.find(item_code)
+			if other_root != root:
+				self.parent[other_root] = root
+
+	def get_components(self):
+		components = {}
+		for item_code in self.parent:
+			components.setdefault(self.find(item_code), []).append(item_code)
+
+		return list(components.values())
+
+
+def get_independent_reposting_components(item_wise_entries):
+	"""Partition queued item-wise reposts into components which can be reposted in parallel.
+
+	Returns a list of dicts with `items` and `names` (in reposting order), earliest component first."""
+
+	graph = RepostDependencyGraph(item_wise_entries)
+	from_datetime = min(
+		get_combine_datetime(row.posting_date, row.posting_time)
+		for rows in item_wise_entries.values()
+		for row in rows
+	)
+
+	for linked_items in get_linked_items_for_reposting(list(item_wise_entries), from_datetime):
+		graph.link(linked_items)
+
+	# preserve the queue order of the entries within and across components
+	order = {}
+	for rows in item_wise_entries.values():
+		for row in rows:
+			order[row.name] = row.queue_position
+
+	components = []
+	for items in graph.get_components():
+		names = [row.name for item_code in items for row in item_wise_entries.get(item_code, [])]
+		if not names:
 			continue
 
-		items.add(row.item_code)
-		if len(items) > no_of_parallel_reposting:
+		names.sort(key=lambda name: order[name])
+		components.append(frappe._dict(items=sorted(items), names=names))
+
+	components.sort(key=lambda component: order[component.names[0]])
+	return components
+
+
+def get_linked_items_for_reposting(items, from_datetime):
+	"""Get the groups of items which are linked through dependant stock ledger entries
+	(Repack / Manufacture entries, Subcontracting Receipts etc.) posted on or after
+	`from_datetime`, following the chain until no new items are found."""
+
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+
+	linked_items = []
+	visited_items = set()
+	visited_vouchers = set()
+	pending_items = set(items)
+
+	while pending_items:
+		visited_items.update(pending_items)
+
+		vouchers = (
+			frappe.qb.from_(sle)
+			.select(sle.voucher_type, sle.voucher_no)
+			.distinct()
+			.where(
+				(sle.is_cancelled == 0)
+				& (sle.posting_datetime >= from_datetime)
+				& (sle.item_code.isin(list(pending_items)))
+				& (IfNull(sle.dependant_sle_voucher_detail_no, "") != "")
+			)
+		).run()
+
+		vouchers = {voucher for voucher in vouchers if voucher not in visited_vouchers}
+		pending_items = set()
+		if not vouchers:
 			break
 
-		frappe.enqueue(
-			execute_reposting_entry,
-			name=row.name,
-			queue="long",
-			timeout=1800,
+		visited_vouchers.update(vouchers)
+
+		voucher_wise_items = {}
+		for row in (
+			frappe.qb.from_(sle)
+			.select(sle.voucher_type, sle.voucher_no, sle.item_code)
+			.distinct()
+			.where(
+				(sle.is_cancelled == 0)
+				& (sle.voucher_type.isin(list({voucher[0] for voucher in vouchers})))
+				& (sle.voucher_no.isin(list({voucher[1] for voucher in vouchers})))
+			)
+		).run(as_dict=True):
+			if (row.voucher_type, row.voucher_no) in vouchers:
+				voucher_wise_items.setdefault((row.voucher_type, row.voucher_no), set()).add(row.item_code)
+
+		for voucher_items in voucher_wise_items.values():
+			linked_items.append(voucher_items)
+			pending_items.update(voucher_items - visited_items)
+
+	return linked_items
+
+
+def get_reposting_component_job_id(component):
+	return f"repost_item_valuation::{component.names[0]}"
+
+
+def get_reposting_lock_key(item_code):
+	return f"repost_item_valuation_running_item:{item_code}"
+
+
+def is_reposting_component_locked(items):
+	return any(frappe.cache.get_value(get_reposting_lock_key(item_code)) for item_code in items)
+
+
+def lock_reposting_component(items, job_id):
+	for item_code in items:
+		frappe.cache.set_value(
+			get_reposting_lock_key(item_code), job_id, expires_in_sec=REPOSTING_COMPONENT_TIMEOUT
 		)
 
 
+def unlock_reposting_component(items):
+	for item_code in items:
+		frappe.cache.delete_value(get_reposting_lock_key(item_code))
+
+
+def execute_reposting_component(names, items):
+	"""Drain the reposts of one independent component, in order.
+
+	Once `REPOSTING_COMPONENT_TIME_BUDGET` is spent, the remaining reposts are handed over to
+	a new job instead of running into the job timeout, which would start the component over."""
+
+	started_at = time.monotonic()
+	remaining_names = []
+	try:
+		for idx, name in enumerate(names):
+			execute_reposting_entry(name)
+
+			if frappe.db.get_value("Repost Item Valuation", name, "status") not in ("Completed", "Skipped"):
+				# later entries depend on this one, retry the rest in the next run
+				break
+
+			if time.monotonic() - started_at > REPOSTING_COMPONENT_TIME_BUDGET:
+				remaining_names = names[idx + 1 :]
+				break
+	finally:
+		unlock_reposting_component(items)
+
+	if remaining_names:
+		enqueue_reposting_component(frappe._dict(items=items, names=remaining_names))
+
+
 def repost_entries():
 	# This function is called every hour via hooks.py
 
@@ -617,7 +839,14 @@ def get_repost_item_valuation_entries():
 
 	query = (
 		frappe.qb.from_(doctype)
-		.select(doctype.name, doctype.based_on, doctype.item_code, doctype.repost_only_accounting_ledgers)
+		.select(
+			doctype.name,
+			doctype.based_on,
+			doctype.item_code,
+			doctype.posting_date,
+			doctype.posting_time,
+			doctype.repost_only_accounting_ledgers,
+		)
 		.where(
 			(doctype.status.isin(["Queued", "In Progress"]))
 			& (doctype.creation <= now())
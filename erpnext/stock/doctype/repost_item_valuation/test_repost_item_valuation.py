@@ -2,7 +2,7 @@
 # See license.txt
 
 
-from unittest.mock import MagicMock, call
+from unittest.mock import MagicMock, call, patch
 
 import frappe
 from frappe.tests import IntegrationTestCase
@@ -14,6 +14,9 @@ from erpnext.controllers.stock_controller import create_item_wise_repost_entries
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.purchase_receipt.test_purchase_receipt import make_purchase_receipt
 from erpnext.stock.doctype.repost_item_valuation.repost_item_valuation import (
+	RepostDependencyGraph,
+	execute_reposting_component,
+	get_independent_reposting_components,
 	in_configured_timeslot,
 )
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
@@ -456,3 +459,234 @@ class TestRepostItemValuation(IntegrationTestCase, StockTestMixin):
 						"name",
 					)
 				)
+
+	def test_repost_dependency_graph(self):
+		graph = RepostDependencyGraph(["A", "B", "C", "D"])
+		graph.link(["A", "B"])
+		graph.link(["B", "E"])
+
+		components = sorted(sorted(component) for component in graph.get_components())
+		self.assertEqual(components, [["A", "B", "E"], ["C"], ["D"]])
+
+	def test_independent_reposting_components_for_repack(self):
+		from erpnext.stock.doctype.warehouse.test_warehouse import create_warehouse
+
+		raw_item = make_item("_Test RIV Component Raw Item", properties={"is_stock_item": 1}).name
+		fg_item = make_item("_Test RIV Component FG Item", properties={"is_stock_item": 1}).name
+		other_item = make_item("_Test RIV Component Other Item", properties={"is_stock_item": 1}).name
+		warehouse = create_warehouse("_Test RIV Component Warehouse", company="_Test Company")
+
+		posting_date = add_days(today(), -5)
+		for item_code in (raw_item, other_item):
+			make_stock_entry(
+				item_code=item_code,
+				qty=10,
+				rate=100,
+				to_warehouse=warehouse,
+				purpose="Material Receipt",
+				posting_date=posting_date,
+			)
+
+		repack = make_stock_entry(
+			item_code=raw_item,
+			qty=10,
+			from_warehouse=warehouse,
+			purpose="Repack",
+			posting_date=add_days(today(), -4),
+			do_not_save=True,
+		)
+		repack.append(
+			"items",
+			{
+				"item_code": fg_item,
+				"qty": 10,
+				"t_warehouse": warehouse,
+				"transfer_qty": 10,
+				"uom": "Nos",
+				"stock_uom": "Nos",
+				"conversion_factor": 1.0,
+			},
+		)
+		repack.save()
+		repack.submit()
+
+		def riv_row(name, item_code, position):
+			return frappe._dict(
+				name=name,
+				item_code=item_code,
+				posting_date=posting_date,
+				posting_time="00:00:00",
+				queue_position=position,
+			)
+
+		components = get_independent_reposting_components(
+			{
+				raw_item: [riv_row("RIV-1", raw_item, 0)],
+				other_item: [riv_row("RIV-2", other_item, 1)],
+				fg_item: [riv_row("RIV-3", fg_item, 2)],
+			}
+		)
+
+		self.assertEqual(len(components), 2)
+		self.assertEqual(components[0].names, ["RIV-1", "RIV-3"])
+		self.assertEqual(components[0].items, sorted([raw_item, fg_item]))
+		self.assertEqual(components[1].names, ["RIV-2"])
+
+	def test_reposting_component_time_budget(self):
+		module = "erpnext.stock.doctype.repost_item_valuation.repost_item_valuation"
+		with (
+			patch(f"{module}.REPOSTING_COMPONENT_TIME_BUDGET", -1),
+			patch(f"{module}.execute_reposting_entry") as execute_entry,
+			patch(f"{module}.enqueue_reposting_component") as enqueue_component,
+			patch.object(frappe.db, "get_value", return_value="Completed"),
+		):
+			execute_reposting_component(["RIV-1", "RIV-2", "RIV-3"], ["_Test Item"])
+
+		# the rest of the component is handed over to a new job after the first repost
+		execute_entry.assert_called_once_with("RIV-1")
+		enqueue_component.assert_called_once_with(
+			frappe._dict(items=["_Test Item"], names=["RIV-2", "RIV-3"])
+		)
+
+	@IntegrationTestCase.change_settings("Stock Reposting Settings", {"reposting_page_size": 2})
+	def test_paginated_reposting(self):
+		from erpnext.stock.doctype.warehouse.test_warehouse import create_warehouse
+
+		item_code = make_item(
+			"_Test Paginated Reposting Item", properties={"is_stock_item": 1, "valuation_method": "FIFO"}
+		).name
+		warehouse = create_warehouse("_Test Paginated Reposting Warehouse", company="_Test Company")
+
+		entries = []
+		for days, purpose, rate in (
+			(-6, "Material Receipt", 100),
+			(-5, "Material Issue", 0),
+			(-4, "Material Receipt", 120),
+			(-3, "Material Issue", 0),
+			(-2, "Material Receipt", 140),
+		):
+			entries.append(
+				make_stock_entry(
+					item_code=item_code,
+					qty=5,
+					rate=rate or None,
+					to_warehouse=warehouse if purpose == "Material Receipt" else None,
+					from_warehouse=warehouse if purpose == "Material Issue" else None,
+					purpose=purpose,
+					posting_date=add_days(today(), days),
+				)
+			)
+
+		# backdated receipt before all the entries, reposts every future entry page-wise
+		backdated_entry = make_stock_entry(
+			item_code=item_code,
+			qty=10,
+			rate=50,
+			to_warehouse=warehouse,
+			purpose="Material Receipt",
+			posting_date=add_days(today(), -7),
+		)
+
+		checkpoints = frappe.get_all(
+			"Repost Item Valuation",
+			filters={"docstatus": 1},
+			or_filters={"voucher_no": backdated_entry.name, "item_code": item_code},
+			pluck="reposting_checkpoint",
+		)
+		self.assertTrue(checkpoints)
+		self.assertFalse(any(checkpoints))
+
+		# FIFO: 10 @ 50, +5 @ 100, -5, +5 @ 120, -5, +5 @ 140
+		self.assertSLEs(entries[0], [{"qty_after_transaction": 15, "stock_value": 1000}])
+		self.assertSLEs(entries[1], [{"qty_after_transaction": 10, "stock_value": 750}])
+		self.assertSLEs(entries[2], [{"qty_after_transaction": 15, "stock_value": 1350}])
+		self.assertSLEs(entries[3], [{"qty_after_transaction": 10, "stock_value": 1100}])
+		self.assertSLEs(entries[4], [{"qty_after_transaction": 15, "stock_value": 1800}])
+
+		bin_qty, bin_value = frappe.db.get_value(
+			"Bin", {"item_code": item_code, "warehouse": warehouse}, ["actual_qty", "stock_value"]
+		)
+		self.assertEqual(bin_qty, 15)
+		self.assertEqual(bin_value, 1800)
+
+	@IntegrationTestCase.change_settings("Stock Reposting Settings", {"reposting_page_size": 50})
+	def test_paginated_reposting_with_return_and_repack(self):
+		from erpnext.stock.doctype.warehouse.test_warehouse import create_warehouse
+
+		item_code = make_item(
+			"_Test Paginated Reposting MA Item",
+			properties={"is_stock_item": 1, "valuation_method": "Moving Average"},
+		).name
+		fg_item = make_item("_Test Paginated Reposting FG Item", properties={"is_stock_item": 1}).name
+		warehouse = create_warehouse("_Test Paginated Reposting Warehouse", company="_Test Company")
+
+		make_stock_entry(
+			item_code=item_code,
+			qty=10,
+			rate=100,
+			to_warehouse=warehouse,
+			purpose="Material Receipt",
+			posting_date=add_days(today(), -6),
+		)
+		pr = make_purchase_receipt(
+			item_code=item_code, qty=10, rate=200, warehouse=warehouse, posting_date=add_days(today(), -5)
+		)
+		purchase_return = make_purchase_receipt(
+			item_code=item_code,
+			qty=-2,
+			rate=200,
+			warehouse=warehouse,
+			is_return=1,
+			return_against=pr.name,
+			posting_date=add_days(today(), -4),
+		)
+
+		repack = make_stock_entry(
+			item_code=item_code,
+			qty=5,
+			from_warehouse=warehouse,
+			purpose="Repack",
+			posting_date=add_days(today(), -3),
+			do_not_save=True,
+		)
+		repack.append(
+			"items",
+			{
+				"item_code": fg_item,
+				"qty": 5,
+				"t_warehouse": warehouse,
+				"transfer_qty": 5,
+				"uom": "Nos",
+				"stock_uom": "Nos",
+				"conversion_factor": 1.0,
+			},
+		)
+		repack.save()
+		repack.submit()
+
+		# backdated receipt reposts the receipt, the return and the repack within one page
+		make_stock_entry(
+			item_code=item_code,
+			qty=10,
+			rate=50,
+			to_warehouse=warehouse,
+			purpose="Material Receipt",
+			posting_date=add_days(today(), -7),
+		)
+
+		def get_sle(voucher_no, item):
+			return frappe.db.get_value(
+				"Stock Ledger Entry",
+				{"voucher_no": voucher_no, "item_code": item, "is_cancelled": 0},
+				["valuation_rate", "incoming_rate"],
+				as_dict=True,
+			)
+
+		# 10 @ 50, +10 @ 100, +10 @ 200, the return and the repack go out at the valuation rate
+		valuation_rate = get_sle(pr.name, item_code).valuation_rate
+		self.assertAlmostEqual(valuation_rate, 350 / 3, places=2)
+		self.assertAlmostEqual(
+			get_sle(purchase_return.name, item_code).valuation_rate, valuation_rate, places=2
+		)
+		self.assertAlmostEqual(get_sle(repack.name, item_code).valuation_rate, valuation_rate, places=2)
+		self.assertAlmostEqual(get_sle(repack.name, fg_item).incoming_rate, valuation_rate, places=2)
@@ -26,6 +26,10 @@ from frappe.utils import (
 )
 from frappe.utils.csvutils import build_csv_response
 
+from erpnext.stock.doctype.batch_warehouse_balance.batch_warehouse_balance import (
+	get_batch_warehouse_balances,
+	is_batch_warehouse_balance_built,
+)
 from erpnext.stock.serial_batch_bundle import (
 	BatchNoValuation,
 	SerialNoValuation,
@@ -2845,6 +2849,9 @@ def update_available_batches(available_batches, *reserved_batches) -> None:
 
 
 def get_available_batches(kwargs):
+	if not kwargs.get("ignore_voucher_nos") and is_batch_warehouse_balance_built():
+		return get_batch_warehouse_balances(kwargs)
+
 	stock_ledger_entry = frappe.qb.DocType("Stock Ledger Entry")
 	batch_ledger = frappe.qb.DocType("Serial and Batch Entry")
 	batch_table = frappe.qb.DocType("Batch")
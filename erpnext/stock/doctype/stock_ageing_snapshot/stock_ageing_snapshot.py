@@ -0,0 +1,129 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import json
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import flt, get_datetime, now
+from pypika.terms import ExistsCriterion
+
+
+class StockAgeingSnapshot(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		company: DF.Link | None
+		fifo_queue: DF.LongText | None
+		item_code: DF.Link | None
+		posting_date: DF.Date | None
+		qty_after_transaction: DF.Float
+		serial_no_purchase_details: DF.LongText | None
+		stock_closing_entry: DF.Link | None
+		total_qty: DF.Float
+		valuation_rate: DF.Currency
+		warehouse: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Stock Ageing Snapshot", ["stock_closing_entry", "item_code"])
+
+
+def get_stock_ageing_snapshot_entry(company, to_date):
+	"""Returns the latest completed Stock Closing Entry till the date with FIFO slots persisted,
+	Stock Ageing replays only the Stock Ledger Entries posted after its to date"""
+	closing_entry = frappe.qb.DocType("Stock Closing Entry")
+	snapshot = frappe.qb.DocType("Stock Ageing Snapshot")
+
+	entries = (
+		frappe.qb.from_(closing_entry)
+		.select(closing_entry.name, closing_entry.to_date)
+		.where(
+			(closing_entry.company == company)
+			& (closing_entry.docstatus == 1)
+			& (closing_entry.status == "Completed")
+			& (closing_entry.to_date <= to_date)
+			& ExistsCriterion(
+				frappe.qb.from_(snapshot)
+				.select(snapshot.name)
+				.where(snapshot.stock_closing_entry == closing_entry.name)
+			)
+		)
+		.orderby(closing_entry.to_date, order=frappe.qb.desc)
+		.orderby(closing_entry.creation, order=frappe.qb.desc)
+		.limit(1)
+	).run(as_dict=True)
+
+	if entries:
+		entries[0].upto = get_datetime(f"{entries[0].to_date} 23:59:59")
+		return entries[0]
+
+
+def create_stock_ageing_snapshot(stock_closing_entry):
+	"""Persist the FIFO slots of every item and warehouse of the company till the to date of the
+	Stock Closing Entry, in the order in which they were first transacted"""
+	from erpnext.stock.report.stock_ageing.stock_ageing import FIFOSlots
+
+	doc = frappe.get_doc("Stock Closing Entry", stock_closing_entry)
+	frappe.db.delete("Stock Ageing Snapshot", {"stock_closing_entry": doc.name})
+
+	fifo_slots = FIFOSlots(
+		frappe._dict(company=doc.company, to_date=str(doc.to_date), show_warehouse_wise_stock=1)
+	)
+	item_details = fifo_slots.generate()
+
+	fields = [
+		"name",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+		"idx",
+		"company",
+		"stock_closing_entry",
+		"posting_date",
+		"item_code",
+		"warehouse",
+		"qty_after_transaction",
+		"total_qty",
+		"valuation_rate",
+		"fifo_queue",
+		"serial_no_purchase_details",
+	]
+	timestamp = now()
+
+	values = []
+	for idx, ((item_code, warehouse), row) in enumerate(item_details.items(), start=1):
+		values.append(
+			(
+				frappe.generate_hash(length=10),
+				timestamp,
+				timestamp,
+				"Administrator",
+				"Administrator",
+				idx,
+				doc.company,
+				doc.name,
+				doc.to_date,
+				item_code,
+				warehouse,
+				flt(row.get("qty_after_transaction")),
+				flt(row.get("total_qty")),
+				flt(row["details"].valuation_rate),
+				json.dumps(row["fifo_queue"], default=str),
+				json.dumps(
+					fifo_slots.key_wise_serial_no_purchase_details.get((item_code, warehouse), {}),
+					default=str,
+				),
+			)
+		)
+
+	frappe.db.bulk_insert("Stock Ageing Snapshot", fields=fields, values=values)
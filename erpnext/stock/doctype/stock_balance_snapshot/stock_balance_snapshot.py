@@ -0,0 +1,439 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import json
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Case
+from frappe.query_builder.functions import Min, Sum
+from frappe.utils import add_days, cint, create_batch, flt, get_datetime, getdate, now, today
+
+from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
+
+# number of days of Stock Ledger Entry aggregated and committed at a time while building the snapshot
+SNAPSHOT_BUILD_WINDOW = 31
+
+
+class StockBalanceSnapshot(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		company: DF.Link | None
+		in_qty: DF.Float
+		in_val: DF.Currency
+		is_opening_voucher: DF.Check
+		item_code: DF.Link | None
+		out_qty: DF.Float
+		out_val: DF.Currency
+		posting_date: DF.Date | None
+		warehouse: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index("Stock Balance Snapshot", ["company", "posting_date"])
+
+
+def is_stock_balance_snapshot_enabled():
+	return frappe.get_single_value("Stock Settings", "use_stock_balance_snapshot")
+
+
+def get_snapshot_state(company):
+	"""Returns the date till which the snapshot of the company is complete, the time its last build
+	started and the inventory dimensions it was built with"""
+	state = frappe.db.get_default(get_snapshot_state_key(company))
+	if state:
+		return frappe._dict(json.loads(state))
+
+
+def set_snapshot_state(company, upto, built_at, dimensions):
+	frappe.db.set_default(
+		get_snapshot_state_key(company),
+		json.dumps({"upto": str(upto), "built_at": str(built_at), "dimensions": dimensions}),
+	)
+
+
+def get_snapshot_state_key(company):
+	return f"stock_balance_snapshot::{company}"
+
+
+def get_snapshot_dimensions():
+	return [dimension.fieldname for dimension in get_inventory_dimensions()]
+
+
+def get_stock_balance_snapshot_date(company=None, to_date=None):
+	"""Returns the date till which Stock Balance Snapshot can be read instead of Stock Ledger Entry.
+
+	Without a company, the snapshots of all the companies must be usable."""
+	if not is_stock_balance_snapshot_enabled():
+		return
+
+	companies = [company] if company else frappe.get_all("Company", pluck="name")
+	dimensions = get_snapshot_dimensions()
+
+	snapshot_date = getdate(to_date) if to_date else None
+	for company in companies:
+		state = get_snapshot_state(company)
+		if not state or not state.upto or state.dimensions != dimensions:
+			return
+
+		if not snapshot_date or getdate(state.upto) < snapshot_date:
+			snapshot_date = getdate(state.upto)
+
+	return snapshot_date
+
+
+def get_stock_balance_snapshot_query(company=None, to_date=None):
+	"""Returns the snapshot date, the Stock Balance Snapshot table and a query on it for the
+	movements till that date, or (None, None, None) if the snapshot can not be used.
+
+	Stock reports read the movements till the snapshot date from this query and select
+	only the Stock Ledger Entries posted after it."""
+	snapshot_date = get_stock_balance_snapshot_date(company, to_date)
+	if not snapshot_date:
+		return None, None, None
+
+	snapshot = frappe.qb.DocType("Stock Balance Snapshot")
+	query = frappe.qb.from_(snapshot).where(snapshot.posting_date <= snapshot_date)
+	if company:
+		query = query.where(snapshot.company == company)
+
+	return snapshot_date, snapshot, query
+
+
+def invalidate_stock_balance_snapshot(company, posting_date):
+	"""Exclude the snapshot from the posting date of a back dated entry or repost till it is rebuilt"""
+	state = get_snapshot_state(company)
+	if state and state.upto and getdate(posting_date) <= getdate(state.upto):
+		set_snapshot_state(company, add_days(posting_date, -1), state.built_at, state.dimensions)
+
+
+def invalidate_stock_balance_snapshot_of_entries(sl_entries):
+	"""Invalidate the snapshot once per company for the earliest posting date of the entries of a voucher"""
+	earliest_posting_dates = {}
+	for sle in sl_entries:
+		company = sle.get("company") or frappe.get_cached_value("Warehouse", sle.get("warehouse"), "company")
+		posting_date = getdate(sle.get("posting_date"))
+		if company not in earliest_posting_dates or posting_date < earliest_posting_dates[company]:
+			earliest_posting_dates[company] = posting_date
+
+	for company, posting_date in earliest_posting_dates.items():
+		invalidate_stock_balance_snapshot(company, posting_date)
+
+
+def reset_stock_balance_snapshot(company):
+	frappe.db.delete("Stock Balance Snapshot", {"company": company})
+	frappe.db.set_default(get_snapshot_state_key(company), None)
+
+
+def update_stock_balance_snapshots():
+	"""Scheduled job to extend the snapshot of every company till yesterday"""
+	if not is_stock_balance_snapshot_enabled():
+		return
+
+	for company in frappe.get_all("Company", pluck="name"):
+		build_stock_balance_snapshot(company)
+
+
+def build_stock_balance_snapshot(company, upto=None):
+	upto = getdate(upto or add_days(today(), -1))
+
+	# entries from the posting date of a pending repost are yet to be revalued
+	if repost_date := get_earliest_pending_repost_date(company):
+		upto = min(upto, getdate(add_days(repost_date, -1)))
+
+	dimensions = get_snapshot_dimensions()
+	state = get_snapshot_state(company)
+	if not state or state.dimensions != dimensions:
+		reset_stock_balance_snapshot(company)
+		state = frappe._dict()
+
+	if state.upto:
+		# back dated entries and reposts completed while the previous build was running
+		backdated_posting_date = get_earliest_backdated_posting_date(company, state.upto, state.built_at)
+		if backdated_posting_date:
+			state.upto = add_days(backdated_posting_date, -1)
+
+		from_date = add_days(state.upto, 1)
+	else:
+		from_date = get_earliest_posting_date(company)
+
+	built_at = now()
+	if not from_date or getdate(from_date) > upto:
+		set_snapshot_state(company, state.upto or upto, built_at, dimensions)
+		return
+
+	snapshot = frappe.qb.DocType("Stock Balance Snapshot")
+	frappe.qb.from_(snapshot).delete().where(
+		(snapshot.company == company) & (snapshot.posting_date >= from_date)
+	).run()
+
+	from_date = getdate(from_date)
+	while from_date <= upto:
+		to_date = min(add_days(from_date, SNAPSHOT_BUILD_WINDOW - 1), upto)
+		insert_snapshot_rows(company, from_date, to_date, dimensions)
+
+		current_state = get_snapshot_state(company)
+		if current_state and current_state.upto and getdate(current_state.upto) < add_days(from_date, -1):
+			# a back dated entry was posted meanwhile, next build will continue from there
+			break
+
+		set_snapshot_state(company, to_date, built_at, dimensions)
+		if not frappe.in_test:
+			frappe.db.commit()  # nosemgrep
+		from_date = add_days(to_date, 1)
+
+
+def get_earliest_posting_date(company):
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	result = frappe.qb.from_(sle).select(Min(sle.posting_date)).where(sle.company == company).run()
+
+	return result[0][0] if result else None
+
+
+def get_earliest_pending_repost_date(company):
+	riv = frappe.qb.DocType("Repost Item Valuation")
+	result = (
+		frappe.qb.from_(riv)
+		.select(Min(riv.posting_date))
+		.where((riv.company == company) & (riv.docstatus == 1) & (riv.status.isin(["Queued", "In Progress"])))
+	).run()
+
+	return result[0][0] if result else None
+
+
+def get_earliest_backdated_posting_date(company, upto, modified_after):
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	riv = frappe.qb.DocType("Repost Item Valuation")
+	modified_after = get_datetime(modified_after)
+
+	posting_dates = [
+		frappe.qb.from_(sle)
+		.select(Min(sle.posting_date))
+		.where((sle.company == company) & (sle.posting_date <= upto) & (sle.modified >= modified_after))
+		.run()[0][0],
+		frappe.qb.from_(riv)
+		.select(Min(riv.posting_date))
+		.where(
+			(riv.company == company)
+			& (riv.docstatus == 1)
+			& (riv.posting_date <= upto)
+			& (riv.modified >= modified_after)
+		)
+		.run()[0][0],
+	]
+
+	posting_dates = [getdate(posting_date) for posting_date in posting_dates if posting_date]
+	return min(posting_dates) if posting_dates else None
+
+
+def insert_snapshot_rows(company, from_date, to_date, dimensions):
+	"""Aggregate the movements of Stock Ledger Entry of a date range per day, item, warehouse and
+	inventory dimensions the way Stock Balance report classifies them"""
+	float_precision = cint(frappe.db.get_default("float_precision")) or 3
+	opening_vouchers = get_opening_vouchers(company, from_date, to_date)
+
+	# stock reconciliation entries carry the qty after transaction, the change needs the running balance
+	balance_qty = get_balance_qty_before(
+		company, from_date, get_reconciled_item_warehouses(company, from_date, to_date)
+	)
+
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	query = (
+		frappe.qb.from_(sle)
+		.select(
+			sle.item_code,
+			sle.warehouse,
+			sle.posting_date,
+			sle.voucher_type,
+			sle.voucher_no,
+			sle.actual_qty,
+			sle.qty_after_transaction,
+			sle.stock_value_difference,
+			sle.batch_no,
+			sle.serial_no,
+			sle.serial_and_batch_bundle,
+			*[sle[dimension] for dimension in dimensions],
+		)
+		.where(
+			(sle.company == company)
+			& (sle.docstatus < 2)
+			& (sle.is_cancelled == 0)
+			& (sle.posting_date >= from_date)
+			& (sle.posting_date <= to_date)
+		)
+		.orderby(sle.item_code)
+		.orderby(sle.warehouse)
+		.orderby(sle.posting_datetime)
+		.orderby(sle.creation)
+	)
+
+	snapshot_rows = {}
+	with frappe.db.unbuffered_cursor():
+		for entry in query.run(as_dict=True, as_iterator=True):
+			item_warehouse = (entry.item_code, entry.warehouse)
+			if entry.voucher_type == "Stock Reconciliation" and not (
+				entry.batch_no or entry.serial_no or entry.serial_and_batch_bundle
+			):
+				qty_diff = flt(entry.qty_after_transaction) - flt(balance_qty.get(item_warehouse))
+			else:
+				qty_diff = flt(entry.actual_qty)
+
+			if item_warehouse in balance_qty:
+				balance_qty[item_warehouse] = flt(balance_qty[item_warehouse]) + qty_diff
+
+			is_opening_voucher = cint((entry.voucher_type, entry.voucher_no) in opening_vouchers)
+			key = (
+				entry.item_code,
+				entry.warehouse,
+				entry.posting_date,
+				is_opening_voucher,
+				*[entry.get(dimension) for dimension in dimensions],
+			)
+
+			row = snapshot_rows.setdefault(
+				key, {"in_qty": 0.0, "out_qty": 0.0, "in_val": 0.0, "out_val": 0.0}
+			)
+			if flt(qty_diff, float_precision) >= 0:
+				row["in_qty"] += qty_diff
+			else:
+				row["out_qty"] += abs(qty_diff)
+
+			value_diff = flt(entry.stock_value_difference)
+			if flt(value_diff, float_precision) >= 0:
+				row["in_val"] += value_diff
+			else:
+				row["out_val"] += abs(value_diff)
+
+	if not snapshot_rows:
+		return
+
+	fields = [
+		"name",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+		"company",
+		"item_code",
+		"warehouse",
+		"posting_date",
+		"is_opening_voucher",
+		*dimensions,
+		"in_qty",
+		"out_qty",
+		"in_val",
+		"out_val",
+	]
+	timestamp = now()
+
+	values = []
+	for key, row in snapshot_rows.items():
+		values.append(
+			(
+				frappe.generate_hash(length=10),
+				timestamp,
+				timestamp,
+				"Administrator",
+				"Administrator",
+				company,
+				*key,
+				row["in_qty"],
+				row["out_qty"],
+				row["in_val"],
+				row["out_val"],
+			)
+		)
+
+	frappe.db.bulk_insert("Stock Balance Snapshot", fields=fields, values=values)
+
+
+def get_opening_vouchers(company, from_date, to_date):
+	opening_vouchers = set()
+
+	for doctype, condition in (
+		("Stock Entry", {"is_opening": "Yes"}),
+		("Stock Reconciliation", {"purpose": "Opening Stock"}),
+	):
+		names = frappe.get_all(
+			doctype,
+			filters={
+				"company": company,
+				"docstatus": 1,
+				"posting_date": ("between", [from_date, to_date]),
+				**condition,
+			},
+			pluck="name",
+		)
+		opening_vouchers.update((doctype, name) for name in names)
+
+	return opening_vouchers
+
+
+def get_reconciled_item_warehouses(company, from_date, to_date):
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	return (
+		frappe.qb.from_(sle)
+		.select(sle.item_code, sle.warehouse)
+		.distinct()
+		.where(
+			(sle.company == company)
+			& (sle.voucher_type == "Stock Reconciliation")
+			& (sle.is_cancelled == 0)
+			& (sle.posting_date >= from_date)
+			& (sle.posting_date <= to_date)
+		)
+	).run()
+
+
+def get_balance_qty_before(company, posting_date, item_warehouses):
+	"""Balance qty of the item warehouses from the snapshot rows before the posting date"""
+	if not item_warehouses:
+		return {}
+
+	balance_qty = {tuple(item_warehouse): 0.0 for item_warehouse in item_warehouses}
+	snapshot = frappe.qb.DocType("Stock Balance Snapshot")
+
+	for item_codes in create_batch(list({d[0] for d in item_warehouses}), 1000):
+		query = (
+			frappe.qb.from_(snapshot)
+			.select(snapshot.item_code, snapshot.warehouse, Sum(snapshot.in_qty - snapshot.out_qty))
+			.where(
+				(snapshot.company == company)
+				& (snapshot.posting_date < posting_date)
+				& (snapshot.item_code.isin(item_codes))
+			)
+			.groupby(snapshot.item_code, snapshot.warehouse)
+		)
+
+		for item_code, warehouse, qty in query.run():
+			if (item_code, warehouse) in balance_qty:
+				balance_qty[(item_code, warehouse)] = flt(qty)
+
+	return balance_qty
+
+
+def get_snapshot_movement_columns(snapshot, from_date):
+	"""Opening and in/out movements of the snapshot rows for a report starting from the from date"""
+	is_opening = (snapshot.posting_date < from_date) | (snapshot.is_opening_voucher == 1)
+
+	def movement(expression, opening):
+		condition = is_opening if opening else ~is_opening
+		return Sum(Case().when(condition, expression).else_(0))
+
+	return [
+		movement(snapshot.in_qty - snapshot.out_qty, True).as_("opening_qty"),
+		movement(snapshot.in_val - snapshot.out_val, True).as_("opening_val"),
+		movement(snapshot.in_qty, False).as_("in_qty"),
+		movement(snapshot.out_qty, False).as_("out_qty"),
+		movement(snapshot.in_val, False).as_("in_val"),
+		movement(snapshot.out_val, False).as_("out_val"),
+	]
@@ -11,6 +11,7 @@ from frappe.utils import add_days, get_date_str, get_link_to_form, nowtime, pars
 from frappe.utils.background_jobs import enqueue
 
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
+from erpnext.stock.doctype.stock_ageing_snapshot.stock_ageing_snapshot import create_stock_ageing_snapshot
 
 
 class StockClosingEntry(Document):
@@ -91,6 +92,7 @@ class StockClosingEntry(Document):
 	def remove_stock_closing(self):
 		table = frappe.qb.DocType("Stock Closing Balance")
 		frappe.qb.from_(table).delete().where(table.stock_closing_entry == self.name).run()
+		frappe.db.delete("Stock Ageing Snapshot", {"stock_closing_entry": self.name})
 
 	@frappe.whitelist()
 	def enqueue_job(self):
@@ -131,6 +133,8 @@ class StockClosingEntry(Document):
 			new_doc.company = self.company
 			new_doc.save()
 
+		create_stock_ageing_snapshot(self.name)
+
 	def get_prepared_data(self):
 		if attachments := get_attachments(self.doctype, self.name):
 			attachment = attachments[0]
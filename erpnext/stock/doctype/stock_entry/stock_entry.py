@@ -37,6 +37,7 @@ from erpnext.manufacturing.doctype.bom.bom import (
 from erpnext.setup.doctype.brand.brand import get_brand_defaults
 from erpnext.setup.doctype.item_group.item_group import get_item_group_defaults
 from erpnext.stock.doctype.batch.batch import get_batch_qty
+from erpnext.stock.doctype.bin.bin import coalesced_bin_updates
 from erpnext.stock.doctype.item.item import get_item_defaults
 from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
 from erpnext.stock.doctype.stock_reconciliation.stock_reconciliation import (
@@ -3326,14 +3327,15 @@ class StockEntry(StockController, SubcontractingInwardController):
 			# RM Item-Reserve Warehouse Dict
 			item_wh = {x.get("rm_item_code"): x.get("reserve_warehouse") for x in order_supplied_items}
 
-			for d in self.get("items"):
-				# Update reserved sub contracted quantity in bin based on Supplied Item Details and
-				item_code = d.get("original_item") or d.get("item_code")
-				reserve_warehouse = item_wh.get(item_code)
-				if not (reserve_warehouse and item_code):
-					continue
-				stock_bin = get_bin(item_code, reserve_warehouse)
-				stock_bin.update_reserved_qty_for_sub_contracting()
+			with coalesced_bin_updates():
+				for d in self.get("items"):
+					# Update reserved sub contracted quantity in bin based on Supplied Item Details and
+					item_code = d.get("original_item") or d.get("item_code")
+					reserve_warehouse = item_wh.get(item_code)
+					if not (reserve_warehouse and item_code):
+						continue
+					stock_bin = get_bin(item_code, reserve_warehouse)
+					stock_bin.update_reserved_qty_for_sub_contracting()
 
 	def update_transferred_qty(self):
 		if self.purpose == "Material Transfer" and self.outgoing_stock_entry:
@@ -13,7 +13,14 @@ from frappe.utils import add_days, cint, flt, formatdate, get_datetime, getdate
 
 from erpnext.accounts.utils import get_fiscal_year
 from erpnext.controllers.item_variant import ItemTemplateCannotHaveStock
+from erpnext.stock.doctype.batch_warehouse_balance.batch_warehouse_balance import (
+	apply_batch_warehouse_balance_of_sle,
+)
+from erpnext.stock.doctype.bin.bin import update_last_posting_datetime
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	invalidate_stock_balance_snapshot,
+)
 from erpnext.stock.serial_batch_bundle import SerialBatchBundle
 
 
@@ -173,6 +180,11 @@ class StockLedgerEntry(Document):
 
 	def on_submit(self):
 		self.check_stock_frozen_date()
+		if not self.flags.stock_balance_snapshot_invalidated:
+			invalidate_stock_balance_snapshot(self.company, self.posting_date)
+		update_last_posting_datetime(self)
+		# before the bundle is validated against the batch balances
+		apply_batch_warehouse_balance_of_sle(self)
 
 		# Added to handle few test cases where serial_and_batch_bundles are not required
 		if frappe.in_test and frappe.flags.ignore_serial_batch_bundle_validation:
@@ -182,6 +194,7 @@ class StockLedgerEntry(Document):
 			return
 
 		if not self.get("via_landed_cost_voucher"):
+			serial_and_batch_bundle = self.serial_and_batch_bundle
 			SerialBatchBundle(
 				sle=self,
 				item_code=self.item_code,
@@ -189,6 +202,9 @@ class StockLedgerEntry(Document):
 				company=self.company,
 			)
 
+			if self.serial_and_batch_bundle != serial_and_batch_bundle:
+				apply_batch_warehouse_balance_of_sle(self)
+
 		self.validate_serial_batch_no_bundle()
 
 	def validate_mandatory(self):
@@ -1382,6 +1382,60 @@ class TestStockLedgerEntry(IntegrationTestCase, StockTestMixin):
 			item_code=item_code, source=warehouse, qty=470.84, rate=100, posting_date=add_days(today(), -1)
 		)
 
+	def test_bulk_insert_of_sl_entries(self):
+		from unittest.mock import patch
+
+		item_a = make_item("_Test Bulk SLE Item A", {"is_stock_item": 1, "valuation_method": "FIFO"}).name
+		item_b = make_item("_Test Bulk SLE Item B", {"is_stock_item": 1, "valuation_method": "FIFO"}).name
+		warehouse = "_Test Warehouse - _TC"
+
+		se = make_stock_entry(
+			item_code=item_a,
+			to_warehouse=warehouse,
+			qty=5,
+			rate=100,
+			purpose="Material Receipt",
+			do_not_save=True,
+		)
+		for item_code, qty, rate in ((item_b, 10, 20), (item_a, 5, 200)):
+			se.append(
+				"items",
+				{
+					"item_code": item_code,
+					"t_warehouse": warehouse,
+					"qty": qty,
+					"transfer_qty": qty,
+					"basic_rate": rate,
+					"uom": "Nos",
+					"stock_uom": "Nos",
+					"conversion_factor": 1.0,
+				},
+			)
+
+		with patch("erpnext.stock.stock_ledger.BULK_SLE_INSERT_THRESHOLD", 2):
+			se.save()
+			se.submit()
+
+		self.assertSLEs(
+			se,
+			[
+				{"item_code": item_a, "qty_after_transaction": 5, "stock_value": 500},
+				{"item_code": item_b, "qty_after_transaction": 10, "stock_value": 200},
+				{"item_code": item_a, "qty_after_transaction": 10, "stock_value": 1500},
+			],
+		)
+
+		for item_code, qty, value in ((item_a, 10, 1500), (item_b, 10, 200)):
+			bin_details = frappe.db.get_value(
+				"Bin",
+				{"item_code": item_code, "warehouse": warehouse},
+				["actual_qty", "stock_value", "projected_qty"],
+				as_dict=1,
+			)
+			self.assertEqual(bin_details.actual_qty, qty)
+			self.assertEqual(bin_details.stock_value, value)
+			self.assertEqual(bin_details.projected_qty, qty)
+
 
 def create_repack_entry(**args):
 	args = frappe._dict(args)
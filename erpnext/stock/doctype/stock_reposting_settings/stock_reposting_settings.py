@@ -25,6 +25,7 @@ class StockRepostingSettings(Document):
 		]
 		no_of_parallel_reposting: DF.Int
 		notify_reposting_error_to_role: DF.Link | None
+		reposting_page_size: DF.Int
 		start_time: DF.Time | None
 	# end: auto-generated types
 
@@ -11,6 +11,10 @@ from frappe.model.document import Document
 from frappe.utils import cint
 from frappe.utils.html_utils import clean_html
 
+from erpnext.stock.doctype.batch_warehouse_balance.batch_warehouse_balance import (
+	reset_batch_warehouse_balance,
+	update_batch_warehouse_balance,
+)
 from erpnext.stock.utils import check_pending_reposting
 
 
@@ -66,8 +70,10 @@ class StockSettings(Document):
 		stock_uom: DF.Link | None
 		update_existing_price_list_rate: DF.Check
 		update_price_list_based_on: DF.Literal["Rate", "Price List Rate"]
+		use_batch_warehouse_balance: DF.Check
 		use_naming_series: DF.Check
 		use_serial_batch_fields: DF.Check
+		use_stock_balance_snapshot: DF.Check
 		validate_material_transfer_warehouses: DF.Check
 		valuation_method: DF.Literal["FIFO", "Moving Average", "LIFO"]
 	# end: auto-generated types
@@ -224,6 +230,26 @@ class StockSettings(Document):
 
 	def on_update(self):
 		self.toggle_warehouse_field_for_inter_warehouse_transfer()
+		self.reset_batch_warehouse_balance()
+
+	def reset_batch_warehouse_balance(self):
+		doc_before_save = self.get_doc_before_save()
+		if not doc_before_save or (
+			doc_before_save.use_batch_warehouse_balance == self.use_batch_warehouse_balance
+		):
+			return
+
+		# balances are not updated while disabled, they are built again after enabling
+		reset_batch_warehouse_balance()
+
+		if self.use_batch_warehouse_balance:
+			frappe.enqueue(
+				update_batch_warehouse_balance,
+				queue="long",
+				job_id="update_batch_warehouse_balance",
+				deduplicate=True,
+				now=frappe.in_test,
+			)
 
 	def change_precision_for_for_sales(self):
 		doc_before_save = self.get_doc_before_save()
@@ -3,6 +3,7 @@
 
 
 import json
+from contextlib import contextmanager
 
 import frappe
 from frappe import _, throw
@@ -165,6 +166,124 @@ def get_item_details(ctx, doc=None, for_validate=False, overwrite_warehouse=True
 	return out
 
 
+@frappe.whitelist()
+def get_items_details(
+	ctx, items, doc=None, for_validate=False, overwrite_warehouse=True
+) -> list[ItemDetails]:
+	"""
+	Same as `get_item_details` for all the rows of a document.
+
+	ctx holds the values common to all rows (customer, price list, company, ...) and
+	items the values of each row (item_code, qty, uom, warehouse, ...).
+
+	Item Price, Bin and UOM Conversion Detail of all the items and the pricing rules
+	of the document are fetched upfront instead of once per row.
+	"""
+	ctx = ItemDetailsCtx(parse_json(ctx))
+	items = parse_json(items)
+
+	if isinstance(doc, str):
+		doc = json.loads(doc)
+
+	items_ctx = [ItemDetailsCtx({**ctx, **item}) for item in items]
+
+	with prefetched_item_details(items_ctx):
+		return [
+			get_item_details(
+				item_ctx, doc, for_validate=for_validate, overwrite_warehouse=overwrite_warehouse
+			)
+			for item_ctx in items_ctx
+		]
+
+
+@contextmanager
+def prefetched_item_details(items_ctx: list[ItemDetailsCtx]):
+	prefetch_item_details(items_ctx)
+	try:
+		yield
+	finally:
+		frappe.flags.prefetched_item_details = None
+		frappe.flags.prefetched_pricing_rules = None
+
+
+def prefetch_item_details(items_ctx: list[ItemDetailsCtx]):
+	"""Load Item Price, Bin and UOM Conversion Detail of all the items in one query each.
+	`get_item_price`, `get_bin_details` and `get_conversion_factor` read them instead of querying."""
+	from erpnext.accounts.doctype.pricing_rule.utils import prefetch_pricing_rules
+
+	item_codes = {ctx.item_code for ctx in items_ctx if ctx.item_code}
+	if not item_codes:
+		return
+
+	item_codes.update(
+		frappe.get_all(
+			"Item",
+			filters={"name": ("in", list(item_codes)), "variant_of": ("is", "set")},
+			pluck="variant_of",
+		)
+	)
+
+	price_lists = {ctx.price_list or ctx.selling_price_list or ctx.buying_price_list for ctx in items_ctx}
+	if frappe.get_single_value("Selling Settings", "fallback_to_default_price_list"):
+		price_lists.add(frappe.get_single_value("Selling Settings", "selling_price_list"))
+	price_lists.discard(None)
+	price_lists.discard("")
+
+	prefetched = frappe._dict(
+		item_codes=item_codes,
+		price_lists=price_lists,
+		item_prices={},
+		uom_conversion_factors={},
+		bins={},
+		child_warehouses={},
+	)
+
+	if price_lists:
+		ip = frappe.qb.DocType("Item Price")
+		for d in (
+			frappe.qb.from_(ip)
+			.select(
+				ip.name,
+				ip.item_code,
+				ip.price_list,
+				ip.price_list_rate,
+				ip.uom,
+				ip.batch_no,
+				ip.customer,
+				ip.supplier,
+				ip.valid_from,
+				ip.valid_upto,
+			)
+			.where(ip.item_code.isin(list(item_codes)) & ip.price_list.isin(list(price_lists)))
+		).run(as_dict=True):
+			prefetched.item_prices.setdefault((d.item_code, d.price_list), []).append(d)
+
+	ucd = frappe.qb.DocType("UOM Conversion Detail")
+	for parent, uom, conversion_factor in (
+		frappe.qb.from_(ucd)
+		.select(ucd.parent, ucd.uom, ucd.conversion_factor)
+		.where((ucd.parenttype == "Item") & ucd.parent.isin(list(item_codes)))
+	).run():
+		prefetched.uom_conversion_factors[(parent, uom)] = conversion_factor
+
+	bin = frappe.qb.DocType("Bin")
+	wh = frappe.qb.DocType("Warehouse")
+	for d in (
+		frappe.qb.from_(bin)
+		.inner_join(wh)
+		.on(bin.warehouse == wh.name)
+		.select(bin.item_code, bin.warehouse, bin.projected_qty, bin.actual_qty, bin.reserved_qty, wh.company)
+		.where(bin.item_code.isin(list(item_codes)))
+	).run(as_dict=True):
+		prefetched.bins.setdefault(d.item_code, []).append(d)
+
+	frappe.flags.prefetched_item_details = prefetched
+
+	if not all(ctx.ignore_pricing_rule for ctx in items_ctx):
+		company = next((ctx.company for ctx in items_ctx if ctx.company), None)
+		prefetch_pricing_rules(frappe._dict(company=company), items_ctx)
+
+
 def remove_standard_fields(out: ItemDetails):
 	for key in child_table_fields + default_fields:
 		out.pop(key, None)
@@ -1064,6 +1183,10 @@ def insert_item_price(ctx: ItemDetailsCtx):
 
 	update_based_on_price_list_rate = stock_settings.update_price_list_based_on == "Price List Rate"
 
+	if frappe.flags.prefetched_item_details:
+		# Item Price of the item can change below, read it from the database for the next rows
+		frappe.flags.prefetched_item_details.item_codes.discard(ctx.item_code)
+
 	if item_price and item_price.name:
 		if not stock_settings.update_existing_price_list_rate:
 			return
@@ -1118,6 +1241,10 @@ def get_item_price(
 	"""
 	pctx: ItemPriceCtx = frappe._dict(pctx)
 
+	prefetched = frappe.flags.prefetched_item_details
+	if prefetched and item_code in prefetched.item_codes and pctx.price_list in prefetched.price_lists:
+		return _get_prefetched_item_price(pctx, item_code, ignore_party, force_batch_no)
+
 	ip = frappe.qb.DocType("Item Price")
 	query = (
 		frappe.qb.from_(ip)
@@ -1155,6 +1282,66 @@ def get_item_price(
 	return query.run(as_dict=True)
 
 
+def _get_prefetched_item_price(
+	pctx: ItemPriceCtx, item_code, ignore_party=False, force_batch_no=False
+) -> list[dict]:
+	"""Same as the query in `get_item_price` on the Item Price prefetched by `prefetch_item_details`"""
+	transaction_date = getdate(pctx.transaction_date) if pctx.transaction_date else None
+
+	def is_applicable(item_price):
+		if (item_price.uom or "") not in ("", pctx.uom):
+			return False
+
+		if force_batch_no:
+			if pctx.batch_no is None or item_price.batch_no != pctx.batch_no:
+				return False
+		elif (item_price.batch_no or "") not in ("", pctx.batch_no):
+			return False
+
+		if not ignore_party:
+			if pctx.customer:
+				if item_price.customer != pctx.customer:
+					return False
+			elif pctx.supplier:
+				if item_price.supplier != pctx.supplier:
+					return False
+			elif item_price.customer or item_price.supplier:
+				return False
+
+		if transaction_date and not (
+			getdate(item_price.valid_from or "2000-01-01")
+			<= transaction_date
+			<= getdate(item_price.valid_upto or "2500-12-31")
+		):
+			return False
+
+		return True
+
+	item_prices = [
+		d
+		for d in frappe.flags.prefetched_item_details.item_prices.get((item_code, pctx.price_list), [])
+		if is_applicable(d)
+	]
+	if not item_prices:
+		return []
+
+	# order by valid_from desc, ifnull(batch_no, '') desc, uom desc with nulls last
+	item_price = max(
+		item_prices,
+		key=lambda d: (
+			d.valid_from is not None,
+			getdate(d.valid_from or "2000-01-01"),
+			d.batch_no or "",
+			d.uom is not None,
+			d.uom or "",
+		),
+	)
+
+	return [
+		frappe._dict(name=item_price.name, price_list_rate=item_price.price_list_rate, uom=item_price.uom)
+	]
+
+
 @frappe.whitelist()
 def get_batch_based_item_price(pctx: ItemPriceCtx | dict | str, item_code) -> float:
 	pctx = parse_json(pctx)
@@ -1400,18 +1587,27 @@ def get_conversion_factor(item_code, uom):
 	if item.variant_of:
 		item_codes.append(item.variant_of)
 
-	parent = frappe.qb.DocType("Item")
-	child = frappe.qb.DocType("UOM Conversion Detail")
-	query = (
-		frappe.qb.from_(parent)
-		.join(child)
-		.on(parent.name == child.parent)
-		.select(child.conversion_factor)
-		.where((parent.name.isin(item_codes)) & (child.uom == uom))
-		.orderby(parent.has_variants)
-		.limit(1)
-	)
-	conversion_factor = query.run(pluck="conversion_factor")
+	prefetched = frappe.flags.prefetched_item_details
+	if prefetched and item_code in prefetched.item_codes:
+		# conversion factor of the item takes precedence over that of its template
+		conversion_factor = [
+			prefetched.uom_conversion_factors[(d, uom)]
+			for d in item_codes
+			if (d, uom) in prefetched.uom_conversion_factors
+		][:1]
+	else:
+		parent = frappe.qb.DocType("Item")
+		child = frappe.qb.DocType("UOM Conversion Detail")
+		query = (
+			frappe.qb.from_(parent)
+			.join(child)
+			.on(parent.name == child.parent)
+			.select(child.conversion_factor)
+			.where((parent.name.isin(item_codes)) & (child.uom == uom))
+			.orderby(parent.has_variants)
+			.limit(1)
+		)
+		conversion_factor = query.run(pluck="conversion_factor")
 
 	if not conversion_factor:
 		conversion_factor = get_uom_conv_factor(uom, item.stock_uom)
@@ -1439,18 +1635,32 @@ def get_bin_details(item_code, warehouse, company=None, include_child_warehouses
 
 		from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
 
-		warehouses = get_child_warehouses(warehouse) if include_child_warehouses else [warehouse]
+		prefetched = frappe.flags.prefetched_item_details
+		if prefetched and item_code in prefetched.item_codes:
+			if include_child_warehouses:
+				if warehouse not in prefetched.child_warehouses:
+					prefetched.child_warehouses[warehouse] = get_child_warehouses(warehouse)
+				warehouses = prefetched.child_warehouses[warehouse]
+			else:
+				warehouses = [warehouse]
 
-		bin = frappe.qb.DocType("Bin")
-		bin_details = (
-			frappe.qb.from_(bin)
-			.select(
-				Coalesce(Sum(bin.projected_qty), 0).as_("projected_qty"),
-				Coalesce(Sum(bin.actual_qty), 0).as_("actual_qty"),
-				Coalesce(Sum(bin.reserved_qty), 0).as_("reserved_qty"),
-			)
-			.where((bin.item_code == item_code) & (bin.warehouse.isin(warehouses)))
-		).run(as_dict=True)[0]
+			for d in prefetched.bins.get(item_code, []):
+				if d.warehouse in warehouses:
+					for fieldname in bin_details:
+						bin_details[fieldname] += flt(d.get(fieldname))
+		else:
+			warehouses = get_child_warehouses(warehouse) if include_child_warehouses else [warehouse]
+
+			bin = frappe.qb.DocType("Bin")
+			bin_details = (
+				frappe.qb.from_(bin)
+				.select(
+					Coalesce(Sum(bin.projected_qty), 0).as_("projected_qty"),
+					Coalesce(Sum(bin.actual_qty), 0).as_("actual_qty"),
+					Coalesce(Sum(bin.reserved_qty), 0).as_("reserved_qty"),
+				)
+				.where((bin.item_code == item_code) & (bin.warehouse.isin(warehouses)))
+			).run(as_dict=True)[0]
 
 	if company:
 		bin_details["company_total_stock"] = get_company_total_stock(item_code, company)
@@ -1459,6 +1669,11 @@ def get_bin_details(item_code, warehouse, company=None, include_child_warehouses
 
 
 def get_company_total_stock(item_code, company):
+	prefetched = frappe.flags.prefetched_item_details
+	if prefetched and item_code in prefetched.item_codes:
+		actual_qty = [d.actual_qty for d in prefetched.bins.get(item_code, []) if d.company == company]
+		return sum(actual_qty) if actual_qty else None
+
 	bin = frappe.qb.DocType("Bin")
 	wh = frappe.qb.DocType("Warehouse")
 
@@ -2,14 +2,18 @@
 # License: GNU General Public License v3. See license.txt
 
 
+import json
 from collections.abc import Iterator
 from operator import itemgetter
 
 import frappe
 from frappe import _
-from frappe.utils import cint, date_diff, flt, get_datetime
+from frappe.utils import cint, date_diff, flt, get_datetime, getdate
 
 from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
+from erpnext.stock.doctype.stock_ageing_snapshot.stock_ageing_snapshot import (
+	get_stock_ageing_snapshot_entry,
+)
 
 Filters = frappe._dict
 
@@ -232,8 +236,10 @@ class FIFOSlots:
 		self.item_details = {}
 		self.transferred_item_details = {}
 		self.serial_no_batch_purchase_details = {}
+		self.key_wise_serial_no_purchase_details = {}
 		self.filters = filters
 		self.sle = sle
+		self.snapshot_entry = None
 
 	def generate(self) -> dict:
 		"""
@@ -254,6 +260,7 @@ class FIFOSlots:
 
 		bundle_wise_serial_nos = frappe._dict({})
 		if stock_ledger_entries is None:
+			self.__set_slots_from_snapshot()
 			bundle_wise_serial_nos = self.__get_bundle_wise_serial_nos()
 
 		with frappe.db.unbuffered_cursor():
@@ -296,6 +303,71 @@ class FIFOSlots:
 		"Convert serial nos to uppercase for uniformity."
 		return [sn.upper() for sn in serial_nos]
 
+	def __set_slots_from_snapshot(self):
+		"Start from the FIFO slots persisted by the latest Stock Closing Entry till the report date."
+		self.snapshot_entry = get_stock_ageing_snapshot_entry(
+			self.filters.get("company"), self.filters.get("to_date")
+		)
+		if not self.snapshot_entry:
+			return
+
+		snapshot = frappe.qb.DocType("Stock Ageing Snapshot")
+		item = self.__get_item_query()
+
+		snapshot_query = (
+			frappe.qb.from_(snapshot)
+			.from_(item)
+			.select(
+				item.name,
+				item.item_name,
+				item.item_group,
+				item.brand,
+				item.description,
+				item.stock_uom,
+				item.has_serial_no,
+				item.valuation_method,
+				snapshot.warehouse,
+				snapshot.valuation_rate,
+				snapshot.qty_after_transaction,
+				snapshot.total_qty,
+				snapshot.fifo_queue,
+				snapshot.serial_no_purchase_details,
+			)
+			.where(
+				(snapshot.item_code == item.name) & (snapshot.stock_closing_entry == self.snapshot_entry.name)
+			)
+		)
+		snapshot_query = self.__apply_warehouse_filters(snapshot, snapshot_query)
+		snapshot_query = snapshot_query.orderby(snapshot.idx)
+
+		with frappe.db.unbuffered_cursor():
+			for row in snapshot_query.run(as_dict=True, as_iterator=True):
+				fifo_queue = json.loads(row.pop("fifo_queue") or "[]")
+				for slot in fifo_queue:
+					if slot[1]:
+						slot[1] = getdate(slot[1])
+
+				key = (row.name, row.warehouse)
+				self.item_details[key] = {
+					"details": row,
+					"fifo_queue": fifo_queue,
+					"qty_after_transaction": row.pop("qty_after_transaction"),
+					"total_qty": row.pop("total_qty"),
+					"has_serial_no": row.has_serial_no,
+				}
+
+				purchase_details = json.loads(row.pop("serial_no_purchase_details") or "{}")
+				for serial_no, posting_date in purchase_details.items():
+					posting_date = getdate(posting_date)
+					purchase_details[serial_no] = posting_date
+
+					first_posting_date = self.serial_no_batch_purchase_details.get(serial_no)
+					if not first_posting_date or posting_date < first_posting_date:
+						self.serial_no_batch_purchase_details[serial_no] = posting_date
+
+				if purchase_details:
+					self.key_wise_serial_no_purchase_details[key] = purchase_details
+
 	def __init_key_stores(self, row: dict) -> tuple:
 		"Initialise keys and FIFO Queue."
 
@@ -331,7 +403,11 @@ class FIFOSlots:
 				return
 
 			valuation = row.stock_value_difference / row.actual_qty
+			purchase_details = self.key_wise_serial_no_purchase_details.setdefault(
+				(row.name, row.warehouse), {}
+			)
 			for serial_no in serial_nos:
+				purchase_details.setdefault(serial_no, row.posting_date)
 				if self.serial_no_batch_purchase_details.get(serial_no):
 					fifo_queue.append(
 						[serial_no, self.serial_no_batch_purchase_details.get(serial_no), valuation]
@@ -479,8 +555,17 @@ class FIFOSlots:
 			)
 		)
 
+		if self.snapshot_entry:
+			sle_query = sle_query.where(sle.posting_datetime > self.snapshot_entry.upto)
+
+		sle_query = self.__apply_warehouse_filters(sle, sle_query)
+		sle_query = sle_query.orderby(sle.posting_datetime, sle.creation)
+
+		return sle_query.run(as_dict=True, as_iterator=True)
+
+	def __apply_warehouse_filters(self, table, query):
 		if self.filters.get("warehouse"):
-			sle_query = self.__get_warehouse_conditions(sle, sle_query)
+			query = self.__get_warehouse_conditions(table, query)
 		elif self.filters.get("warehouse_type"):
 			warehouses = frappe.get_all(
 				"Warehouse",
@@ -489,11 +574,9 @@ class FIFOSlots:
 			)
 
 			if warehouses:
-				sle_query = sle_query.where(sle.warehouse.isin(warehouses))
+				query = query.where(table.warehouse.isin(warehouses))
 
-		sle_query = sle_query.orderby(sle.posting_datetime, sle.creation)
-
-		return sle_query.run(as_dict=True, as_iterator=True)
+		return query
 
 	def __get_bundle_wise_serial_nos(self) -> dict:
 		bundle = frappe.qb.DocType("Serial and Batch Bundle")
@@ -513,6 +596,9 @@ class FIFOSlots:
 			)
 		)
 
+		if self.snapshot_entry:
+			query = query.where(bundle.posting_datetime > self.snapshot_entry.upto)
+
 		for field in ["item_code"]:
 			if self.filters.get(field):
 				query = query.where(bundle[field] == self.filters.get(field))
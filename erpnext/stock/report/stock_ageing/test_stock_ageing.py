@@ -1,8 +1,11 @@
 # Copyright (c) 2022, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
+import json
+
 import frappe
 from frappe.tests import IntegrationTestCase
+from frappe.utils import add_days, getdate, today
 
 from erpnext.stock.report.stock_ageing.stock_ageing import FIFOSlots, format_report_data
 
@@ -868,6 +871,57 @@ class TestStockAgeing(IntegrationTestCase):
 		range_valuations = range_values[1::2]
 		self.assertEqual(range_valuations, [15, 7.5, 20, 5])
 
+	def test_stock_ageing_from_snapshot(self):
+		"Test FIFO slots replayed from the snapshot of a Stock Closing Entry."
+		from erpnext.stock.doctype.item.test_item import make_item
+		from erpnext.stock.doctype.stock_closing_entry.stock_closing_entry import (
+			prepare_closing_stock_balance,
+		)
+		from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+
+		item_code = make_item("_Test Stock Ageing Snapshot Item", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+		make_stock_entry(
+			item_code=item_code, qty=10, rate=100, to_warehouse=warehouse, posting_date=add_days(today(), -30)
+		)
+		make_stock_entry(
+			item_code=item_code, qty=4, from_warehouse=warehouse, posting_date=add_days(today(), -25)
+		)
+		make_stock_entry(
+			item_code=item_code, qty=5, rate=120, to_warehouse=warehouse, posting_date=add_days(today(), -10)
+		)
+
+		closing_entry = frappe.new_doc("Stock Closing Entry")
+		closing_entry.company = "_Test Company"
+		closing_entry.from_date = add_days(today(), -30)
+		closing_entry.to_date = add_days(today(), -20)
+		closing_entry.submit()
+		prepare_closing_stock_balance(closing_entry.name)
+
+		fifo_queue = frappe.db.get_value(
+			"Stock Ageing Snapshot",
+			{"stock_closing_entry": closing_entry.name, "item_code": item_code, "warehouse": warehouse},
+			"fifo_queue",
+		)
+		self.assertEqual(json.loads(fifo_queue), [[6.0, str(add_days(today(), -30)), 600.0]])
+
+		filters = frappe._dict(
+			company="_Test Company", to_date=today(), item_code=item_code, show_warehouse_wise_stock=True
+		)
+		fifo_slots = FIFOSlots(filters)
+		slots = fifo_slots.generate()[(item_code, warehouse)]
+		self.assertEqual(fifo_slots.snapshot_entry.name, closing_entry.name)
+
+		# same slots when all the entries are replayed
+		closing_entry.cancel()
+		fifo_slots = FIFOSlots(filters)
+		replayed_slots = fifo_slots.generate()[(item_code, warehouse)]
+		self.assertIsNone(fifo_slots.snapshot_entry)
+
+		for field in ("fifo_queue", "qty_after_transaction", "total_qty"):
+			self.assertEqual(slots[field], replayed_slots[field])
+		self.assertEqual(slots["fifo_queue"][1][:2], [5.0, getdate(add_days(today(), -10))])
+
 
 def generate_item_and_item_wh_wise_slots(filters, sle):
 	"Return results with and without 'show_warehouse_wise_stock'"
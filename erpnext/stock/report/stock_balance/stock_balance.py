@@ -14,6 +14,10 @@ from frappe.utils.nestedset import get_descendants_of
 
 import erpnext
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	get_snapshot_movement_columns,
+	get_stock_balance_snapshot_query,
+)
 from erpnext.stock.doctype.stock_closing_entry.stock_closing_entry import StockClosing
 from erpnext.stock.doctype.warehouse.warehouse import apply_warehouse_filter
 from erpnext.stock.report.stock_ageing.stock_ageing import FIFOSlots, get_average_age
@@ -47,6 +51,7 @@ class StockBalanceReport:
 		self.to_date = getdate(filters.get("to_date"))
 
 		self.start_from = None
+		self.snapshot_date = None
 		self.data = []
 		self.columns = []
 		self.sle_entries: list[SLEntry] = []
@@ -64,6 +69,7 @@ class StockBalanceReport:
 		self.item_warehouse_map = frappe._dict({})
 		self.inventory_dimensions = self.get_inventory_dimension_fields()
 		self.prepare_opening_stock()
+		self.prepare_item_warehouse_map_from_snapshot()
 		self.prepare_sle_query()
 		self.prepare_item_warehouse_map_for_current_period()
 		self.prepare_new_data()
@@ -132,6 +138,66 @@ class StockBalanceReport:
 
 		return opening_entries
 
+	def prepare_item_warehouse_map_from_snapshot(self) -> None:
+		"""Add the movements till the snapshot date from Stock Balance Snapshot,
+		Stock Ledger Entries are then fetched only after the snapshot date"""
+		snapshot_date, snapshot, query = get_stock_balance_snapshot_query(
+			self.filters.get("company"), self.to_date
+		)
+		if not snapshot_date:
+			return
+
+		start_from = self.start_from if not self.filters.ignore_closing_balance else None
+		if start_from and getdate(start_from) > snapshot_date:
+			return
+
+		self.snapshot_date = snapshot_date
+		item_table = frappe.qb.DocType("Item")
+
+		query = (
+			query.inner_join(item_table)
+			.on(snapshot.item_code == item_table.name)
+			.select(
+				snapshot.item_code,
+				snapshot.warehouse,
+				snapshot.company,
+				item_table.item_group,
+				item_table.stock_uom,
+				item_table.item_name,
+				*get_snapshot_movement_columns(snapshot, self.from_date),
+			)
+			.groupby(
+				snapshot.item_code,
+				snapshot.warehouse,
+				snapshot.company,
+				*[snapshot[fieldname] for fieldname in self.inventory_dimensions],
+			)
+		)
+
+		if start_from:
+			query = query.where(snapshot.posting_date >= start_from)
+
+		query = self.apply_inventory_dimensions_filters(query, snapshot)
+		query = self.apply_warehouse_filters(query, snapshot)
+		query = self.apply_items_filters(query, item_table)
+
+		for entry in query.run(as_dict=True):
+			group_by_key = self.get_group_by_key(entry)
+			if group_by_key not in self.item_warehouse_map:
+				self.initialize_data(group_by_key, entry)
+
+			qty_dict = self.item_warehouse_map[group_by_key]
+			for field in self.inventory_dimensions:
+				qty_dict[field] = entry.get(field)
+
+			for field in ("opening_qty", "opening_val", "in_qty", "out_qty", "in_val", "out_val"):
+				qty_dict[field] += flt(entry[field])
+
+			qty_dict.bal_qty += flt(entry.opening_qty) + flt(entry.in_qty) - flt(entry.out_qty)
+			qty_dict.bal_val += flt(entry.opening_val) + flt(entry.in_val) - flt(entry.out_val)
+			if qty_dict.bal_qty:
+				qty_dict.val_rate = qty_dict.bal_val / qty_dict.bal_qty
+
 	def filter_fields(self) -> list[str]:
 		fields = ["item_code", "warehouse"]
 
@@ -389,6 +455,9 @@ class StockBalanceReport:
 		if not self.filters.ignore_closing_balance and self.start_from:
 			query = query.where(sle.posting_date >= self.start_from)
 
+		if self.snapshot_date:
+			query = query.where(sle.posting_date > self.snapshot_date)
+
 		if self.to_date:
 			query = query.where(sle.posting_date <= self.to_date)
 
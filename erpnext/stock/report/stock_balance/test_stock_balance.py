@@ -1,4 +1,5 @@
 from typing import Any
+from unittest.mock import patch
 
 import frappe
 from frappe import _dict
@@ -168,3 +169,47 @@ class TestStockBalance(IntegrationTestCase):
 		rows = stock_balance(self.filters.update({"show_variant_attributes": 1, "item_code": [variant.name]}))
 		self.assertPartialDictEq(attributes, rows[0])
 		self.assertInvariants(rows)
+
+	def test_stock_balance_from_snapshot(self):
+		from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+			build_stock_balance_snapshot,
+			get_snapshot_state,
+		)
+
+		self.generate_stock_ledger(
+			self.item.name,
+			[
+				_dict(qty=5, rate=10, posting_date="2021-01-01"),
+				_dict(qty=3, rate=20, posting_date="2021-01-02"),
+				_dict(
+					qty=2,
+					from_warehouse="_Test Warehouse - _TC",
+					to_warehouse=None,
+					posting_date="2021-01-03",
+				),
+			],
+		)
+		self.filters.update({"from_date": "2021-01-02"})
+		expected_rows = stock_balance(self.filters)
+
+		build_stock_balance_snapshot("_Test Company")
+		with self.change_settings("Stock Settings", {"use_stock_balance_snapshot": 1}):
+			rows = stock_balance(self.filters)
+			self.assertInvariants(rows)
+			for field in ("opening_qty", "opening_val", "in_qty", "in_val", "out_qty", "out_val", "bal_qty"):
+				self.assertAlmostEqual(rows[0][field], expected_rows[0][field], 3)
+
+			# entries posted after the snapshot date are read from the stock ledger
+			self.generate_stock_ledger(self.item.name, [_dict(qty=4, rate=10)])
+			rows = stock_balance(self.filters)
+			self.assertInvariants(rows)
+			self.assertPartialDictEq({"opening_qty": 5, "in_qty": 7, "out_qty": 2, "bal_qty": 10}, rows[0])
+
+		# a back dated voucher moves the snapshot date before it once, not on submit of each entry
+		with patch(
+			"erpnext.stock.doctype.stock_ledger_entry.stock_ledger_entry.invalidate_stock_balance_snapshot"
+		) as invalidate_on_sle_submit:
+			self.generate_stock_ledger(self.item.name, [_dict(qty=1, rate=10, posting_date="2021-01-02")])
+
+		invalidate_on_sle_submit.assert_not_called()
+		self.assertEqual(get_snapshot_state("_Test Company").upto, "2021-01-01")
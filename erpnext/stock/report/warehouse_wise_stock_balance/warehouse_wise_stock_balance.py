@@ -7,6 +7,10 @@ import frappe
 from frappe import _
 from frappe.query_builder.functions import Sum
 
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	get_stock_balance_snapshot_query,
+)
+
 
 class StockBalanceFilter(TypedDict):
 	company: str | None
@@ -38,8 +42,24 @@ def get_warehouse_wise_balance(filters: StockBalanceFilter) -> list[SLEntry]:
 	if filters.get("company"):
 		query = query.where(sle.company == filters.get("company"))
 
-	data = query.run(as_list=True)
-	return frappe._dict(data) if data else frappe._dict()
+	snapshot_date, snapshot, snapshot_query = get_stock_balance_snapshot_query(filters.get("company"))
+	if not snapshot_date:
+		data = query.run(as_list=True)
+		return frappe._dict(data) if data else frappe._dict()
+
+	# balances till the snapshot date from Stock Balance Snapshot, later ones from Stock Ledger Entry
+	data = frappe._dict()
+	snapshot_query = snapshot_query.select(
+		snapshot.warehouse, Sum(snapshot.in_val - snapshot.out_val).as_("stock_balance")
+	).groupby(snapshot.warehouse)
+
+	for warehouse, stock_balance in [
+		*snapshot_query.run(as_list=True),
+		*query.where(sle.posting_date > snapshot_date).run(as_list=True),
+	]:
+		data[warehouse] = (data.get(warehouse) or 0.0) + (stock_balance or 0.0)
+
+	return data
 
 
 def get_warehouses(report_filters: StockBalanceFilter):
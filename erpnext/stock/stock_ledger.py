@@ -4,6 +4,7 @@
 import copy
 import gzip
 import json
+from datetime import timedelta
 
 import frappe
 from frappe import _, bold, scrub
@@ -14,6 +15,7 @@ from frappe.utils import (
 	cint,
 	flt,
 	format_date,
+	get_datetime,
 	get_link_to_form,
 	getdate,
 	now,
@@ -23,11 +25,19 @@ from frappe.utils import (
 )
 
 import erpnext
+from erpnext.stock.doctype.bin.bin import (
+	coalesced_bin_updates,
+	get_last_posting_datetime,
+	update_bin_values,
+)
 from erpnext.stock.doctype.bin.bin import update_qty as update_bin_qty
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
 from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
 	get_auto_batch_nos,
 )
+from erpnext.stock.doctype.stock_balance_snapshot.stock_balance_snapshot import (
+	invalidate_stock_balance_snapshot_of_entries,
+)
 from erpnext.stock.doctype.stock_reservation_entry.stock_reservation_entry import (
 	get_sre_reserved_batch_nos_details,
 	get_sre_reserved_serial_nos_details,
@@ -41,7 +51,15 @@ from erpnext.stock.utils import (
 	get_stock_balance,
 	get_valuation_method,
 )
-from erpnext.stock.valuation import FIFOValuation, LIFOValuation, round_off_if_near_zero
+from erpnext.stock.valuation import (
+	BinWiseValuation,
+	FIFOValuation,
+	LIFOValuation,
+	round_off_if_near_zero,
+)
+
+# vouchers with at least these many stock ledger entries are inserted in bulk
+BULK_SLE_INSERT_THRESHOLD = 50
 
 
 class NegativeStockError(frappe.ValidationError):
@@ -63,6 +81,16 @@ def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_vouc
 	        such cases certain validations need to be ignored (like negative
 	                        stock)
 	"""
+	if sl_entries:
+		# once for the voucher instead of on submit of each of its entries
+		invalidate_stock_balance_snapshot_of_entries(sl_entries)
+
+		# every Bin of the voucher is written once, after all the entries are posted
+		with coalesced_bin_updates():
+			_make_sl_entries(sl_entries, allow_negative_stock, via_landed_cost_voucher)
+
+
+def _make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_voucher=False):
 	from erpnext.controllers.stock_controller import future_sle_exists
 
 	if sl_entries:
@@ -72,7 +100,15 @@ def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_vouc
 			set_as_cancel(sl_entries[0].get("voucher_type"), sl_entries[0].get("voucher_no"))
 
 		args = get_args_for_future_sle(sl_entries[0])
-		future_sle_exists(args, sl_entries)
+		has_future_sle = future_sle_exists(args, sl_entries)
+
+		if (
+			not cancelled
+			and not has_future_sle
+			and can_make_sl_entries_in_bulk(sl_entries, via_landed_cost_voucher)
+		):
+			make_sl_entries_in_bulk(sl_entries, allow_negative_stock)
+			return
 
 		for sle in sl_entries:
 			if sle.serial_no and not via_landed_cost_voucher:
@@ -117,6 +153,108 @@ def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_vouc
 				)
 
 
+def can_make_sl_entries_in_bulk(sl_entries, via_landed_cost_voucher=False):
+	"""Bulk insertion is used for large vouchers of plain stock items without future entries"""
+	if via_landed_cost_voucher or len(sl_entries) < BULK_SLE_INSERT_THRESHOLD:
+		return False
+
+	for sle in sl_entries:
+		if sle.get("voucher_type") == "Stock Reconciliation":
+			return False
+
+		if sle.get("serial_and_batch_bundle") or sle.get("serial_no") or sle.get("batch_no"):
+			return False
+
+		item_details = frappe.get_cached_value(
+			"Item", sle.get("item_code"), ["is_stock_item", "has_serial_no", "has_batch_no"], as_dict=1
+		)
+		if not item_details or not item_details.is_stock_item:
+			return False
+
+		if item_details.has_serial_no or item_details.has_batch_no:
+			return False
+
+	return True
+
+
+def make_sl_entries_in_bulk(sl_entries, allow_negative_stock=False):
+	"""Insert Stock Ledger Entries of a voucher with one multi-row insert, value the entries
+	once per item and warehouse and update each Bin once.
+
+	Should only be used when there are no future entries for the items and warehouses
+	of the voucher (see `can_make_sl_entries_in_bulk`)."""
+
+	sle_docs = make_sle_docs_for_bulk_insert(sl_entries, allow_negative_stock)
+	if not sle_docs:
+		return
+
+	fields = frappe.get_meta("Stock Ledger Entry").get_valid_columns()
+	values = []
+	for sle_doc in sle_docs:
+		row = sle_doc.get_valid_dict(convert_dates_to_str=True)
+		values.append(tuple(row.get(field) for field in fields))
+
+	frappe.db.bulk_insert("Stock Ledger Entry", fields=fields, values=values)
+
+	item_warehouse_wise_sles = {}
+	for sle_doc in sle_docs:
+		sle_doc.run_method("on_submit")
+		item_warehouse_wise_sles.setdefault((sle_doc.item_code, sle_doc.warehouse), []).append(sle_doc)
+
+	for (item_code, warehouse), sles in item_warehouse_wise_sles.items():
+		args = sles[-1].as_dict()
+		args["posting_datetime"] = get_combine_datetime(args.posting_date, args.posting_time)
+
+		bin_name = get_or_make_bin(item_code, warehouse)
+		args.reserved_stock = flt(frappe.db.get_value("Bin", bin_name, "reserved_stock"))
+
+		# values all the entries of the voucher for this item and warehouse in one pass
+		update_entries_after(
+			{
+				"item_code": item_code,
+				"warehouse": warehouse,
+				"posting_date": args.posting_date,
+				"posting_time": args.posting_time,
+				"voucher_type": args.voucher_type,
+				"voucher_no": args.voucher_no,
+				"sle_id": sles[0].name,
+				"reserved_stock": args.reserved_stock,
+				"all_voucher_entries": True,
+			},
+			allow_negative_stock=allow_negative_stock,
+		)
+
+		for fieldname in ("ordered_qty", "reserved_qty", "indented_qty", "planned_qty"):
+			args[fieldname] = sum(flt(sle.get(fieldname)) for sle in sles)
+
+		update_bin_qty(bin_name, args)
+
+
+def make_sle_docs_for_bulk_insert(sl_entries, allow_negative_stock=False):
+	# distinct creation for every entry to keep the valuation order same as the voucher rows
+	creation = get_datetime(now())
+
+	sle_docs = []
+	for idx, sle in enumerate(sl_entries):
+		if not sle.get("actual_qty"):
+			continue
+
+		sle_doc = frappe.get_doc({**sle, "doctype": "Stock Ledger Entry"})
+		sle_doc.flags.ignore_permissions = 1
+		sle_doc.flags.stock_balance_snapshot_invalidated = True
+		sle_doc.allow_negative_stock = allow_negative_stock
+		sle_doc.docstatus = 1
+		sle_doc.set_new_name()
+		sle_doc.creation = sle_doc.modified = creation + timedelta(microseconds=idx)
+		sle_doc.owner = sle_doc.modified_by = frappe.session.user
+
+		sle_doc.run_method("validate")
+		sle_doc.run_method("before_submit")
+		sle_docs.append(sle_doc)
+
+	return sle_docs
+
+
 def repost_current_voucher(args, allow_negative_stock=False, via_landed_cost_voucher=False, cancelled=False):
 	if args.get("actual_qty") or args.get("voucher_type") == "Stock Reconciliation":
 		if not args.get("posting_date"):
@@ -228,6 +366,7 @@ def make_entry(args, allow_negative_stock=False, via_landed_cost_voucher=False):
 	args["doctype"] = "Stock Ledger Entry"
 	sle = frappe.get_doc(args)
 	sle.flags.ignore_permissions = 1
+	sle.flags.stock_balance_snapshot_invalidated = True
 	sle.allow_negative_stock = allow_negative_stock
 	sle.via_landed_cost_voucher = via_landed_cost_voucher
 	sle.submit()
@@ -262,11 +401,21 @@ def repost_future_sle(
 
 	distinct_item_warehouses = get_distinct_item_warehouse(args, doc, reposting_data=reposting_data)
 	affected_transactions = get_affected_transactions(doc, reposting_data=reposting_data)
+	checkpoint = get_reposting_checkpoint(doc)
 
 	i = get_current_index(doc) or 0
 	while i < len(args):
 		validate_item_warehouse(args[i])
 
+		resume_from = None
+		if (
+			checkpoint
+			and checkpoint.current_index == i
+			and checkpoint.item_code == args[i].get("item_code")
+			and checkpoint.warehouse == args[i].get("warehouse")
+		):
+			resume_from = checkpoint.sle
+
 		obj = update_entries_after(
 			{
 				"item_code": args[i].get("item_code"),
@@ -277,17 +426,22 @@ def repost_future_sle(
 				"distinct_item_warehouses": distinct_item_warehouses,
 				"items_to_be_repost": args,
 				"current_index": i,
+				"repost_doc": doc,
+				"repost_affected_transactions": affected_transactions,
+				"resume_from": resume_from,
 			},
 			allow_negative_stock=allow_negative_stock,
 			via_landed_cost_voucher=via_landed_cost_voucher,
 		)
 		affected_transactions.update(obj.affected_transactions)
+		checkpoint = None
 
 		key = (args[i].get("item_code"), args[i].get("warehouse"))
 		if distinct_item_warehouses.get(key):
 			distinct_item_warehouses[key].reposting_status = True
 
-		if obj.new_items_found:
+		if obj.new_items_found or obj.resumed_from_checkpoint:
+			# items found before the checkpoint are already in distinct_item_warehouses
 			for _item_wh, data in distinct_item_warehouses.items():
 				if ("args_idx" not in data and not data.reposting_status) or (
 					data.sle_changed and data.reposting_status
@@ -343,7 +497,17 @@ def validate_item_warehouse(args):
 			frappe.throw(_(validation_msg))
 
 
-def update_args_in_repost_item_valuation(doc, index, args, distinct_item_warehouses, affected_transactions):
+def get_reposting_checkpoint(doc=None):
+	if doc and doc.get("reposting_checkpoint"):
+		return frappe._dict(parse_json(doc.reposting_checkpoint))
+
+
+def update_args_in_repost_item_valuation(
+	doc, index, args, distinct_item_warehouses, affected_transactions, checkpoint=None
+):
+	checkpoint = frappe.as_json(checkpoint) if checkpoint else None
+	doc.reposting_checkpoint = checkpoint
+
 	if not doc.items_to_be_repost:
 		file_name = ""
 		if doc.reposting_data_file:
@@ -365,6 +529,7 @@ def update_args_in_repost_item_valuation(doc, index, args, distinct_item_warehou
 				"current_index": index,
 				"total_reposting_count": len(args),
 				"reposting_data_file": doc.reposting_data_file,
+				"reposting_checkpoint": checkpoint,
 			}
 		)
 
@@ -377,6 +542,7 @@ def update_args_in_repost_item_valuation(doc, index, args, distinct_item_warehou
 				),
 				"current_index": index,
 				"affected_transactions": frappe.as_json(affected_transactions),
+				"reposting_checkpoint": checkpoint,
 			}
 		)
 
@@ -522,6 +688,19 @@ def get_current_index(doc=None):
 		return doc.current_index
 
 
+# fields recalculated by update_entries_after.process_sle for entries which are written in bulk
+DEFERRED_SLE_UPDATE_FIELDS = (
+	"qty_after_transaction",
+	"valuation_rate",
+	"stock_value",
+	"stock_queue",
+	"stock_value_difference",
+	"incoming_rate",
+	"outgoing_rate",
+	"modified",
+)
+
+
 class update_entries_after:
 	"""
 	update valution rate and qty after transaction
@@ -568,9 +747,24 @@ class update_entries_after:
 		self.affected_transactions: set[tuple[str, str]] = set()
 		self.reserved_stock = self.get_reserved_stock()
 
+		# streaming mode: future entries are fetched, written and checkpointed page-wise
+		self.page_size = 0
+		if not self.args.get("sle_id"):
+			self.page_size = cint(
+				frappe.db.get_single_value("Stock Reposting Settings", "reposting_page_size")
+			)
+
+		self.pending_sle_updates = {}
+		self.resumed_from_checkpoint = False
+
 		self.data = frappe._dict()
 		self.initialize_previous_data(self.args)
-		self.build()
+		if self.page_size and self.args.get("resume_from"):
+			self.initialize_data_from_checkpoint(self.args.resume_from)
+
+		# every Bin touched by the repost is written once, after all the entries are processed
+		with coalesced_bin_updates():
+			self.build()
 
 	def get_reserved_stock(self):
 		sre = frappe.qb.DocType("Stock Reservation Entry")
@@ -618,8 +812,11 @@ class update_entries_after:
 
 		"""
 		self.data.setdefault(args.warehouse, frappe._dict())
-		warehouse_dict = self.data[args.warehouse]
 		previous_sle = get_previous_sle_of_current_voucher(args)
+		self.set_previous_data(args.warehouse, previous_sle)
+
+	def set_previous_data(self, warehouse, previous_sle):
+		warehouse_dict = self.data[warehouse]
 		warehouse_dict.previous_sle = previous_sle
 
 		for key in ("qty_after_transaction", "valuation_rate", "stock_value"):
@@ -640,6 +837,8 @@ class update_entries_after:
 			self.process_sle_against_current_timestamp()
 			if not future_sle_exists(self.args):
 				self.update_bin()
+		elif self.page_size:
+			self.process_future_entries_in_pages()
 		else:
 			entries_to_fix = self.get_future_entries_to_fix()
 
@@ -660,6 +859,139 @@ class update_entries_after:
 		if self.exceptions:
 			self.raise_exceptions()
 
+	def initialize_data_from_checkpoint(self, sle_name):
+		"""Resume reposting after the last checkpointed entry, its values are the running balance"""
+		checkpoint_sle = frappe.db.sql(
+			"""
+			select *, posting_datetime as "timestamp"
+			from `tabStock Ledger Entry`
+			where name = %(name)s
+				and item_code = %(item_code)s
+				and warehouse = %(warehouse)s
+				and is_cancelled = 0
+			for update""",
+			{"name": sle_name, "item_code": self.item_code, "warehouse": self.args.warehouse},
+			as_dict=1,
+		)
+
+		if not checkpoint_sle:
+			return
+
+		self.set_previous_data(self.args.warehouse, checkpoint_sle[0])
+		self.resumed_from_checkpoint = True
+
+	def process_future_entries_in_pages(self):
+		last_sle = None
+		for entries in self.get_future_entries_in_pages():
+			for sle in entries:
+				if not self.can_defer_sle_update(sle):
+					# its valuation may read the ledger, write the deferred entries before processing it
+					self.flush_sle_updates()
+
+				self.process_sle(sle)
+
+				if sle.dependant_sle_voucher_detail_no:
+					self.get_dependent_entries_to_fix(entries, sle)
+					if sle.voucher_type == "Stock Entry" and is_repack_entry(sle.voucher_no):
+						# for repack entries, we need to repost both source and target warehouses
+						self.update_distinct_item_warehouses_for_repack(sle)
+
+				last_sle = sle
+
+			self.flush_sle_updates()
+			self.update_bin_data(last_sle)
+			self.save_checkpoint(last_sle)
+
+	def get_future_entries_in_pages(self):
+		"""Yield future entries page-wise, using the last entry of a page as the key for the next one"""
+		if self.resumed_from_checkpoint:
+			after_sle = self.data[self.args.warehouse].previous_sle
+		else:
+			after_sle = None
+
+		while True:
+			entries = get_future_sle_page(
+				self.item_code,
+				self.args.warehouse,
+				self.data[self.args.warehouse].previous_sle,
+				after_sle=after_sle,
+				page_size=self.page_size,
+			)
+
+			if not entries:
+				break
+
+			yield entries
+
+			if len(entries) < self.page_size:
+				break
+
+			after_sle = entries[-1]
+
+	def save_checkpoint(self, sle):
+		doc = self.args.get("repost_doc")
+		if not doc or self.exceptions or self.args.get("current_index") is None:
+			return
+
+		update_args_in_repost_item_valuation(
+			doc,
+			self.args.current_index,
+			self.args.items_to_be_repost,
+			self.distinct_item_warehouses,
+			set(self.args.get("repost_affected_transactions") or []) | self.affected_transactions,
+			checkpoint={
+				"current_index": self.args.current_index,
+				"item_code": self.item_code,
+				"warehouse": self.args.warehouse,
+				"sle": sle.name,
+			},
+		)
+
+	def update_sle(self, sle):
+		sle.doctype = "Stock Ledger Entry"
+		sle.modified = now()
+
+		if self.page_size and self.can_defer_sle_update(sle):
+			self.pending_sle_updates[sle.name] = {
+				fieldname: sle.get(fieldname) for fieldname in DEFERRED_SLE_UPDATE_FIELDS
+			}
+			return
+
+		# entries processed after this one may read the ledger, keep it in order
+		self.flush_sle_updates()
+		frappe.get_doc(sle).db_update()
+
+	def can_defer_sle_update(self, sle):
+		"""Entries whose valuation doesn't read back the ledger can be written in bulk"""
+		if sle.serial_and_batch_bundle or sle.serial_no or sle.batch_no or sle.is_adjustment_entry:
+			return False
+
+		if sle.voucher_type == "Stock Reconciliation":
+			return False
+
+		# returns, transfers and repacks get their rates from the ledger or from the other entries
+		if sle.recalculate_rate or self.has_landed_cost_based_on_pi(sle):
+			return False
+
+		if sle.voucher_type == "Stock Entry" and is_repack_entry(sle.voucher_no):
+			return False
+
+		if sle.voucher_type in ("Purchase Receipt", "Purchase Invoice") and flt(sle.actual_qty) < 0:
+			return False
+
+		# outgoing rows of stock entries recalculate the incoming rates from the ledger
+		if sle.voucher_type == "Stock Entry" and flt(sle.actual_qty) < 0:
+			return False
+
+		return True
+
+	def flush_sle_updates(self):
+		if not self.pending_sle_updates:
+			return
+
+		frappe.db.bulk_update("Stock Ledger Entry", self.pending_sle_updates, update_modified=False)
+		self.pending_sle_updates = {}
+
 	def update_distinct_item_warehouses_for_repack(self, sle):
 		sles = (
 			frappe.get_all(
@@ -711,7 +1043,12 @@ class update_entries_after:
 			.for_update()
 		)
 
-		if not self.args.get("cancelled"):
+		if self.args.get("all_voucher_entries"):
+			query = query.where(
+				(doctype.voucher_type == self.args.voucher_type)
+				& (doctype.voucher_no == self.args.voucher_no)
+			)
+		elif not self.args.get("cancelled"):
 			query = query.where(doctype.creation == self.args.creation)
 
 		return query.run(as_dict=True)
@@ -917,7 +1254,10 @@ class update_entries_after:
 		sle.qty_after_transaction = flt(self.wh_data.qty_after_transaction, self.flt_precision)
 		sle.valuation_rate = self.wh_data.valuation_rate
 		sle.stock_value = self.wh_data.stock_value
-		sle.stock_queue = json.dumps(self.wh_data.stock_queue)
+		if isinstance(self.wh_data.stock_queue, BinWiseValuation):
+			sle.stock_queue = self.wh_data.stock_queue.to_json()
+		else:
+			sle.stock_queue = json.dumps(self.wh_data.stock_queue)
 
 		sle.stock_value_difference = stock_value_difference
 		if (
@@ -937,9 +1277,7 @@ class update_entries_after:
 				* -1
 			)
 
-		sle.doctype = "Stock Ledger Entry"
-		sle.modified = now()
-		frappe.get_doc(sle).db_update()
+		self.update_sle(sle)
 
 		if not self.args.get("sle_id") or (
 			sle.serial_and_batch_bundle and sle.auto_created_serial_and_batch_bundle
@@ -1049,6 +1387,10 @@ class update_entries_after:
 		if not frappe.db.exists("Serial and Batch Bundle", sle.serial_and_batch_bundle):
 			return
 
+		if isinstance(self.wh_data.stock_queue, BinWiseValuation):
+			# the bundle reads the queue of the previous entry as a list
+			self.wh_data.stock_queue = self.wh_data.stock_queue.state
+
 		if sle.actual_qty < 0 and (
 			sle.voucher_type in ["Stock Reconciliation", "Asset Capitalization"]
 			or not frappe.db.get_value(sle.voucher_type, sle.voucher_no, "is_return")
@@ -1541,10 +1883,13 @@ class update_entries_after:
 			self.wh_data.qty_after_transaction + actual_qty
 		)
 
-		if self.valuation_method == "LIFO":
-			stock_queue = LIFOValuation(self.wh_data.stock_queue)
-		else:
-			stock_queue = FIFOValuation(self.wh_data.stock_queue)
+		# the valuation object is kept in place of the queue for the next entries of the warehouse
+		stock_queue = self.wh_data.stock_queue
+		if not isinstance(stock_queue, BinWiseValuation):
+			if self.valuation_method == "LIFO":
+				stock_queue = LIFOValuation(stock_queue)
+			else:
+				stock_queue = FIFOValuation(stock_queue)
 
 		_prev_qty, prev_stock_value = stock_queue.get_total_stock_and_value()
 
@@ -1572,14 +1917,15 @@ class update_entries_after:
 
 		stock_value_difference = stock_value - prev_stock_value
 
-		self.wh_data.stock_queue = stock_queue.state
 		self.wh_data.stock_value = round_off_if_near_zero(self.wh_data.stock_value + stock_value_difference)
 
-		if not self.wh_data.stock_queue:
-			self.wh_data.stock_queue.append(
-				[0, sle.incoming_rate or sle.outgoing_rate or self.wh_data.valuation_rate]
+		if not len(stock_queue):
+			stock_queue = type(stock_queue)(
+				[[0, sle.incoming_rate or sle.outgoing_rate or self.wh_data.valuation_rate]]
 			)
 
+		self.wh_data.stock_queue = stock_queue
+
 		if self.wh_data.qty_after_transaction:
 			self.wh_data.valuation_rate = self.wh_data.stock_value / self.wh_data.qty_after_transaction
 
@@ -1719,7 +2065,7 @@ class update_entries_after:
 		if sle.valuation_rate is not None:
 			values_to_update["valuation_rate"] = sle.valuation_rate
 
-		frappe.db.set_value("Bin", bin_name, values_to_update)
+		update_bin_values(bin_name, sle.item_code, sle.warehouse, values_to_update)
 
 	def update_bin(self):
 		# update bin for each warehouse
@@ -1729,7 +2075,7 @@ class update_entries_after:
 			updated_values = {"actual_qty": data.qty_after_transaction, "stock_value": data.stock_value}
 			if data.valuation_rate is not None:
 				updated_values["valuation_rate"] = data.valuation_rate
-			frappe.db.set_value("Bin", bin_name, updated_values, update_modified=True)
+			update_bin_values(bin_name, self.item_code, warehouse, updated_values)
 
 
 def get_previous_sle_of_current_voucher(args, operator="<", exclude_current_voucher=False):
@@ -1880,6 +2226,51 @@ def get_stock_ledger_entries(
 	)
 
 
+def get_future_sle_page(item_code, warehouse, previous_sle, after_sle=None, page_size=1000):
+	"""Get a page of Stock Ledger Entries after `previous_sle`, or after `after_sle` for subsequent pages"""
+
+	params = {"item_code": item_code, "warehouse": warehouse, "page_size": cint(page_size)}
+
+	if after_sle:
+		params.update(
+			{
+				"posting_datetime": after_sle.posting_datetime,
+				"creation": after_sle.creation,
+				"name": after_sle.name,
+			}
+		)
+		condition = """and (
+				posting_datetime > %(posting_datetime)s
+				or (posting_datetime = %(posting_datetime)s and creation > %(creation)s)
+				or (posting_datetime = %(posting_datetime)s and creation = %(creation)s and name > %(name)s)
+			)"""
+	else:
+		# same boundary as get_sle_after_datetime
+		params["posting_datetime"] = (
+			get_combine_datetime(previous_sle.posting_date, previous_sle.posting_time or "00:00:00")
+			if previous_sle and previous_sle.get("posting_date")
+			else "1900-01-01 00:00:00"
+		)
+		params["name"] = (previous_sle and previous_sle.get("name")) or ""
+		condition = "and posting_datetime > %(posting_datetime)s and name != %(name)s"
+
+	# nosemgrep
+	return frappe.db.sql(
+		f"""
+		select *, posting_datetime as "timestamp"
+		from `tabStock Ledger Entry`
+		where is_cancelled = 0
+			and item_code = %(item_code)s
+			and warehouse = %(warehouse)s
+			{condition}
+		order by posting_datetime asc, creation asc, name asc
+		limit %(page_size)s
+		for update""",
+		params,
+		as_dict=1,
+	)
+
+
 def get_sle_by_voucher_detail_no(voucher_detail_no, excluded_sle=None):
 	return frappe.db.get_value(
 		"Stock Ledger Entry",
@@ -2024,15 +2415,25 @@ def update_qty_in_future_sle(args, allow_negative_stock=False):
 
 	args["posting_datetime"] = get_combine_datetime(args["posting_date"], args["posting_time"])
 
+	last_posting = get_last_posting_datetime(args.item_code, args.warehouse)
+	if not last_posting.last_posting_datetime or last_posting.last_posting_datetime <= args.posting_datetime:
+		# nothing is posted after this entry, no qty to shift
+		validate_negative_qty_in_future_sle(args, allow_negative_stock)
+		return
+
 	# find difference/shift in qty caused by stock reconciliation
 	if args.voucher_type == "Stock Reconciliation":
 		qty_shift = get_stock_reco_qty_shift(args)
 
 	# find the next nearest stock reco so that we only recalculate SLEs till that point
-	next_stock_reco_detail = get_next_stock_reco(args)
-	if next_stock_reco_detail:
-		detail = next_stock_reco_detail[0]
-		datetime_limit_condition = get_datetime_limit_condition(detail)
+	if (
+		last_posting.last_stock_reco_datetime
+		and last_posting.last_stock_reco_datetime >= args.posting_datetime
+	):
+		next_stock_reco_detail = get_next_stock_reco(args)
+		if next_stock_reco_detail:
+			detail = next_stock_reco_detail[0]
+			datetime_limit_condition = get_datetime_limit_condition(detail)
 
 	frappe.db.sql(  # nosemgrep
 		f"""
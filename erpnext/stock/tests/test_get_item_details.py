@@ -1,7 +1,10 @@
+from unittest.mock import patch
+
 import frappe
 from frappe.tests import IntegrationTestCase
+from frappe.utils import today
 
-from erpnext.stock.get_item_details import get_item_details
+from erpnext.stock.get_item_details import get_item_details, get_items_details
 
 EXTRA_TEST_RECORD_DEPENDENCIES = ["Customer", "Supplier", "Item", "Price List", "Item Price"]
 
@@ -91,3 +94,52 @@ class TestGetItemDetail(IntegrationTestCase):
 		dn.save()
 		self.assertEqual(dn.items[0].batch_no, "BATCH01")
 		self.assertEqual(dn.items[0].rate, 50)
+
+	def test_get_items_details(self):
+		ctx = frappe._dict(
+			{
+				"company": "_Test Company",
+				"customer": "_Test Customer",
+				"currency": "INR",
+				"conversion_rate": 1.0,
+				"price_list": "_Test Price List",
+				"price_list_currency": "INR",
+				"plc_conversion_rate": 1.0,
+				"doctype": "Sales Order",
+				"name": None,
+				"transaction_date": today(),
+				"ignore_pricing_rule": 0,
+			}
+		)
+		items = [
+			{"item_code": item_code, "qty": qty, "warehouse": "_Test Warehouse - _TC"}
+			for qty in range(1, 6)
+			for item_code in ["_Test Item", "_Test Item 2", "_Test Item Home Desktop 100"]
+		]
+
+		def get_details_per_row():
+			return [get_item_details({**ctx, **item}) for item in items]
+
+		# warm up the document caches for both paths
+		expected = get_details_per_row()
+
+		with patch.object(frappe.db, "sql", wraps=frappe.db.sql) as sql:
+			self.assertEqual(get_details_per_row(), expected)
+			queries_per_row = sql.call_count
+
+		with patch.object(frappe.db, "sql", wraps=frappe.db.sql) as sql:
+			self.assertEqual(get_items_details(ctx, items), expected)
+			queries_in_batch = sql.call_count
+
+		self.assertLess(queries_in_batch, queries_per_row)
+
+	def test_pricing_rules_not_prefetched_when_ignored(self):
+		from erpnext.selling.doctype.sales_order.test_sales_order import make_sales_order
+
+		so = make_sales_order(do_not_save=True)
+		so.ignore_pricing_rule = 1
+
+		with patch("erpnext.accounts.doctype.pricing_rule.utils.prefetch_pricing_rules") as prefetch:
+			so.set_missing_item_details()
+
+		prefetch.assert_not_called()
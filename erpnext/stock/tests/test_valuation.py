@@ -123,6 +123,29 @@ class TestFIFOValuation(IntegrationTestCase):
 		self.queue.add_stock(5, 17)
 		self.queue.add_stock(8, 11)
 
+	def test_consuming_large_queue(self):
+		self.queue = FIFOValuation([[1, rate] for rate in range(1, 201)])
+
+		for rate in range(1, 151):
+			consumed = self.queue.remove_stock(1)
+			self.assertEqual(consumed, [[1, rate]])
+
+		self.assertEqual(len(self.queue), 50)
+		self.assertEqual(self.queue, [[1, rate] for rate in range(151, 201)])
+
+		consumed = self.queue.remove_stock(2, 180)
+		self.assertEqual(consumed, [[1, 180], [1, 151]])
+		self.assertEqual(self.queue.get_total_stock_and_value(), (48, sum(range(152, 201)) - 180))
+
+	def test_to_json(self):
+		self.queue.add_stock(2, 10)
+		self.queue.add_stock(3, 12.5)
+		self.queue.remove_stock(1)
+
+		self.assertEqual(self.queue.to_json(), json.dumps(self.queue.state))
+		self.assertEqual(FIFOValuation(json.loads(self.queue.to_json())), [[1, 10], [3, 12.5]])
+		self.assertEqual(FIFOValuation([]).to_json(), "[]")
+
 	@given(stock_queue_generator)
 	def test_fifo_qty_hypothesis(self, stock_queue):
 		self.queue = FIFOValuation([])
@@ -0,0 +1,148 @@
+"""Microbenchmark of the FIFO queue valuation of a repost.
+
+Run with `python -m erpnext.stock.tests.valuation_benchmark [entries]`, it doesn't need a site.
+
+A repost values every entry of an item and warehouse with the queue of the entry before it
+and stores the queue of each entry as JSON in the Stock Ledger Entry. The queue used to be a
+list of [qty, rate] bins, wrapped in a new valuation object for every entry, now the valuation
+object is kept for the warehouse. Both paths are timed and must give the same stock value and
+queues.
+"""
+
+import json
+import sys
+import timeit
+
+from frappe.utils import flt
+
+from erpnext.stock.valuation import FIFOValuation, round_off_if_near_zero
+
+QTY = 0
+RATE = 1
+
+
+class ListFIFOValuation:
+	"""FIFO queue of [qty, rate] bins as it was before the bins were kept in parallel arrays"""
+
+	__slots__ = ["queue"]
+
+	def __init__(self, state):
+		self.queue = state if state is not None else []
+
+	@property
+	def state(self):
+		return self.queue
+
+	def get_total_stock_and_value(self):
+		total_qty = 0.0
+		total_value = 0.0
+
+		for qty, rate in self.state:
+			total_qty += flt(qty)
+			total_value += flt(qty) * flt(rate)
+
+		return round_off_if_near_zero(total_qty), round_off_if_near_zero(total_value)
+
+	def add_stock(self, qty, rate):
+		if not len(self.queue):
+			self.queue.append([0, 0])
+
+		if self.queue[-1][RATE] == rate:
+			self.queue[-1][QTY] += qty
+		else:
+			if self.queue[-1][QTY] > 0:
+				self.queue.append([qty, rate])
+			else:
+				qty = self.queue[-1][QTY] + qty
+				if qty > 0:
+					self.queue[-1] = [qty, rate]
+				else:
+					self.queue[-1][QTY] = qty
+
+	def remove_stock(self, qty, outgoing_rate=0.0):
+		while qty:
+			if not len(self.queue):
+				self.queue.append([0, 0.0])
+
+			index = 0
+			if outgoing_rate > 0:
+				for idx, fifo_bin in enumerate(self.queue):
+					if fifo_bin[RATE] == outgoing_rate:
+						index = idx
+						break
+
+			fifo_bin = self.queue[index]
+			if qty >= fifo_bin[QTY]:
+				qty = round_off_if_near_zero(qty - fifo_bin[QTY])
+				self.queue.pop(index)
+
+				if not self.queue and qty:
+					self.queue.append([-qty, outgoing_rate or fifo_bin[RATE]])
+					break
+			else:
+				fifo_bin[QTY] = round_off_if_near_zero(fifo_bin[QTY] - qty)
+				qty = 0
+
+
+def get_movements(entries):
+	"""Receipts at changing rates, with an issue of half of a receipt after every few of them"""
+	return [(5, None) if idx % 4 == 3 else (10, 100 + idx % 50) for idx in range(entries)]
+
+
+def value_with_list_queue(movements):
+	"""Queue wrapped in a new valuation object for every entry and dumped as a list"""
+	stock_value = 0.0
+	stock_queue = []
+	stock_queues = []
+	for qty, rate in movements:
+		queue = ListFIFOValuation(stock_queue)
+		_prev_qty, prev_stock_value = queue.get_total_stock_and_value()
+
+		if rate:
+			queue.add_stock(qty, rate)
+		else:
+			queue.remove_stock(qty)
+
+		_qty, current_stock_value = queue.get_total_stock_and_value()
+		stock_value = round_off_if_near_zero(stock_value + current_stock_value - prev_stock_value)
+
+		stock_queue = queue.state
+		stock_queues.append(json.dumps(stock_queue))
+
+	return stock_value, stock_queues
+
+
+def value_with_kept_queue(movements):
+	"""Valuation object kept for all the entries and encoded with `to_json`"""
+	stock_value = 0.0
+	queue = FIFOValuation([])
+	stock_queues = []
+	for qty, rate in movements:
+		_prev_qty, prev_stock_value = queue.get_total_stock_and_value()
+
+		if rate:
+			queue.add_stock(qty, rate)
+		else:
+			queue.remove_stock(qty)
+
+		_qty, current_stock_value = queue.get_total_stock_and_value()
+		stock_value = round_off_if_near_zero(stock_value + current_stock_value - prev_stock_value)
+
+		stock_queues.append(queue.to_json())
+
+	return stock_value, stock_queues
+
+
+def main(entries=5000):
+	movements = get_movements(entries)
+
+	expected = value_with_list_queue(movements)
+	assert value_with_kept_queue(movements) == expected, "kept queue gives a different valuation"
+
+	for method in (value_with_list_queue, value_with_kept_queue):
+		seconds = min(timeit.repeat(lambda: method(movements), number=1, repeat=3))
+		print(f"{method.__name__}: {entries} entries in {seconds:.3f}s")
+
+
+if __name__ == "__main__":
+	main(*map(int, sys.argv[1:]))
@@ -1,4 +1,5 @@
-from abc import ABC, abstractmethod, abstractproperty
+import json
+from abc import ABC, abstractmethod
 from collections.abc import Callable
 from typing import NewType
 
@@ -10,8 +11,37 @@ StockBin = NewType("StockBin", list[float])  # [[qty, rate], ...]
 QTY = 0
 RATE = 1
 
+# consumed bins at the head of the queue are dropped once there are these many
+COMPACT_AFTER_BINS = 64
+
+
+class EncodedBins(dict):
+	"""JSON of (qty, rate) bins, encoded when first looked up"""
+
+	def __missing__(self, stock_bin: tuple[float, float]) -> str:
+		encoded = self[stock_bin] = json.dumps(stock_bin)
+		return encoded
+
 
 class BinWiseValuation(ABC):
+	"""Base class for valuation methods which maintain bins of [qty, rate].
+
+	Bins are stored in two parallel arrays of qty and rate instead of a list of
+	lists. Bins before `head` are already consumed and are dropped lazily, this
+	makes consumption from the front of the queue O(1).
+	"""
+
+	# specifying the attributes to save resources
+	# ref: https://docs.python.org/3/reference/datamodel.html#slots
+	__slots__ = ["encoded_bins", "head", "qtys", "rates"]
+
+	def __init__(self, state: list[StockBin] | None):
+		state = state or []
+		self.qtys: list[float] = [stock_bin[QTY] for stock_bin in state]
+		self.rates: list[float] = [stock_bin[RATE] for stock_bin in state]
+		self.head = 0
+		self.encoded_bins = EncodedBins()
+
 	@abstractmethod
 	def add_stock(self, qty: float, rate: float) -> None:
 		pass
@@ -26,20 +56,37 @@ class BinWiseValuation(ABC):
 	) -> list[StockBin]:
 		pass
 
-	@abstractproperty
+	@property
 	def state(self) -> list[StockBin]:
-		pass
+		"""Get current state of bins as list of [qty, rate]."""
+		return [
+			[qty, rate] for qty, rate in zip(self.qtys[self.head :], self.rates[self.head :], strict=True)
+		]
 
 	def get_total_stock_and_value(self) -> tuple[float, float]:
 		total_qty = 0.0
 		total_value = 0.0
 
-		for qty, rate in self.state:
+		for qty, rate in zip(self.qtys[self.head :], self.rates[self.head :], strict=True):
 			total_qty += flt(qty)
 			total_value += flt(qty) * flt(rate)
 
 		return round_off_if_near_zero(total_qty), round_off_if_near_zero(total_value)
 
+	def to_json(self) -> str:
+		"""JSON of the bins as stored in `stock_queue`, same as dumping `state`.
+
+		Bins are encoded once and reused, while reposting the queue is stored after every entry
+		and most of its bins don't change from one entry to the next."""
+		if len(self.encoded_bins) > 2 * len(self.qtys) + 1024:
+			self.encoded_bins.clear()
+
+		bins = zip(self.qtys[self.head :], self.rates[self.head :], strict=True)
+		return "[" + ", ".join(map(self.encoded_bins.__getitem__, bins)) + "]"
+
+	def __len__(self):
+		return len(self.qtys) - self.head
+
 	def __repr__(self):
 		return str(self.state)
 
@@ -51,6 +98,44 @@ class BinWiseValuation(ABC):
 			return self.state == other
 		return type(self) == type(other) and self.state == other.state
 
+	def _add_stock_at_end(self, qty: float, rate: float) -> None:
+		qtys, rates = self.qtys, self.rates
+		if not len(self):
+			qtys.append(0)
+			rates.append(0)
+
+		# last row has the same rate, merge new bin.
+		if rates[-1] == rate:
+			qtys[-1] += qty
+		else:
+			# Item has a positive balance qty, add new entry
+			if qtys[-1] > 0:
+				qtys.append(qty)
+				rates.append(rate)
+			else:  # negative balance qty
+				qty = qtys[-1] + qty
+				if qty > 0:  # new balance qty is positive
+					qtys[-1] = qty
+					rates[-1] = rate
+				else:  # new balance qty is still negative, maintain same rate
+					qtys[-1] = qty
+
+	def _pop_bin(self, index: int) -> None:
+		if index == self.head:
+			self.head += 1
+			if not len(self):
+				self.qtys.clear()
+				self.rates.clear()
+				self.head = 0
+			elif self.head >= COMPACT_AFTER_BINS and self.head * 2 >= len(self.qtys):
+				# drop the consumed bins once they are the majority
+				del self.qtys[: self.head]
+				del self.rates[: self.head]
+				self.head = 0
+		else:
+			del self.qtys[index]
+			del self.rates[index]
+
 
 class FIFOValuation(BinWiseValuation):
 	"""Valuation method where a queue of all the incoming stock is maintained.
@@ -63,17 +148,7 @@ class FIFOValuation(BinWiseValuation):
 	ref: https://en.wikipedia.org/wiki/FIFO_and_LIFO_accounting
 	"""
 
-	# specifying the attributes to save resources
-	# ref: https://docs.python.org/3/reference/datamodel.html#slots
-	__slots__ = ["queue"]
-
-	def __init__(self, state: list[StockBin] | None):
-		self.queue: list[StockBin] = state if state is not None else []
-
-	@property
-	def state(self) -> list[StockBin]:
-		"""Get current state of queue."""
-		return self.queue
+	__slots__ = []
 
 	def add_stock(self, qty: float, rate: float) -> None:
 		"""Update fifo queue with new stock.
@@ -82,22 +157,7 @@ class FIFOValuation(BinWiseValuation):
 		        qty: new quantity to add
 		        rate: incoming rate of new quantity"""
 
-		if not len(self.queue):
-			self.queue.append([0, 0])
-
-		# last row has the same rate, merge new bin.
-		if self.queue[-1][RATE] == rate:
-			self.queue[-1][QTY] += qty
-		else:
-			# Item has a positive balance qty, add new entry
-			if self.queue[-1][QTY] > 0:
-				self.queue.append([qty, rate])
-			else:  # negative balance qty
-				qty = self.queue[-1][QTY] + qty
-				if qty > 0:  # new balance qty is positive
-					self.queue[-1] = [qty, rate]
-				else:  # new balance qty is still negative, maintain same rate
-					self.queue[-1][QTY] = qty
+		self._add_stock_at_end(qty, rate)
 
 	def remove_stock(
 		self,
@@ -116,44 +176,42 @@ class FIFOValuation(BinWiseValuation):
 		if not rate_generator:
 			rate_generator = lambda: 0.0  # noqa
 
+		qtys, rates = self.qtys, self.rates
 		consumed_bins = []
 		while qty:
-			if not len(self.queue):
+			if not len(self):
 				# rely on rate generator.
-				self.queue.append([0, rate_generator()])
+				qtys.append(0)
+				rates.append(rate_generator())
 
-			index = None
+			index = self.head
 			if outgoing_rate > 0 or is_return_purchase_entry:
 				# Find the entry where rate matched with outgoing rate
-				for idx, fifo_bin in enumerate(self.queue):
-					if fifo_bin[RATE] == outgoing_rate:
-						index = idx
-						break
-
 				# If no entry found with outgoing rate, consume as per FIFO
-				if index is None:  # nosemgrep
-					index = 0
-			else:
-				index = 0
+				try:
+					index = rates.index(outgoing_rate, self.head)
+				except ValueError:
+					pass
 
 			# select first bin or the bin with same rate
-			fifo_bin = self.queue[index]
-			if qty >= fifo_bin[QTY]:
+			bin_qty, bin_rate = qtys[index], rates[index]
+			if qty >= bin_qty:
 				# consume current bin
-				qty = round_off_if_near_zero(qty - fifo_bin[QTY])
-				to_consume = self.queue.pop(index)
-				consumed_bins.append(list(to_consume))
+				qty = round_off_if_near_zero(qty - bin_qty)
+				self._pop_bin(index)
+				consumed_bins.append([bin_qty, bin_rate])
 
-				if not self.queue and qty:
+				if not len(self) and qty:
 					# stock finished, qty still remains to be withdrawn
 					# negative stock, keep in as a negative bin
-					self.queue.append([-qty, outgoing_rate or fifo_bin[RATE]])
-					consumed_bins.append([qty, outgoing_rate or fifo_bin[RATE]])
+					qtys.append(-qty)
+					rates.append(outgoing_rate or bin_rate)
+					consumed_bins.append([qty, outgoing_rate or bin_rate])
 					break
 			else:
 				# qty found in current bin consume it and exit
-				fifo_bin[QTY] = round_off_if_near_zero(fifo_bin[QTY] - qty)
-				consumed_bins.append([qty, fifo_bin[RATE]])
+				qtys[index] = round_off_if_near_zero(bin_qty - qty)
+				consumed_bins.append([qty, bin_rate])
 				qty = 0
 
 		return consumed_bins
@@ -171,17 +229,7 @@ class LIFOValuation(BinWiseValuation):
 	Implementation detail: appends and pops both at end of list.
 	"""
 
-	# specifying the attributes to save resources
-	# ref: https://docs.python.org/3/reference/datamodel.html#slots
-	__slots__ = ["stack"]
-
-	def __init__(self, state: list[StockBin] | None):
-		self.stack: list[StockBin] = state if state is not None else []
-
-	@property
-	def state(self) -> list[StockBin]:
-		"""Get current state of stack."""
-		return self.stack
+	__slots__ = []
 
 	def add_stock(self, qty: float, rate: float) -> None:
 		"""Update lifo stack with new stock.
@@ -192,22 +240,7 @@ class LIFOValuation(BinWiseValuation):
 
 		Behaviour of this is same as FIFO valuation.
 		"""
-		if not len(self.stack):
-			self.stack.append([0, 0])
-
-		# last row has the same rate, merge new bin.
-		if self.stack[-1][RATE] == rate:
-			self.stack[-1][QTY] += qty
-		else:
-			# Item has a positive balance qty, add new entry
-			if self.stack[-1][QTY] > 0:
-				self.stack.append([qty, rate])
-			else:  # negative balance qty
-				qty = self.stack[-1][QTY] + qty
-				if qty > 0:  # new balance qty is positive
-					self.stack[-1] = [qty, rate]
-				else:  # new balance qty is still negative, maintain same rate
-					self.stack[-1][QTY] = qty
+		self._add_stock_at_end(qty, rate)
 
 	def remove_stock(
 		self,
@@ -226,32 +259,34 @@ class LIFOValuation(BinWiseValuation):
 		if not rate_generator:
 			rate_generator = lambda: 0.0  # noqa
 
+		qtys, rates = self.qtys, self.rates
 		consumed_bins = []
 		while qty:
-			if not len(self.stack):
+			if not len(self):
 				# rely on rate generator.
-				self.stack.append([0, rate_generator()])
+				qtys.append(0)
+				rates.append(rate_generator())
 
 			# start at the end.
-			index = -1
-
-			stock_bin = self.stack[index]
-			if qty >= stock_bin[QTY]:
+			bin_qty, bin_rate = qtys[-1], rates[-1]
+			if qty >= bin_qty:
 				# consume current bin
-				qty = round_off_if_near_zero(qty - stock_bin[QTY])
-				to_consume = self.stack.pop(index)
-				consumed_bins.append(list(to_consume))
+				qty = round_off_if_near_zero(qty - bin_qty)
+				qtys.pop()
+				rates.pop()
+				consumed_bins.append([bin_qty, bin_rate])
 
-				if not self.stack and qty:
+				if not len(self) and qty:
 					# stock finished, qty still remains to be withdrawn
 					# negative stock, keep in as a negative bin
-					self.stack.append([-qty, outgoing_rate or stock_bin[RATE]])
-					consumed_bins.append([qty, outgoing_rate or stock_bin[RATE]])
+					qtys.append(-qty)
+					rates.append(outgoing_rate or bin_rate)
+					consumed_bins.append([qty, outgoing_rate or bin_rate])
 					break
 			else:
 				# qty found in current bin consume it and exit
-				stock_bin[QTY] = round_off_if_near_zero(stock_bin[QTY] - qty)
-				consumed_bins.append([qty, stock_bin[RATE]])
+				qtys[-1] = round_off_if_near_zero(bin_qty - qty)
+				consumed_bins.append([qty, bin_rate])
 				qty = 0
 
 		return consumed_bins
@@ -8,6 +8,7 @@ from frappe.utils import flt
 
 from erpnext.buying.utils import check_on_hold_or_closed_status
 from erpnext.controllers.subcontracting_controller import SubcontractingController
+from erpnext.stock.doctype.bin.bin import coalesced_bin_updates
 from erpnext.stock.doctype.stock_reservation_entry.stock_reservation_entry import (
 	StockReservation,
 	has_reserved_stock,
@@ -237,13 +238,14 @@ class SubcontractingOrder(SubcontractingController):
 			update_bin_qty(item_code, warehouse, {"ordered_qty": get_ordered_qty(item_code, warehouse)})
 
 	def update_reserved_qty_for_subcontracting(self, sco_item_rows=None):
-		for item in self.supplied_items:
-			if sco_item_rows and item.reference_name not in sco_item_rows:
-				continue
+		with coalesced_bin_updates():
+			for item in self.supplied_items:
+				if sco_item_rows and item.reference_name not in sco_item_rows:
+					continue
 
-			if item.rm_item_code:
-				stock_bin = get_bin(item.rm_item_code, item.reserve_warehouse)
-				stock_bin.update_reserved_qty_for_sub_contracting()
+				if item.rm_item_code:
+					stock_bin = get_bin(item.rm_item_code, item.reserve_warehouse)
+					stock_bin.update_reserved_qty_for_sub_contracting()
 
 	def populate_items_table(self):
 		items = []
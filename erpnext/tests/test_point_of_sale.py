@@ -5,6 +5,7 @@ from frappe.tests import IntegrationTestCase
 
 from erpnext.accounts.doctype.pos_profile.test_pos_profile import make_pos_profile
 from erpnext.selling.page.point_of_sale.point_of_sale import get_items
+from erpnext.stock.doctype.item.item import make_item_price
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
 
@@ -51,3 +52,32 @@ class TestPointOfSale(IntegrationTestCase):
 
 		self.assertEqual(len(filtered_items), 1)
 		self.assertEqual(filtered_items[0]["item_code"], item2.item_code)
+
+	def test_items_in_sales_uom(self):
+		pos_profile = make_pos_profile(name="Test POS Profile for Sales UOM")
+		item = make_item(
+			"Test POS Sales UOM Item",
+			{"is_stock_item": 1, "sales_uom": "Box"},
+			uoms=[{"uom": "Box", "conversion_factor": 10}],
+		)
+		make_item_price(item.name, "_Test Price List", 5)
+		make_stock_entry(item_code=item.name, qty=30, to_warehouse="_Test Warehouse - _TC", rate=5)
+		service_item = make_item("Test POS Sales UOM Service Item", {"is_stock_item": 0})
+
+		result = get_items(
+			start=0,
+			page_length=20,
+			price_list="_Test Price List",
+			item_group=item.item_group,
+			pos_profile=pos_profile.name,
+			search_term="Test POS Sales UOM",
+		)
+		items = {d["item_code"]: d for d in result.get("items")}
+
+		# stock qty and price of the stock uom are converted to the sales uom
+		self.assertEqual(items[item.name]["uom"], "Box")
+		self.assertEqual(items[item.name]["actual_qty"], 3)
+		self.assertEqual(items[item.name]["price_list_rate"], 50)
+
+		self.assertEqual(items[service_item.name]["actual_qty"], 0)
+		self.assertIsNone(items[service_item.name]["price_list_rate"])